@@ -0,0 +1,249 @@
+"""성능 벤치마크: 모델 마이크로벤치 / 배치 처리량 / Streamlit 재실행 (AppTest)
+
+    python benchmarks/bench.py                       # 실행 후 baseline 과 비교 (regression 이면 종료 코드 1)
+    python benchmarks/bench.py --save-baseline       # 현재 결과를 baseline 으로 저장
+    python benchmarks/bench.py --only model,batch --threshold 0.5
+
+benchmarks/baseline.json 은 저장소에 올린 기준 측정값이다 (meta 에 측정 환경 기록). 다른 기계에서는 절대 시간이 다르므로
+먼저 --save-baseline 으로 로컬 기준을 만들어 비교하고, 의도한 성능 변화는 baseline.json 을 다시 저장해 함께 커밋한다.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+import timeit
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+APP_PATH = ROOT / "v15.0(Feed_X).py"
+DEFAULT_OUT = Path(__file__).with_name("results.json")
+DEFAULT_BASELINE = Path(__file__).with_name("baseline.json")
+BATCH_SIZES = (1, 1_000, 100_000)
+# 10만 행 배치가 단건 compute_scenario 반복보다 최소 몇 배 빨라야 하는지 (단건은 SCALAR_SAMPLE 행으로 재서 환산)
+BATCH_MIN_SPEEDUP, SCALAR_SAMPLE = 100, 2_000
+FEED_PRICE_SCENARIOS = 300
+EXPORT_SCENARIOS = 10_000
+REGISTRY_HEAD, REGISTRY_EVENTS = 50_000, 100_000
+CHART_SCENARIOS, CHART_YEARS = 200, 50
+
+def time_call(fn, repeat: int = 7) -> float:
+    """호출당 최소 시간 (초). 반복 횟수는 timeit.autorange 로 0.2초 이상이 되도록 잡는다."""
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+def bench_model() -> dict:
+    from hanwoo import calculate_avg_price, calculate_cost_from_table, compute_scenario, default_cost_tables, default_grade_tables
+    from hanwoo.scenario import default_farm_args
+    args = default_farm_args()
+    breed, _ = default_cost_tables()
+    cow, _ = default_grade_tables()
+    return {
+        "model.compute_scenario": {"seconds": time_call(lambda: compute_scenario("A", **args))},
+        "model.calculate_avg_price": {"seconds": time_call(lambda: calculate_avg_price(cow))},
+        "model.calculate_cost_from_table.경영비": {"seconds": time_call(lambda: calculate_cost_from_table(breed, "경영비"))},
+        "model.calculate_cost_from_table.생산비": {"seconds": time_call(lambda: calculate_cost_from_table(breed, "생산비"))},
+        **_bench_aggregates(),
+    }
+
+def _bench_aggregates() -> dict:
+    """증분 집계: 셀 하나 편집 후 합계 조회 (편집 없는 재실행은 변경분 비교만)"""
+    from hanwoo import SharedTables, TableAggregates, default_cost_tables, default_grade_tables
+    breed, fatten = default_cost_tables()
+    cow, steer = default_grade_tables()
+    tables = SharedTables({"df_cost_breed": breed, "df_cost_fatten": fatten, "df_cow": cow, "df_steer": steer})
+    agg = TableAggregates(tables)
+    state = {"i": 0}
+
+    def _edit():
+        state["i"] += 1
+        delta = {(0, "금액(천원/년)"): 1500 + state["i"] % 97, (3, "금액(천원/년)"): 70}
+        agg.cost("df_cost_breed", delta, "경영비")
+    unchanged = {(0, "Ratio(%)"): 6.0}
+    return {
+        "model.TableAggregates.edit_cell": {"seconds": time_call(_edit)},
+        "model.TableAggregates.unchanged": {"seconds": time_call(lambda: agg.avg_price("df_cow", unchanged))},
+    }
+
+def bench_batch() -> dict:
+    import numpy as np
+    from hanwoo import compute_scenario, compute_scenario_batch
+    from hanwoo.scenario import default_farm_args
+    args = default_farm_args()
+    rng = np.random.default_rng(0)
+    out = {}
+    for n in BATCH_SIZES:
+        cols = dict(args, base_cows=rng.integers(20, 300, n), conception_rate=rng.uniform(0.5, 0.9, n), annual_culls=rng.integers(0, 40, n))
+        sec = time_call(lambda: compute_scenario_batch(cols), repeat=3)
+        out[f"batch.compute_scenario_batch.{n}"] = {"seconds": sec, "rows_per_s": n / sec}
+    # 단건 반복 대비 배속: 할당 변수 3개만 바꾸는 스윕과 33개 입력이 모두 행마다 다른 경우 (후자는 메모리 대역폭이 한계)
+    n = BATCH_SIZES[-1]
+    sweep = dict(args, base_cows=rng.integers(20, 300, n), conception_rate=rng.uniform(0.5, 0.9, n), annual_culls=rng.integers(0, 40, n))
+    columns = {k: float(v) * rng.uniform(0.8, 1.2, n) for k, v in args.items()}
+    for label, cols in (("sweep", sweep), ("columns", columns)):
+        rows = [{k: np.broadcast_to(v, (n,))[i].item() for k, v in cols.items()} for i in range(SCALAR_SAMPLE)]
+
+        def _scalar_loop():
+            for row in rows:
+                compute_scenario("A", **row)
+        per_row = time_call(_scalar_loop, repeat=3) / SCALAR_SAMPLE
+        sec = time_call(lambda: compute_scenario_batch(cols), repeat=5)
+        out[f"batch.compute_scenario_batch.{label}.{n}"] = {"seconds": sec, "rows_per_s": n / sec, "speedup": per_row * n / sec}
+    speedup = out[f"batch.compute_scenario_batch.sweep.{n}"]["speedup"]
+    assert speedup >= BATCH_MIN_SPEEDUP, f"compute_scenario_batch {n}행이 단건 반복보다 {speedup:.0f}배 빠름 (기준 {BATCH_MIN_SPEEDUP}배)"
+    # 사료 배합: 단계 × 가격 시나리오 LP 한 번 (매번 캐시를 비워 새로 푼다)
+    from hanwoo.feed import default_feed_tables, solve_rations
+    feeds, stages = default_feed_tables()
+    prices = feeds["가격(원/kg)"].to_numpy(dtype=float) * rng.lognormal(0, 0.15, (FEED_PRICE_SCENARIOS, len(feeds)))
+    def _solve():
+        solve_rations.cache_clear()
+        solve_rations(feeds, stages, prices)
+    sec = time_call(_solve, repeat=3)
+    out[f"batch.solve_rations.{FEED_PRICE_SCENARIOS}"] = {"seconds": sec, "rows_per_s": FEED_PRICE_SCENARIOS * len(stages) / sec}
+    # 보고서 내보내기: 시나리오 1만 개를 형식별로 메모리 버퍼에 스트리밍
+    import io
+    from hanwoo.export import EXPORT_FORMATS, export_report
+    src = {"base_cows": rng.integers(20, 300, EXPORT_SCENARIOS), "annual_culls": rng.integers(0, 40, EXPORT_SCENARIOS)}
+    for fmt in EXPORT_FORMATS:
+        sec = time_call(lambda: export_report(src, io.BytesIO(), fmt, chunk_size=2_000, defaults=args), repeat=1)
+        out[f"batch.export_report.{fmt}.{EXPORT_SCENARIOS}"] = {"seconds": sec, "rows_per_s": EXPORT_SCENARIOS / sec}
+    # 개체 등록부: 5만 두 재고에 이력 10만 건 (출생 3만 포함) 반영, 반영 후 재고·분배 재집계
+    import pandas as pd
+    from hanwoo.registry import AnimalRegistry
+    tags = [f"KR{i:09d}" for i in range(REGISTRY_HEAD)]
+    inv = pd.DataFrame({"tag": tags, "birth_date": pd.Timestamp("2024-01-01") - pd.to_timedelta(rng.integers(0, 3000, REGISTRY_HEAD), unit="D"),
+                        "sex": rng.choice(["암", "수"], REGISTRY_HEAD), "status": rng.choice(["번식우", "송아지", "비육우", "대체우", "KPN"], REGISTRY_HEAD)})
+    n_birth = REGISTRY_EVENTS * 3 // 10
+    days = pd.Timestamp("2024-01-02") + pd.to_timedelta(rng.integers(0, 365, REGISTRY_EVENTS), unit="D")
+    events = pd.DataFrame({
+        "tag": [f"NEW{i:08d}" for i in range(n_birth)] + list(rng.choice(tags, REGISTRY_EVENTS - n_birth)), "date": days,
+        "event": ["출생"] * n_birth + list(rng.choice(["도태", "비육 투입", "비육 출하", "송아지 판매", "폐사", "KPN 위탁", "체중 측정"], REGISTRY_EVENTS - n_birth)),
+        "sex": rng.choice(["암", "수"], REGISTRY_EVENTS), "dam": rng.choice(tags, REGISTRY_EVENTS),
+    })
+    sec = time_call(lambda: AnimalRegistry.from_frame(inv).apply_events(events), repeat=3)
+    out[f"batch.registry.apply_events.{REGISTRY_EVENTS}"] = {"seconds": sec, "rows_per_s": REGISTRY_EVENTS / sec}
+    reg = AnimalRegistry.from_frame(inv)
+    reg.apply_events(events)
+
+    def _recount():
+        reg.invalidate()  # 이력 반영 직후 상태 (색인 없음)
+        reg.counts()
+        reg.farm_inputs()
+    out["batch.registry.recount"] = {"seconds": time_call(_recount)}
+    # 차트 축약: 시나리오 200개 × 50년 월별 추이 (12만 행) 를 전체·줌 구간으로 줄이기 (구간 캐시를 비우고 매번 새로 계산)
+    from hanwoo.downsample import DOWNSAMPLE_METHODS, SeriesFrame
+    n_rows = CHART_SCENARIOS * CHART_YEARS * 12
+    traj = pd.DataFrame({"Scenario": np.repeat([f"S{i}" for i in range(CHART_SCENARIOS)], CHART_YEARS * 12),
+                         "Year": np.tile(np.arange(1, CHART_YEARS * 12 + 1) / 12, CHART_SCENARIOS), "Value": rng.normal(0, 1e6, n_rows).cumsum()})
+    for method in DOWNSAMPLE_METHODS:
+        series = SeriesFrame(traj, x="Year", method=method)
+        for label, x_range in (("full", None), ("zoom", (10, 20))):
+            def _view():
+                series.cache.clear()
+                series.view(x_range)
+            sec = time_call(_view, repeat=3)
+            out[f"batch.downsample.{method}.{label}.{n_rows}"] = {"seconds": sec, "rows_per_s": n_rows / sec}
+    return out
+
+def bench_app(repeat: int = 5) -> dict:
+    """스크립트 전체 재실행 시간. 각 상호작용은 매번 새 값을 넣어 캐시 적중만으로 끝나지 않게 한다."""
+    import pandas as pd
+    from streamlit.logger import set_log_level
+    from streamlit.testing.v1 import AppTest
+    set_log_level("error")
+    at = AppTest.from_file(str(APP_PATH), default_timeout=300)
+    t0 = time.perf_counter()
+    at.run()
+    out = {"app.first_run": {"seconds": time.perf_counter() - t0}}
+    if at.exception:
+        raise RuntimeError(f"앱 실행 오류: {at.exception[0].value}")
+    base_cows = next(w for w in at.number_input if w.label == "기초 번식우(두)")
+
+    def _edit_grade(i):
+        at.session_state["editor_cow"] = {"edited_rows": {0: {"Ratio(%)": 5.0 + i % 7}}, "added_rows": [], "deleted_rows": []}
+
+    def _scenarios(n):
+        base = at.session_state["scenarios"].iloc[0].to_dict()
+        return lambda i: at.session_state.__setitem__("scenarios", pd.DataFrame(
+            [{**base, "시나리오": f"S{j}", "annual_culls": (j + i) % 40} for j in range(n)]))
+
+    interactions = {
+        "app.rerun_unchanged": lambda i: None,
+        "app.set_base_cows": lambda i: base_cows.set_value(100 + 10 * (i + 1)),
+        "app.edit_grade_cell": _edit_grade,
+        "app.scenarios_2": _scenarios(2),
+        "app.scenarios_50": _scenarios(50),
+        "app.trajectory_monthly": lambda i: (at.session_state.__setitem__("traj_monthly", True), at.session_state.__setitem__("traj_years", 50 - i)),
+    }
+    for name, action in interactions.items():
+        samples = []
+        for i in range(repeat):
+            action(i)
+            t0 = time.perf_counter()
+            at.run()
+            samples.append(time.perf_counter() - t0)
+        out[name] = {"seconds": statistics.median(samples), "min": min(samples)}
+    return out
+
+SUITES = {"model": bench_model, "batch": bench_batch, "app": bench_app}
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    """baseline 대비 (1 + threshold) 배를 넘게 느려진 항목"""
+    regressions = []
+    for name, res in current.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        ratio = res["seconds"] / base["seconds"]
+        mark = "REGRESSION" if ratio > 1 + threshold else ""
+        print(f"  {name:45s} {base['seconds'] * 1e3:10.3f}ms -> {res['seconds'] * 1e3:10.3f}ms  x{ratio:5.2f} {mark}")
+        if mark:
+            regressions.append(name)
+    return regressions
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--only", default=",".join(SUITES), help=f"실행할 묶음 (쉼표 구분: {', '.join(SUITES)})")
+    parser.add_argument("--out", type=Path, default=DEFAULT_OUT, help="결과 JSON 경로")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="비교 기준 JSON 경로")
+    parser.add_argument("--threshold", type=float, default=0.25, help="regression 판정 비율 (기본 0.25 = 25%% 느려짐)")
+    parser.add_argument("--save-baseline", action="store_true", help="결과를 baseline 으로도 저장")
+    args = parser.parse_args(argv)
+
+    results: dict[str, dict] = {}
+    for suite in args.only.split(","):
+        print(f"[{suite}]", file=sys.stderr)
+        results.update(SUITES[suite.strip()]())
+    for name, res in results.items():
+        speedup = f"  x{res['speedup']:.0f} (단건 반복 대비)" if "speedup" in res else ""
+        print(f"  {name:45s} {res['seconds'] * 1e3:10.3f}ms{speedup}")
+
+    import numpy, pandas
+    report = {
+        "meta": {"time": time.strftime("%Y-%m-%dT%H:%M:%S"), "python": platform.python_version(), "machine": platform.platform(),
+                 "numpy": numpy.__version__, "pandas": pandas.__version__},
+        "results": results,
+    }
+    args.out.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"baseline 저장: {args.baseline}")
+        return 0
+    if not args.baseline.exists():
+        print(f"baseline 없음 ({args.baseline}) - --save-baseline 으로 먼저 만드세요.")
+        return 0
+    print(f"baseline 비교 (threshold {args.threshold:.0%}):")
+    regressions = compare(results, json.loads(args.baseline.read_text(encoding="utf-8"))["results"], args.threshold)
+    if regressions:
+        print(f"regression {len(regressions)}건: {', '.join(regressions)}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
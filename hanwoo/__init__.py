@@ -0,0 +1,31 @@
+"""한우 시뮬레이터 계산 코어 (Streamlit 비의존)"""
+from .aggregates import TableAggregates
+from .allocation import DECISION_KEYS, optimize_allocation
+from .downsample import DOWNSAMPLE_METHODS, SeriesFrame, lttb_indices, minmax_indices
+from .export import EXPORT_FORMATS, ReportWriter, export_report
+from .feed import FEED_TARGETS, annual_feed_costs, default_feed_tables, ration_costs, ration_frame, solve_rations
+from .genetics import GENETIC_TRAITS, genetic_gain_frames, project_genetic_gain, selection_intensity
+from .grading import GradeIndex, build_grade_index
+from .herd import herd_annual_frame, herd_monthly_frame, simulate_herd
+from .linear import BREAK_EVEN_TARGETS, CompiledScenario, break_even, compile_scenario
+from .overlay import FootprintRegistry, SharedTables, deep_sizeof, session_footprint
+from .prices import PriceStore, backtest, scenario_prices
+from .registry import AnimalRegistry, load_registry
+from .report import LINE_ITEMS, fmt_money, line_items_frame, make_excel_view
+from .risk import QuantileSketch, default_risk_spec, simulate_risk, sketch_cdf
+from .sensitivity import default_ranges, saltelli, sobol_indices, tornado
+from .snapshots import SnapshotStore
+from .scenario import ALLOC_KEYS, FARM_DEFAULTS, SCENARIO_ARGS, clamp_int, compute_scenario, compute_scenario_batch, default_farm_args
+from .tables import (
+    COST_ITEMS, FEED_ITEM, GRADES, OPPORTUNITY_ITEMS,
+    calculate_avg_price, calculate_cost_from_table, calculate_opportunity_cost, exact_sum,
+    default_cost_tables, default_grade_tables,
+)
+
+__all__ = [
+    "ALLOC_KEYS", "AnimalRegistry", "BREAK_EVEN_TARGETS", "COST_ITEMS", "DECISION_KEYS", "DOWNSAMPLE_METHODS", "EXPORT_FORMATS", "FARM_DEFAULTS", "FEED_ITEM", "FEED_TARGETS", "GENETIC_TRAITS", "GRADES", "LINE_ITEMS", "OPPORTUNITY_ITEMS", "SCENARIO_ARGS", "CompiledScenario", "FootprintRegistry", "GradeIndex", "PriceStore", "QuantileSketch", "ReportWriter", "SeriesFrame", "SharedTables", "SnapshotStore", "TableAggregates",
+    "annual_feed_costs", "backtest", "break_even", "calculate_avg_price", "calculate_cost_from_table", "calculate_opportunity_cost",
+    "build_grade_index", "clamp_int", "compile_scenario", "compute_scenario", "compute_scenario_batch", "deep_sizeof", "default_farm_args", "exact_sum", "export_report",
+    "default_cost_tables", "default_feed_tables", "default_grade_tables", "fmt_money", "genetic_gain_frames", "herd_annual_frame", "herd_monthly_frame", "line_items_frame", "lttb_indices", "load_registry", "make_excel_view", "minmax_indices",
+    "default_ranges", "default_risk_spec", "optimize_allocation", "project_genetic_gain", "ration_costs", "ration_frame", "saltelli", "scenario_prices", "selection_intensity", "session_footprint", "simulate_herd", "simulate_risk", "sketch_cdf", "solve_rations", "sobol_indices", "tornado",
+]
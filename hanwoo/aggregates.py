@@ -0,0 +1,195 @@
+"""표 편집 증분 집계: 비용표 (경영비/생산비, 기회비용, 사료비) 와 등급표 (두당 평균 가격) 의 누적 합계"""
+from __future__ import annotations
+
+import math
+from fractions import Fraction
+from typing import TYPE_CHECKING
+
+from .tables import FEED_ITEM, OPPORTUNITY_ITEMS, calculate_avg_price, calculate_cost_from_table, calculate_opportunity_cost
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from .overlay import SharedTables
+
+COST_TABLES: tuple[str, ...] = ("df_cost_breed", "df_cost_fatten")
+GRADE_TABLES: tuple[str, ...] = ("df_cow", "df_steer")
+GRADE_COLUMNS: tuple[str, ...] = ("Ratio(%)", "Price(KRW/kg)", "Weight(kg)")
+# 검증 모드에서 사료비 대체 경로를 확인할 때 쓰는 값 (원/년)
+_FEED_PROBE = 1_234_567.0
+_MISSING = object()
+
+def _exact(x) -> Fraction:
+    """float -> 정확한 유리수 (유한하지 않은 값·숫자가 아닌 값은 tables.exact_sum 처럼 0)"""
+    try:
+        x = float(x)
+    except (TypeError, ValueError):
+        return Fraction(0)
+    return Fraction(x) if math.isfinite(x) else Fraction(0)
+
+class CostTotals:
+    """비용표 행별 금액(원) 과 (기회비용 여부, 사료비 여부) 칸별 정확한 합·행 수.
+
+    합은 Fraction 으로 누적하므로 셀 하나를 바꿀 때 해당 행의 기여만 빼고 더해도 반올림 오차가 쌓이지 않으며,
+    float 로 바꾼 값은 calculate_cost_from_table / calculate_opportunity_cost (math.fsum) 와 비트 단위로 같다.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.amount_col, self.scale = ("금액(천원/년)", 1000) if "금액(천원/년)" in df.columns else ("금액(원/년)", 1)
+        self.items = df["항목"].tolist()
+        self.raw = df[self.amount_col].tolist()
+        self.sums = {cell: Fraction(0) for cell in ((False, False), (False, True), (True, False), (True, True))}
+        self.counts = dict.fromkeys(self.sums, 0)
+        for row in range(len(self.items)):
+            self._add(row, 1)
+
+    def _cell(self, row: int) -> tuple[bool, bool]:
+        item = self.items[row]
+        return item in OPPORTUNITY_ITEMS, item == FEED_ITEM
+
+    def _amount(self, row: int) -> Fraction:
+        try:
+            return _exact(self.raw[row] * self.scale)
+        except TypeError:
+            return Fraction(0)
+
+    def _add(self, row: int, sign: int) -> None:
+        cell = self._cell(row)
+        self.sums[cell] += sign * self._amount(row)
+        self.counts[cell] += sign
+
+    def set_cell(self, row: int, col: str, value) -> bool:
+        """셀 하나 반영 (집계에 쓰지 않는 열이면 False)"""
+        if col not in ("항목", self.amount_col):
+            return False
+        self._add(row, -1)
+        if col == "항목":
+            self.items[row] = value
+        else:
+            self.raw[row] = value
+        self._add(row, 1)
+        return True
+
+    def cost(self, mode: str = "경영비", feed_cost: float | None = None) -> float:
+        """calculate_cost_from_table 과 같은 값 (경영비: 기회비용 항목 제외, feed_cost: 사료비 행 금액 대체)"""
+        cells = [c for c in self.sums if mode != "경영비" or not c[0]]
+        total = sum((self.sums[c] for c in cells), Fraction(0))
+        if feed_cost is not None:
+            total += sum((self.counts[c] * _exact(feed_cost) - self.sums[c] for c in cells if c[1]), Fraction(0))
+        return float(total)
+
+    def opportunity(self) -> float:
+        return float(self.sums[(True, False)] + self.sums[(True, True)])
+
+    def feed_amount(self) -> float:
+        """사료비 행 금액 합 (원/년)"""
+        return float(self.sums[(False, True)] + self.sums[(True, True)])
+
+class GradeTotals:
+    """등급표 행별 (출현율/100 × 지육단가 × 도체중) 과 그 정확한 합 (calculate_avg_price 와 같은 값)"""
+
+    def __init__(self, df: pd.DataFrame):
+        self.cols = {c: df[c].tolist() for c in GRADE_COLUMNS}
+        self.terms = [self._term(row) for row in range(len(df))]
+        self.total = sum(self.terms, Fraction(0))
+
+    def _term(self, row: int) -> Fraction:
+        ratio, price, weight = (self.cols[c][row] for c in GRADE_COLUMNS)
+        try:
+            return _exact(ratio / 100 * price * weight)
+        except TypeError:
+            return Fraction(0)
+
+    def set_cell(self, row: int, col: str, value) -> bool:
+        if col not in self.cols:
+            return False
+        self.cols[col][row] = value
+        term = self._term(row)
+        self.total += term - self.terms[row]
+        self.terms[row] = term
+        return True
+
+    def avg_price(self) -> int:
+        return int(float(self.total))
+
+class TableAggregates:
+    """세션의 비용표·등급표 집계.
+
+    표마다 기준 표 (SharedTables) 로 한 번 만들어 두고, sync 는 직전에 반영한 변경분과 값이 다른 셀만 제자리에서 적용한다
+    (편집한 셀 수에 비례, 표 크기와 무관). 행·열 구성이 다른 표 ({"frame": df} 변경분) 로 바뀌면 그 표로 다시 만든다.
+    verify 가 참이면 sync 할 때마다 전체 재계산 (tables.calculate_*) 과 비교해 하나라도 다르면 AssertionError 를 낸다.
+    """
+
+    def __init__(self, tables: SharedTables, verify: bool = False):
+        self.tables = tables
+        self.verify = verify
+        self._totals: dict[str, CostTotals | GradeTotals] = {}
+        self._applied: dict[str, dict] = {}
+        self.cells_applied = 0
+        self.rebuilds = 0
+        self.checks = 0
+
+    def _build(self, name: str, df: pd.DataFrame) -> CostTotals | GradeTotals:
+        self.rebuilds += 1
+        return (CostTotals if name in COST_TABLES else GradeTotals)(df)
+
+    def sync(self, name: str, delta: dict | None) -> CostTotals | GradeTotals:
+        """name 표의 집계를 delta (SharedTables 변경분) 에 맞춘다"""
+        delta = delta or {}
+        totals, applied = self._totals.get(name), self._applied.get(name)
+        if "frame" in delta:
+            if applied is None or applied.get("frame") is not delta["frame"]:
+                totals = self._totals[name] = self._build(name, delta["frame"])
+                self._applied[name] = {"frame": delta["frame"]}
+                self._check(name, delta)
+            return totals
+        if totals is None or "frame" in applied:
+            totals = self._totals[name] = self._build(name, self.tables.base(name))
+            applied = self._applied[name] = {}
+        base = self.tables.base(name)
+        changed = 0
+        for key, value in delta.items():
+            old = applied.get(key, _MISSING)
+            if old is value or (old is not _MISSING and old == value):
+                continue
+            applied[key] = value
+            changed += totals.set_cell(key[0], key[1], value)
+        for key in [k for k in applied if k not in delta]:
+            del applied[key]
+            changed += totals.set_cell(key[0], key[1], base[key[1]].iat[key[0]])
+        self.cells_applied += changed
+        if changed:
+            self._check(name, delta)
+        return totals
+
+    def mismatches(self, name: str, delta: dict | None = None) -> dict[str, tuple[float, float]]:
+        """증분 집계와 전체 재계산이 다른 항목 {항목: (증분, 전체)} (모두 같으면 빈 dict)"""
+        totals = self.sync(name, delta)
+        df = self.tables.frame(name, delta)
+        if isinstance(totals, CostTotals):
+            pairs = {f"{mode}/사료비 {'대체' if feed is not None else '표'}": (totals.cost(mode, feed), calculate_cost_from_table(df, mode, feed))
+                     for mode in ("경영비", "생산비") for feed in (None, _FEED_PROBE)}
+            pairs["기회비용"] = (totals.opportunity(), calculate_opportunity_cost(df))
+        else:
+            pairs = {"평균 가격": (totals.avg_price(), calculate_avg_price(df))}
+        return {k: (a, b) for k, (a, b) in pairs.items() if a != b}
+
+    def _check(self, name: str, delta: dict) -> None:
+        if not self.verify:
+            return
+        self.checks += 1
+        bad = self.mismatches(name, delta)
+        if bad:
+            raise AssertionError(f"증분 집계 불일치 ({name}): {bad}")
+
+    def cost(self, name: str, delta: dict | None, mode: str = "경영비", feed_cost: float | None = None) -> float:
+        return self.sync(name, delta).cost(mode, feed_cost)
+
+    def opportunity_cost(self, name: str, delta: dict | None) -> float:
+        return self.sync(name, delta).opportunity()
+
+    def feed_amount(self, name: str, delta: dict | None) -> float:
+        return self.sync(name, delta).feed_amount()
+
+    def avg_price(self, name: str, delta: dict | None) -> int:
+        return self.sync(name, delta).avg_price()
@@ -0,0 +1,107 @@
+"""송아지 분배 최적화 (교체율 설정 탭의 수기 입력 대체)"""
+from __future__ import annotations
+
+import math
+from typing import TYPE_CHECKING
+
+from .scenario import ALLOC_KEYS, SCENARIO_ARGS, clamp_int, compute_scenario, compute_scenario_batch
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# 최적화 대상 분배 항목 (폐사 두수·폐사 월령은 입력값으로 고정)
+DECISION_KEYS: tuple[str, ...] = (
+    "annual_culls", "female_calf_sell", "female_fatten_in", "female_fatten_out",
+    "kpn_male", "male_calf_sell", "male_fatten_in", "male_fatten_out",
+)
+
+def _net_coefficients(params: dict):
+    """Net Final = const + coef · x 의 (const, coef).
+
+    compute_scenario 는 정수 두수에 대해 선형이므로 0 기준점과 단위 증분의 차이로 계수가 정확히 구해진다.
+    """
+    import numpy as np
+    n = len(DECISION_KEYS)
+    cols = {k: np.full(n + 1, float(params.get(k, 0))) for k in SCENARIO_ARGS}
+    for i, k in enumerate(DECISION_KEYS):
+        cols[k][:] = 0.0
+        cols[k][i + 1] = 1.0
+    net = compute_scenario_batch(cols)["Net Final"]
+    return float(net[0]), net[1:] - net[0]
+
+def optimize_allocation(params: dict, repl_range: tuple[float, float] = (0.0, 100.0), bounds: dict | None = None, profile_points: int = 101) -> dict:
+    """Net Final 을 최대화하는 정수 분배를 MILP 로 구한다.
+
+    params 는 compute_scenario 인자명 기준의 농장 입력(분배 항목 제외 가능)이며, female_loss / male_loss /
+    loss_months 는 고정값으로 쓰인다. kpn_male 은 기본적으로 입력값에 고정되며 bounds={"kpn_male": (lo, hi)} 로 풀 수 있다.
+    제약: 암/수 분배 합계 ≤ 생산 두수, 자가비육 출하 ≤ 투입, 교체율(%) ∈ repl_range.
+    profile_points > 0 이면 교체율 구간의 최대 profile_points 개 지점에서 도태 두수를 고정해 푼 최대 순이익을 "profile" 로 함께 반환한다.
+    (각 교체율의 최적값 곡선이며 지배된 점을 걸러낸 Pareto frontier 는 아니다.)
+    """
+    import numpy as np
+    from scipy.optimize import Bounds, LinearConstraint, milp
+
+    base_cows = clamp_int(params["base_cows"], 1)
+    birth_total = base_cows * params["conception_rate"]
+    birth_female = birth_total * params["female_birth_ratio"]
+    birth_male = birth_total * (1 - params["female_birth_ratio"])
+
+    _, coef = _net_coefficients(params)
+    idx = {k: i for i, k in enumerate(DECISION_KEYS)}
+
+    lo = np.zeros(len(DECISION_KEYS))
+    hi = np.full(len(DECISION_KEYS), np.inf)
+    lo[idx["annual_culls"]] = math.ceil(repl_range[0] / 100 * base_cows - 1e-9)
+    hi[idx["annual_culls"]] = min(math.floor(repl_range[1] / 100 * base_cows + 1e-9), math.floor(birth_female - params.get("female_loss", 0)))
+    kpn = clamp_int(params.get("kpn_male", 0))
+    for k, (b_lo, b_hi) in {"kpn_male": (kpn, kpn), **(bounds or {})}.items():
+        lo[idx[k]], hi[idx[k]] = b_lo, b_hi
+    if lo[idx["annual_culls"]] > hi[idx["annual_culls"]]:
+        raise ValueError(f"교체율 범위 {repl_range} 에 해당하는 정수 도태 두수가 없습니다.")
+
+    A = np.zeros((4, len(DECISION_KEYS)))
+    A[0, [idx["annual_culls"], idx["female_calf_sell"], idx["female_fatten_in"]]] = 1
+    A[1, [idx["kpn_male"], idx["male_calf_sell"], idx["male_fatten_in"]]] = 1
+    A[2, [idx["female_fatten_out"], idx["female_fatten_in"]]] = (1, -1)
+    A[3, [idx["male_fatten_out"], idx["male_fatten_in"]]] = (1, -1)
+    ub = np.array([birth_female - params.get("female_loss", 0), birth_male - params.get("male_loss", 0), 0, 0])
+    constraints = LinearConstraint(A, -np.inf, ub)
+    integrality = np.ones(len(DECISION_KEYS))
+
+    def _solve(b_lo, b_hi):
+        sol = milp(-coef, constraints=constraints, bounds=Bounds(b_lo, b_hi), integrality=integrality)
+        return np.round(sol.x).astype(int) if sol.status == 0 else None
+
+    x = _solve(lo, hi)
+    if x is None:
+        raise ValueError("제약을 만족하는 분배가 없습니다. (생산 두수, 폐사, KPN, 교체율 범위 확인)")
+
+    alloc = {k: params.get(k, 0) for k in ALLOC_KEYS}
+    alloc.update({k: int(v) for k, v in zip(DECISION_KEYS, x)})
+    scenario_args = {k: params.get(k, 0) for k in SCENARIO_ARGS} | alloc
+    out = {
+        "alloc": alloc,
+        "repl_rate": alloc["annual_culls"] / base_cows * 100,
+        "result": compute_scenario(params.get("name", "최적 분배"), **scenario_args),
+    }
+    out["Net Final"] = out["result"]["Net Final"]
+    if profile_points > 0:
+        out["profile"] = _repl_profile(_solve, lo, hi, idx["annual_culls"], scenario_args, base_cows, profile_points)
+    return out
+
+def _repl_profile(solve, lo, hi, i_cull, scenario_args, base_cows, n_points) -> pd.DataFrame:
+    """도태 두수(교체율)를 고정해 푼 최대 순이익 (해는 compute_scenario_batch 한 번으로 재평가)"""
+    import numpy as np
+    import pandas as pd
+    solutions = []
+    for culls in np.unique(np.linspace(lo[i_cull], hi[i_cull], n_points).round().astype(int)):
+        b_lo, b_hi = lo.copy(), hi.copy()
+        b_lo[i_cull] = b_hi[i_cull] = culls
+        x = solve(b_lo, b_hi)
+        if x is not None:
+            solutions.append(x)
+    if not solutions:
+        return pd.DataFrame(columns=["annual_culls", "repl_rate", "Net Final"])
+    xs = np.array(solutions)
+    net = compute_scenario_batch(scenario_args, **{k: xs[:, i] for i, k in enumerate(DECISION_KEYS)})["Net Final"]
+    return pd.DataFrame({"annual_culls": xs[:, i_cull], "repl_rate": xs[:, i_cull] / base_cows * 100, "Net Final": net})
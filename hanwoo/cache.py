@@ -0,0 +1,143 @@
+"""입력 해시 기반 메모이제이션 (크기 제한 LRU + 적중 통계)"""
+from __future__ import annotations
+
+import functools
+import hashlib
+import struct
+import threading
+from collections import OrderedDict
+
+_MISSING = object()
+
+def _feed(h, obj) -> None:
+    """obj 를 타입 태그와 함께 해시에 누적 (내용이 같으면 프로세스·실행과 무관하게 같은 값)"""
+    match obj:
+        case None:
+            h.update(b"N")
+        case bool():
+            h.update(b"B1" if obj else b"B0")
+        case int():
+            h.update(b"I" + str(obj).encode())
+        case float():
+            h.update(b"F" + struct.pack("<d", obj))
+        case str():
+            h.update(b"S" + struct.pack("<q", len(obj)) + obj.encode("utf-8", "surrogatepass"))
+        case bytes():
+            h.update(b"Y" + struct.pack("<q", len(obj)) + obj)
+        case tuple() | list():
+            h.update(b"L" + struct.pack("<q", len(obj)))
+            for item in obj:
+                _feed(h, item)
+        case dict():
+            h.update(b"D" + struct.pack("<q", len(obj)))
+            for k in sorted(obj, key=repr):
+                _feed(h, k)
+                _feed(h, obj[k])
+        case _ if type(obj).__module__.startswith("pandas"):
+            _feed_pandas(h, obj)
+        case _ if hasattr(obj, "dtype") and hasattr(obj, "tobytes"):
+            h.update(b"A" + obj.dtype.str.encode() + repr(obj.shape).encode())
+            h.update(obj.tobytes() if obj.dtype != object else repr(obj.tolist()).encode())
+        case _:
+            h.update(b"R" + repr(obj).encode())
+
+def _feed_pandas(h, obj) -> None:
+    import pandas as pd
+    match obj:
+        case pd.DataFrame():
+            h.update(b"P")
+            _feed(h, [str(c) for c in obj.columns])
+            _feed(h, [str(d) for d in obj.dtypes])
+        case pd.Series():
+            h.update(b"Q")
+            _feed(h, [str(obj.name), str(obj.dtype)])
+        case _:
+            h.update(b"R" + repr(obj).encode())
+            return
+    try:
+        h.update(pd.util.hash_pandas_object(obj, index=True).to_numpy().tobytes())
+    except TypeError:
+        h.update(obj.to_json(orient="split").encode())
+
+def stable_hash(*objs) -> str:
+    """스칼라/컨테이너/NumPy 배열/DataFrame 내용 기반 해시 (hex)"""
+    h = hashlib.blake2b(digest_size=16)
+    _feed(h, objs)
+    return h.hexdigest()
+
+class LRUCache:
+    """크기 제한 LRU. 적중/미적중/축출 횟수를 센다 (스레드 안전)."""
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=_MISSING):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {"size": len(self._data), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses,
+                "evictions": self.evictions, "hit_rate": self.hits / total if total else 0.0}
+
+# 이름 -> 캐시. 같은 이름으로 다시 memoize 하면 (Streamlit 재실행으로 함수가 재정의되어도) 기존 캐시를 이어 쓴다.
+_REGISTRY: dict[str, LRUCache] = {}
+
+def memoize(maxsize: int = 128, name: str | None = None):
+    """인자 내용 해시를 키로 결과를 캐시하는 데코레이터. 캐시된 결과 객체는 프로세스 안의 모든 세션이 공유하므로 수정하지 않는다.
+
+    감싼 함수에는 wrapper.cache (LRUCache) 와 그 캐시만 비우는 wrapper.cache_clear() 가 붙는다.
+
+    키 해시 비용이 있으므로 계산이 수 µs 인 함수에는 쓰지 않고, Styler·차트처럼 세션에서 고쳐 쓰는 표시 객체 대신 그 바탕 표를 캐시한다.
+    """
+    def deco(func):
+        cache_name = name or f"{func.__module__}.{func.__qualname__}"
+        cache = _REGISTRY.setdefault(cache_name, LRUCache(maxsize))
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = stable_hash(args, kwargs)
+            value = cache.get(key)
+            if value is _MISSING:
+                value = func(*args, **kwargs)
+                cache.put(key, value)
+            return value
+
+        wrapper.cache = cache
+        wrapper.cache_clear = cache.clear
+        return wrapper
+    return deco
+
+def cache_stats() -> dict[str, dict]:
+    """등록된 모든 memoize 캐시의 통계"""
+    return {name: cache.stats() for name, cache in _REGISTRY.items()}
+
+def clear_caches() -> None:
+    for cache in _REGISTRY.values():
+        cache.clear()
@@ -0,0 +1,142 @@
+"""명령행 도구: 배치 실행 (python -m hanwoo batch farms.csv out.parquet), 평가 서비스 (python -m hanwoo serve),
+개체 등록부 집계 (python -m hanwoo registry herd.csv --events events.csv)"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from .linear import BREAK_EVEN_TARGETS, break_even
+from .scenario import default_farm_args
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+def evaluate_chunk(ids, params: dict, layout: str, with_break_even: bool = False) -> pd.DataFrame:
+    """iter_scenario_chunks 의 청크 하나를 평가해 항목별 금액 표 (export.report_frames) 를 반환한다 (작업 프로세스에서 실행).
+
+    with_break_even 이면 (wide 전용) 순이익 0 이 되는 입력값 컬럼 "break_even:<인자명>" 을 덧붙인다.
+    """
+    from .export import report_frames
+    out = next(report_frames([(ids, params)], layout))
+    if with_break_even:
+        for target, args in BREAK_EVEN_TARGETS.items():
+            be = break_even(params, target)
+            for k in args:
+                out[f"break_even:{k}"] = be[k]
+    return out
+
+def run_batch(src: Path, dst: Path, chunk_size: int = 100_000, workers: int | None = None, layout: str = "wide",
+              mode: str | None = "경영비", id_column: str | None = "farm_id", progress=None, with_break_even: bool = False) -> int:
+    """src 의 농장 행을 청크 단위로 평가해 dst 에 쓴다 (export.ReportWriter, 확장자로 형식 결정 - 모르는 확장자는 CSV). 처리한 행 수를 반환한다.
+
+    mode 가 None 이면 기본값을 채우지 않으며 모든 입력 컬럼이 있어야 한다.
+    진행 중인 청크는 최대 workers * 2 개로 제한되므로 메모리 사용량은 입력 크기와 무관하다.
+    결과는 입력 순서대로 기록된다.
+    """
+    from .export import SUFFIX_FORMATS, ReportWriter, iter_scenario_chunks
+    defaults = default_farm_args(mode) if mode else {}
+    workers = workers or os.cpu_count() or 1
+    chunks = iter_scenario_chunks(src, chunk_size, defaults, id_column)
+    with ReportWriter(dst, SUFFIX_FORMATS.get(Path(dst).suffix.lower(), "csv")) as writer:
+        if workers <= 1:
+            for ids, params in chunks:
+                writer.write(evaluate_chunk(ids, params, layout, with_break_even))
+                if progress: progress(writer.rows)
+            return writer.rows
+
+        from concurrent.futures import ProcessPoolExecutor
+        pending: deque = deque()
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for ids, params in chunks:
+                pending.append(pool.submit(evaluate_chunk, ids, params, layout, with_break_even))
+                if len(pending) >= workers * 2:
+                    writer.write(pending.popleft().result())
+                    if progress: progress(writer.rows)
+            while pending:
+                writer.write(pending.popleft().result())
+                if progress: progress(writer.rows)
+        return writer.rows
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m hanwoo", description="한우 시뮬레이터 명령행 도구")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    batch = sub.add_parser("batch", help="농장별 입력 파일(CSV/Parquet)을 평가해 항목별 금액을 CSV/Parquet/Excel 로 저장")
+    batch.add_argument("input", type=Path, help="입력 파일 (한 행 = 한 농장, 컬럼명 = compute_scenario 인자명)")
+    batch.add_argument("output", type=Path, help="출력 파일 (.csv / .parquet / .xlsx)")
+    batch.add_argument("--chunk-size", type=int, default=100_000, help="청크 행 수 (기본 100000)")
+    batch.add_argument("--workers", type=int, default=None, help="프로세스 수 (기본: CPU 수, 1 이면 단일 프로세스)")
+    batch.add_argument("--layout", choices=("wide", "long"), default="wide", help="wide: 농장당 한 행 / long: 농장×항목 행")
+    batch.add_argument("--mode", choices=("경영비", "생산비"), default="경영비", help="없는 컬럼을 채울 기본 비용 기준")
+    batch.add_argument("--strict", action="store_true", help="기본값을 채우지 않고 모든 입력 컬럼을 요구")
+    batch.add_argument("--id-column", default="farm_id", help="출력 id 로 쓸 입력 컬럼 (없으면 행 번호)")
+    batch.add_argument("--break-even", action="store_true", help="손익분기 입력값 컬럼 추가 (송아지·비육우 가격, 수태율, 비육 비용; wide 전용)")
+
+    serve = sub.add_parser("serve", help="로컬 HTTP/JSON 시나리오 평가 서비스 (/evaluate, /batch, /health, /args)")
+    serve.add_argument("--host", default="127.0.0.1", help="바인드 주소 (기본 127.0.0.1)")
+    serve.add_argument("--port", type=int, default=8765, help="포트 (기본 8765)")
+    serve.add_argument("--workers", type=int, default=None, help="작업 프로세스 수 (기본: CPU 수, 1 이하이면 서버 프로세스에서 평가)")
+    serve.add_argument("--max-batch", type=int, default=256, help="단건 요청을 묶는 최대 건수 (기본 256)")
+    serve.add_argument("--max-wait-ms", type=float, default=2.0, help="배치를 모으는 최대 대기 (ms, 기본 2)")
+    serve.add_argument("--max-pending", type=int, default=10_000, help="대기 요청 한도 - 넘으면 503 (기본 10000)")
+
+    registry = sub.add_parser("registry", help="개체 재고·이력 파일로 상태·월령별 두수와 분배 입력(연 환산)을 집계")
+    registry.add_argument("inventory", type=Path, nargs="?", help="재고 파일 (tag, birth_date, sex[, dam, status, weight]) 또는 저장한 등록부 .npz")
+    registry.add_argument("--events", type=Path, action="append", default=[], help="이력 파일 (tag, date, event[, sex, dam, weight]) - 여러 번 지정 가능")
+    registry.add_argument("--at", default=None, help="기준일 (기본: 마지막 이력일)")
+    registry.add_argument("--months", type=int, default=12, help="이력 집계 기간 (개월, 기본 12)")
+    registry.add_argument("--save", type=Path, default=None, help="이력 반영 후 등록부를 .npz 로 저장")
+    return parser
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    match args.command:
+        case "batch":
+            if args.break_even and args.layout != "wide":
+                print("오류: --break-even 은 --layout wide 에서만 쓸 수 있습니다", file=sys.stderr)
+                return 1
+            t0 = time.perf_counter()
+            try:
+                rows = run_batch(args.input, args.output, chunk_size=args.chunk_size, workers=args.workers, layout=args.layout,
+                                 mode=None if args.strict else args.mode, id_column=args.id_column, with_break_even=args.break_even,
+                                 progress=lambda r: print(f"\r{r:,}행 처리", end="", file=sys.stderr))
+            except KeyError as e:
+                print(f"\n오류: {e.args[0]}", file=sys.stderr)
+                return 1
+            except FileNotFoundError as e:
+                print(f"\n오류: {e}", file=sys.stderr)
+                return 1
+            print(f"\n{rows:,}행 -> {args.output} ({time.perf_counter() - t0:.1f}초)", file=sys.stderr)
+        case "serve":
+            from .service import make_server
+            workers = (os.cpu_count() or 1) if args.workers is None else args.workers
+            server = make_server(args.host, args.port, workers=workers if workers > 1 else 0, max_batch=args.max_batch,
+                                 max_wait=args.max_wait_ms / 1000, max_pending=args.max_pending)
+            host, port = server.server_address[:2]
+            print(f"http://{host}:{port} (작업 프로세스 {server.dispatcher.workers}개) - Ctrl+C 로 종료", file=sys.stderr)
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                pass
+            finally:
+                server.server_close()
+        case "registry":
+            import json
+            from .registry import load_registry
+            t0 = time.perf_counter()
+            try:
+                reg = load_registry(args.inventory, args.events)
+            except (KeyError, FileNotFoundError) as e:
+                print(f"오류: {e}", file=sys.stderr)
+                return 1
+            if args.save:
+                reg.save(args.save)
+            print(reg.inventory(args.at).to_string())
+            print(json.dumps(reg.farm_inputs(args.at, args.months), ensure_ascii=False, indent=2))
+            print(f"개체 {len(reg):,}두 · 이력 {reg.n_events:,}건 (제외 {reg.skipped:,}행, {time.perf_counter() - t0:.2f}초)", file=sys.stderr)
+    return 0
@@ -0,0 +1,192 @@
+"""차트 데이터 계층: 긴 추이 시계열을 서버에서 보이는 해상도로 줄여 (LTTB / 구간 최소·최대 / 구간 평균) 차트 전송량을 제한"""
+from __future__ import annotations
+
+import math
+from typing import TYPE_CHECKING
+
+from .cache import LRUCache
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+DOWNSAMPLE_METHODS: dict[str, str] = {"lttb": "LTTB (모양 보존)", "minmax": "구간 최소·최대", "mean": "구간 평균"}
+# 차트 하나가 브라우저로 보내는 최대 행 수 (모든 시리즈 합계)
+MAX_CHART_ROWS = 5000
+# 시리즈당 기본 점 수 (차트 가로 픽셀 수준)
+CHART_POINTS = 600
+# 시리즈당 최소 점 수 (시리즈가 많아도 이보다 줄이지 않음)
+MIN_POINTS = 4
+# 줌 단계마다 보이는 구간 폭의 1/ZOOM_GRID 격자에 맞춰 구간을 넓혀 캐시 키로 쓴다
+ZOOM_GRID = 8
+
+def lttb_indices(x, y, n_out: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets 로 고른 점의 위치 (정렬된 x 기준, 첫·끝 점 포함).
+
+    가운데 점들을 n_out - 2 개 구간으로 나누고, 구간마다 직전에 고른 점·다음 구간 평균점과 이루는 삼각형 넓이가 가장 큰 점을 고른다.
+    """
+    import numpy as np
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = x.size
+    if n_out >= n or n <= 2:
+        return np.arange(n)
+    if n_out < 3:
+        return np.array([0, n - 1])
+    # 구간 i = [edges[i], edges[i + 1]), 간격이 1 이상이므로 빈 구간이 없다
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    counts = np.diff(edges)
+    avg_x = np.add.reduceat(x[: n - 1], edges[:-1]) / counts
+    avg_y = np.add.reduceat(y[: n - 1], edges[:-1]) / counts
+    next_x = np.append(avg_x[1:], x[-1])
+    next_y = np.append(avg_y[1:], y[-1])
+    out = np.empty(n_out, dtype=np.int64)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        ax, ay = x[a], y[a]
+        area = np.abs((ax - next_x[i]) * (y[lo:hi] - ay) - (ax - x[lo:hi]) * (next_y[i] - ay))
+        a = out[i + 1] = lo + int(np.argmax(area))
+    return out
+
+def _bucket_groups(code: np.ndarray, x: np.ndarray, x0: float, x1: float, n_buckets: int) -> np.ndarray:
+    """(시리즈, x 구간) 묶음의 시작 위치. 행은 시리즈·x 순으로 정렬되어 있으므로 묶음이 연속이다."""
+    import numpy as np
+    width = (x1 - x0) or 1.0
+    b = np.clip(((x - x0) / width * n_buckets).astype(np.int64), 0, n_buckets - 1)
+    key = code * n_buckets + b
+    return np.flatnonzero(np.r_[True, key[1:] != key[:-1]])
+
+def minmax_indices(code, x, y, x0: float, x1: float, n_buckets: int) -> np.ndarray:
+    """시리즈별로 [x0, x1] 을 n_buckets 개 x 구간으로 나눠 구간마다 최소·최대 값 행과 시리즈 양끝 행의 위치 (x 순, 시리즈당 최대 2 × n_buckets + 2 개)"""
+    import numpy as np
+    code, x, y = np.asarray(code), np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64)
+    if code.size == 0:
+        return np.arange(0)
+    starts = _bucket_groups(code, x, x0, x1, n_buckets)
+    group = np.repeat(np.arange(starts.size), np.diff(np.append(starts, code.size)))
+    order = np.lexsort((y, group))
+    ends = np.append(starts[1:], code.size) - 1
+    series_edges = np.flatnonzero(np.r_[True, code[1:] != code[:-1]])
+    return np.unique(np.concatenate([order[starts], order[ends], series_edges, np.append(series_edges[1:], code.size) - 1]))
+
+class SeriesFrame:
+    """long-format 추이 표 (시리즈 열, x 열, 값 열 ...) 를 시리즈·x 순으로 한 번 정렬해 두고 보이는 구간만 줄여 돌려준다.
+
+    view(x_range, points) 는 x_range 를 줌 단계 (전체 폭 / 2^단계) 격자에 맞춰 넓힌 구간으로 계산하며, 결과를
+    (방법, 단계, 격자 구간, 점 수) 키로 LRU 에 보관한다. 같은 줌 단계로 되돌아오거나 다른 입력만 바뀐 재실행은 다시 계산하지 않는다.
+    결과 행 수는 max(max_rows, 시리즈 수 × MIN_POINTS) 를 넘지 않는다.
+    """
+
+    def __init__(self, df: pd.DataFrame, x: str, y: str = "Value", by: str = "Scenario", method: str = "lttb",
+                 max_rows: int = MAX_CHART_ROWS, cache_size: int = 64):
+        import numpy as np
+        import pandas as pd
+        if method not in DOWNSAMPLE_METHODS:
+            raise ValueError(f"지원하지 않는 축약 방법: {method} ({', '.join(DOWNSAMPLE_METHODS)})")
+        self.x_col, self.y_col, self.by = x, y, by
+        self.method = method
+        self.max_rows = max_rows
+        codes, names = pd.factorize(df[by], sort=False)
+        self.is_time = np.issubdtype(df[x].dtype, np.datetime64)
+        xs = df[x].to_numpy(dtype="datetime64[ns]").astype(np.int64) if self.is_time else df[x].to_numpy(dtype=np.float64)
+        order = np.lexsort((xs, codes))
+        self.frame = df.iloc[order].reset_index(drop=True)
+        self.names = [str(n) for n in names]
+        self.code = codes[order].astype(np.int64)
+        self.x = xs[order].astype(np.float64)
+        self.y = self.frame[y].to_numpy(dtype=np.float64)
+        self.offsets = np.searchsorted(self.code, np.arange(len(self.names) + 1))
+        self.cache = LRUCache(cache_size)
+        self.last_rows = 0
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    @property
+    def x_bounds(self) -> tuple[float, float]:
+        return (float(self.x.min()), float(self.x.max())) if len(self) else (0.0, 0.0)
+
+    def to_x(self, value) -> float:
+        """x 열 값 (날짜 포함) -> 내부 float 좌표"""
+        import numpy as np
+        return float(np.datetime64(value, "ns").astype(np.int64)) if self.is_time else float(value)
+
+    def zoom_key(self, x_range=None) -> tuple[int, int, int]:
+        """x_range -> (줌 단계, 격자 시작, 격자 끝). 단계 k 의 격자 간격은 전체 폭 / (2^k × ZOOM_GRID)."""
+        x_min, x_max = self.x_bounds
+        span = x_max - x_min
+        if x_range is None or span <= 0:
+            return 0, 0, ZOOM_GRID
+        lo, hi = sorted(min(max(self.to_x(v), x_min), x_max) for v in x_range)
+        level = max(0, int(math.floor(math.log2(span / max(hi - lo, span * 2.0 ** -30)))))
+        step = span / (2 ** level * ZOOM_GRID)
+        g0 = int(math.floor((lo - x_min) / step))
+        return level, g0, max(int(math.ceil((hi - x_min) / step)), g0 + 1)
+
+    def view(self, x_range=None, points: int = CHART_POINTS, method: str | None = None) -> pd.DataFrame:
+        """x_range (양끝 포함, None 이면 전체) 에 보이는 구간을 시리즈당 최대 points 개 점으로 줄인 표.
+
+        구간 안 행 수가 (시리즈 수 × 시리즈당 점 수) 이하이면 줄이지 않고 그대로 돌려준다. 결과는 캐시에서 공유되므로 수정하지 않는다.
+        """
+        method = method or self.method
+        level, g0, g1 = self.zoom_key(x_range)
+        key = (method, level, g0, g1, points)
+        out = self.cache.get(key, None)
+        if out is None:
+            x_min, x_max = self.x_bounds
+            step = (x_max - x_min) / (2 ** level * ZOOM_GRID)
+            out = self._reduce(x_min + g0 * step, x_min + g1 * step, points, method)
+            self.cache.put(key, out)
+        self.last_rows = len(out)
+        return out
+
+    def _window(self, x0: float, x1: float) -> np.ndarray:
+        """시리즈마다 [x0, x1] 안의 행과 양옆 한 행씩 (선이 차트 경계까지 이어지도록)"""
+        import numpy as np
+        parts = []
+        for s in range(len(self.names)):
+            a, b = self.offsets[s], self.offsets[s + 1]
+            xs = self.x[a:b]
+            lo = max(int(np.searchsorted(xs, x0, "left")) - 1, 0)
+            hi = min(int(np.searchsorted(xs, x1, "right")) + 1, b - a)
+            if hi > lo:
+                parts.append(np.arange(a + lo, a + hi))
+        return np.concatenate(parts) if parts else np.arange(0)
+
+    def _reduce(self, x0: float, x1: float, points: int, method: str) -> pd.DataFrame:
+        import numpy as np
+        rows = self._window(x0, x1)
+        code = self.code[rows]
+        n_series = np.unique(code).size
+        per = max(MIN_POINTS, min(points, self.max_rows // max(n_series, 1)))
+        if rows.size <= n_series * per:
+            return self.frame.iloc[rows].reset_index(drop=True)
+        if method == "mean":
+            return self._bucket_mean(rows, x0, x1, per)
+        if method == "minmax":
+            keep = rows[minmax_indices(code, self.x[rows], self.y[rows], x0, x1, max((per - 2) // 2, 1))]
+        else:
+            bounds = np.flatnonzero(np.r_[True, code[1:] != code[:-1], True])
+            keep = np.concatenate([rows[a:b][lttb_indices(self.x[rows[a:b]], self.y[rows[a:b]], per)]
+                                   for a, b in zip(bounds[:-1], bounds[1:])])
+        return self.frame.iloc[keep].reset_index(drop=True)
+
+    def _bucket_mean(self, rows: np.ndarray, x0: float, x1: float, n_buckets: int) -> pd.DataFrame:
+        """x 구간별 평균 (숫자 열은 평균, 그 밖의 열은 구간 첫 행 값, x 는 구간 안 x 평균)"""
+        import numpy as np
+        import pandas as pd
+        starts = _bucket_groups(self.code[rows], self.x[rows], x0, x1, n_buckets)
+        counts = np.diff(np.append(starts, rows.size))
+        window = self.frame.iloc[rows]
+        out = window.iloc[starts].reset_index(drop=True)
+        for col in window.select_dtypes("number").columns:
+            if col != self.x_col:
+                out[col] = np.add.reduceat(window[col].to_numpy(dtype=np.float64), starts) / counts
+        x_mean = np.add.reduceat(self.x[rows], starts) / counts
+        out[self.x_col] = pd.to_datetime(x_mean.round().astype(np.int64)) if self.is_time else x_mean
+        return out
+
+    def stats(self) -> dict:
+        return {"rows": len(self), "series": len(self.names), "last_rows": self.last_rows, **self.cache.stats()}
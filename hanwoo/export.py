@@ -0,0 +1,176 @@
+"""여러 시나리오·농장의 항목별 손익 보고서 스트리밍 내보내기 (CSV / Parquet / Excel)"""
+from __future__ import annotations
+
+import io
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator
+
+from .report import LINE_ITEMS, line_items_frame
+from .scenario import SCENARIO_ARGS, compute_scenario_batch
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# 형식 -> (MIME, 확장자)
+EXPORT_FORMATS: dict[str, tuple[str, str]] = {
+    "xlsx": ("application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", ".xlsx"),
+    "csv": ("text/csv", ".csv"),
+    "parquet": ("application/vnd.apache.parquet", ".parquet"),
+}
+SUFFIX_FORMATS: dict[str, str] = {".xlsx": "xlsx", ".csv": "csv", ".parquet": "parquet", ".pq": "parquet"}
+XLSX_MAX_ROWS = 1_048_576          # 시트당 최대 행 (머리글 포함) - 넘으면 다음 시트로 이어 쓴다
+
+def _display(v):
+    """산출 근거 표시용: 정수인 실수 (배치 결과의 두수) 는 정수로"""
+    v = v.item() if hasattr(v, "item") else v
+    return int(v) if isinstance(v, float) and v.is_integer() else v
+
+def basis_column(batch: dict) -> list[str]:
+    """long-format 행 순서 (시나리오 × LINE_ITEMS) 의 '산출 근거' 문자열 (make_excel_view 와 같은 문구)"""
+    import numpy as np
+    cols = {k: v.tolist() for k, v in batch.items() if isinstance(v, np.ndarray) and v.dtype != object}
+    out = []
+    for i in range(batch["Net Final"].shape[0]):
+        row = {k: _display(v[i]) for k, v in cols.items()}
+        out.extend(basis(row) for *_, basis in LINE_ITEMS)
+    return out
+
+def iter_scenario_chunks(source, chunk_size: int = 50_000, defaults: dict | None = None, id_column: str = "id") -> Iterator[tuple]:
+    """source -> (ids, compute_scenario_batch 입력) 청크.
+
+    source 는 DataFrame, {인자: 값 목록} dict, 또는 입력 파일 (경로·업로드 파일; CSV/Parquet, 청크 단위로 읽음) 이다.
+    없는 인자는 defaults 로 채우고, id_column 이 없으면 행 번호를 id 로 쓴다.
+    """
+    import numpy as np
+    import pandas as pd
+    from .io import iter_chunks
+    defaults = defaults or {}
+    if isinstance(source, dict):
+        source = pd.DataFrame(source)
+    if isinstance(source, pd.DataFrame):
+        frames = (source.iloc[i:i + chunk_size] for i in range(0, len(source), chunk_size))
+    else:
+        frames = iter_chunks(source, chunk_size)
+    start = 0
+    for df in frames:
+        missing = [k for k in SCENARIO_ARGS if k not in df.columns and k not in defaults]
+        if missing:
+            raise KeyError(f"누락된 입력 컬럼: {', '.join(missing)}")
+        ids = df[id_column].to_numpy() if id_column in df.columns else np.arange(start, start + len(df))
+        yield ids, {k: (df[k].to_numpy() if k in df.columns else defaults[k]) for k in SCENARIO_ARGS}
+        start += len(df)
+
+def report_frames(chunks, layout: str = "wide", with_basis: bool = False) -> Iterator[pd.DataFrame]:
+    """(ids, 입력) 청크를 평가해 항목별 금액 표를 차례로 낸다. with_basis 는 long 에서 '산출 근거' 컬럼을 붙인다."""
+    for ids, params in chunks:
+        batch = compute_scenario_batch(params)
+        df = line_items_frame(batch, ids=ids, layout=layout)
+        if with_basis and layout == "long":
+            df.insert(3, "산출 근거", basis_column(batch))
+        yield df
+
+class ReportWriter:
+    """항목별 금액 표를 청크 단위로 이어 쓴다 (메모리 사용량은 청크 크기에만 비례).
+
+    CSV 는 엑셀에서 한글이 깨지지 않도록 UTF-8 BOM 을 붙이고, Parquet 은 청크마다 row group 을 추가하며,
+    Excel 은 openpyxl write-only 통합 문서에 행을 흘려 쓴다 (시트 최대 행을 넘으면 다음 시트). target 은 경로 또는 바이너리 파일 객체다.
+    """
+
+    def __init__(self, target, fmt: str | None = None, sheet_title: str = "보고서"):
+        self.target = target
+        self.fmt = fmt or SUFFIX_FORMATS.get(Path(str(target)).suffix.lower(), "")
+        if self.fmt not in EXPORT_FORMATS:
+            raise ValueError(f"지원하지 않는 형식: {self.fmt}")
+        self.sheet_title = sheet_title
+        self.rows = 0
+        self._handle = None
+        self._schema = None
+        self._columns = None
+        self._sheet = None
+        self._sheet_rows = 0
+
+    def write(self, df: pd.DataFrame) -> None:
+        match self.fmt:
+            case "csv":
+                self._write_csv(df)
+            case "parquet":
+                self._write_parquet(df)
+            case "xlsx":
+                self._write_xlsx(df)
+        self.rows += len(df)
+
+    def _write_csv(self, df) -> None:
+        if self._handle is None:
+            raw = open(self.target, "wb") if isinstance(self.target, (str, Path)) else self.target
+            self._handle = io.TextIOWrapper(raw, encoding="utf-8-sig", newline="")
+        df.to_csv(self._handle, index=False, header=self.rows == 0, lineterminator="\n")
+
+    def _write_parquet(self, df) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        table = pa.Table.from_pandas(df, schema=self._schema, preserve_index=False)
+        if self._handle is None:
+            self._schema = table.schema
+            self._handle = pq.ParquetWriter(self.target, self._schema)
+        self._handle.write_table(table)
+
+    def _new_sheet(self) -> None:
+        n = len(self._handle.worksheets) + 1
+        self._sheet = self._handle.create_sheet(self.sheet_title if n == 1 else f"{self.sheet_title} {n}")
+        self._sheet.freeze_panes = "B2"
+        for j, col in enumerate(self._columns):
+            self._sheet.column_dimensions[_column_letter(j)].width = max(10, min(40, len(str(col)) * 2 + 2))
+        self._sheet.append(self._columns)
+        self._sheet_rows = 1
+
+    def _write_xlsx(self, df) -> None:
+        if self._handle is None:
+            from openpyxl import Workbook
+            self._handle = Workbook(write_only=True)
+            self._columns = [str(c) for c in df.columns]
+        # 컬럼 단위로 파이썬 기본형으로 바꾼 뒤 행으로 묶는다 (셀마다 numpy 형 변환하지 않도록)
+        cols = [df[c].astype(object).tolist() if df[c].dtype == "category" else df[c].tolist() for c in df.columns]
+        for row in zip(*cols):
+            if self._sheet is None or self._sheet_rows >= XLSX_MAX_ROWS:
+                self._new_sheet()
+            self._sheet.append(row)
+            self._sheet_rows += 1
+
+    def close(self) -> None:
+        if self._handle is None:
+            if self.fmt == "xlsx":          # 빈 보고서도 머리글 없는 시트 하나는 있어야 열린다
+                from openpyxl import Workbook
+                self._handle = Workbook(write_only=True)
+                self._handle.create_sheet(self.sheet_title)
+            else:
+                return
+        match self.fmt:
+            case "csv":
+                self._handle.flush()
+                if isinstance(self.target, (str, Path)):
+                    self._handle.close()
+                else:
+                    self._handle.detach()   # 호출 측 파일 객체는 닫지 않음
+            case "parquet":
+                self._handle.close()
+            case "xlsx":
+                self._handle.save(self.target)
+        self._handle = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def _column_letter(j: int) -> str:
+    from openpyxl.utils import get_column_letter
+    return get_column_letter(j + 1)
+
+def export_report(source, target, fmt: str | None = None, layout: str = "wide", chunk_size: int = 50_000,
+                  with_basis: bool = False, defaults: dict | None = None, id_column: str = "id") -> int:
+    """source 의 시나리오·농장을 청크 단위로 평가해 target 에 보고서를 쓴다. 쓴 행 수를 반환한다."""
+    with ReportWriter(target, fmt) as writer:
+        for df in report_frames(iter_scenario_chunks(source, chunk_size, defaults, id_column), layout, with_basis):
+            writer.write(df)
+    return writer.rows
@@ -0,0 +1,130 @@
+"""최소비용 사료 배합 (성장 단계별 선형계획) -> 두당 연간 사료비"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from .cache import memoize
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+FEED_TARGETS: tuple[str, ...] = ("번식우", "비육우")
+# 사료별 영양 성분 컬럼 -> 단계별 최소 요구량 컬럼 (모두 건물 기준 %)
+NUTRIENTS: dict[str, str] = {"TDN(%)": "TDN 최소(%)", "CP(%)": "CP 최소(%)", "NDF(%)": "NDF 최소(%)"}
+
+# [사료 원료] 가격은 원물 kg 당, 성분은 건물 기준. 최소/최대는 배합 내 건물 비율 (선호 사료 비율 설정)
+_FEEDS = {
+    "사료": ["번식우 배합사료", "비육 전기 배합사료", "비육 후기 배합사료", "볏짚", "티모시", "알팔파", "옥수수 사일리지", "압편옥수수", "대두박"],
+    "가격(원/kg)": [480, 520, 540, 250, 600, 650, 150, 420, 800],
+    "건물(%)": [88, 88, 88, 88, 88, 89, 33, 87, 89],
+    "TDN(%)": [72, 75, 78, 40, 55, 58, 68, 85, 80],
+    "CP(%)": [14, 15, 12.5, 4.5, 9, 18, 8, 9, 49],
+    "NDF(%)": [30, 28, 25, 70, 62, 45, 45, 10, 14],
+    "최소(%)": [0, 0, 0, 0, 0, 0, 0, 0, 0],
+    "최대(%)": [100, 100, 100, 60, 60, 40, 50, 40, 15],
+}
+# [성장 단계] 비육우는 6~30개월 (720일) 을 세 단계로 나눈다
+_STAGES = {
+    "단계": ["번식우 (유지·임신)", "육성기", "비육 전기", "비육 후기"],
+    "대상": ["번식우", "비육우", "비육우", "비육우"],
+    "일수": [365, 180, 240, 300],
+    "건물섭취량(kg/일)": [9.0, 6.5, 8.5, 9.5],
+    "TDN 최소(%)": [55, 65, 70, 73],
+    "CP 최소(%)": [10, 14, 12.5, 11],
+    "NDF 최소(%)": [40, 35, 28, 20],
+}
+
+def default_feed_tables() -> tuple[pd.DataFrame, pd.DataFrame]:
+    """기본 (사료 원료, 성장 단계) 표"""
+    import pandas as pd
+    return pd.DataFrame({k: list(v) for k, v in _FEEDS.items()}), pd.DataFrame({k: list(v) for k, v in _STAGES.items()})
+
+def _finite(a: np.ndarray, fill: float) -> np.ndarray:
+    """빈 칸 (NaN·inf) 을 fill 로 (linprog 는 유한한 계수만 받는다)"""
+    import numpy as np
+    return np.where(np.isfinite(a), a, fill)
+
+def _solve_block(c, a_ub, b_ub, bounds):
+    from scipy.optimize import linprog
+    return linprog(c, A_ub=a_ub, b_ub=b_ub, A_eq=[[1.0] * len(c)], b_eq=[1.0], bounds=bounds, method="highs")
+
+@memoize(32, "feed.solve_rations")
+def solve_rations(feeds: pd.DataFrame, stages: pd.DataFrame, prices=None) -> dict[str, np.ndarray]:
+    """가격 시나리오 × 성장 단계마다 건물 kg 당 비용이 최소인 배합비를 구한다.
+
+    prices 는 (시나리오, 사료) 원물 가격 배열 (None 이면 표의 가격 한 개). 모든 (시나리오, 단계) 문제를
+    블록 대각 행렬 하나로 묶어 HiGHS 로 한 번에 풀고, 해가 없는 블록이 있으면 블록별로 다시 풀어 그 블록만 NaN 으로 둔다.
+    표 편집으로 빈 칸이 생기면: 사료 성분은 0, 비율 최소/최대는 0/100% 로 보고, 요구량이 빈 단계는 풀지 않고 missing 으로 표시한다.
+    결과: ratio (P, K, F) 건물 비율, cost_dm (P, K) 원/kg 건물, stage_cost (P, K) 원/두 (단계 전체), feasible (P, K), missing (K,).
+    """
+    import numpy as np
+    from scipy import sparse
+    from scipy.optimize import linprog
+    dm = feeds["건물(%)"].to_numpy(dtype=np.float64) / 100
+    prices = feeds["가격(원/kg)"].to_numpy(dtype=np.float64)[None, :] if prices is None else np.atleast_2d(np.asarray(prices, dtype=np.float64))
+    P, F, K = prices.shape[0], len(feeds), len(stages)
+    cost_dm = prices / np.where(dm > 0, dm, np.nan)
+    nutrients = _finite(feeds[list(NUTRIENTS)].to_numpy(dtype=np.float64).T, 0.0)         # (3, F)
+    required = stages[list(NUTRIENTS.values())].to_numpy(dtype=np.float64)               # (K, 3)
+    missing = ~np.isfinite(required).all(axis=1)
+    required = _finite(required, 0.0)
+    lo = _finite(feeds["최소(%)"].to_numpy(dtype=np.float64) / 100, 0.0)
+    hi = _finite(feeds["최대(%)"].to_numpy(dtype=np.float64) / 100, 1.0)
+    bounds = list(zip(lo, hi)) * (P * K)
+
+    c = np.nan_to_num(np.broadcast_to(cost_dm[:, None, :], (P, K, F)), nan=1e12).ravel()
+    a_ub = sparse.kron(sparse.identity(P * K, format="csr"), sparse.csr_matrix(-nutrients), format="csr")
+    b_ub = -np.tile(required, (P, 1)).ravel()
+    a_eq = sparse.kron(sparse.identity(P * K, format="csr"), sparse.csr_matrix(np.ones((1, F))), format="csr")
+    res = linprog(c, A_ub=a_ub, b_ub=b_ub, A_eq=a_eq, b_eq=np.ones(P * K), bounds=bounds, method="highs")
+
+    ratio = np.full((P * K, F), np.nan)
+    if res.status == 0:
+        ratio[:] = res.x.reshape(P * K, F)
+    else:
+        blocks = c.reshape(P * K, F)
+        for i in range(P * K):
+            r = _solve_block(blocks[i], -nutrients, -required[i % K], bounds[:F])
+            if r.status == 0:
+                ratio[i] = r.x
+    ratio = ratio.reshape(P, K, F)
+    ratio[:, missing] = np.nan
+    feasible = ~np.isnan(ratio).any(axis=2)
+    cost = np.nansum(ratio * np.nan_to_num(cost_dm)[:, None, :], axis=2)
+    cost = np.where(feasible, cost, np.nan)
+    daily = cost * stages["건물섭취량(kg/일)"].to_numpy(dtype=np.float64)
+    return {"ratio": ratio, "cost_dm": cost, "stage_cost": daily * stages["일수"].to_numpy(dtype=np.float64), "feasible": feasible, "missing": missing}
+
+def annual_feed_costs(result: dict, stages: pd.DataFrame) -> dict[str, np.ndarray]:
+    """대상(번식우/비육우)별 두당 연간 사료비 (시나리오 배열). 단계 비용 합계를 단계 일수 합계로 나눠 365일로 환산한다."""
+    import numpy as np
+    days = stages["일수"].to_numpy(dtype=np.float64)
+    out = {}
+    for target in FEED_TARGETS:
+        mask = (stages["대상"] == target).to_numpy()
+        total_days = days[mask].sum()
+        out[target] = result["stage_cost"][:, mask].sum(axis=1) * 365 / total_days if total_days > 0 else np.full(result["stage_cost"].shape[0], np.nan)
+    return out
+
+@memoize(32, "feed.ration_costs")
+def ration_costs(feeds: pd.DataFrame, stages: pd.DataFrame) -> dict[str, float]:
+    """표의 가격 기준 대상별 두당 연간 사료비 (원). 해가 없는 단계가 있으면 NaN."""
+    return {k: float(v[0]) for k, v in annual_feed_costs(solve_rations(feeds, stages), stages).items()}
+
+def ration_frame(result: dict, feeds: pd.DataFrame, stages: pd.DataFrame, scenario: int = 0) -> pd.DataFrame:
+    """한 가격 시나리오의 단계별 배합 (쓰인 사료만): 건물 비율, 원물 급여량, 일 비용"""
+    import numpy as np
+    import pandas as pd
+    ratio = result["ratio"][scenario]                                                      # (K, F)
+    dmi = stages["건물섭취량(kg/일)"].to_numpy(dtype=np.float64)[:, None]
+    dm = feeds["건물(%)"].to_numpy(dtype=np.float64)[None, :] / 100
+    as_fed = ratio * dmi / dm
+    k, f = np.nonzero(np.nan_to_num(ratio) > 1e-9)
+    return pd.DataFrame({
+        "단계": stages["단계"].to_numpy()[k],
+        "사료": feeds["사료"].to_numpy()[f],
+        "비율(%)": ratio[k, f] * 100,
+        "급여량(kg/일)": as_fed[k, f],
+        "비용(원/일)": as_fed[k, f] * feeds["가격(원/kg)"].to_numpy(dtype=np.float64)[f],
+    })
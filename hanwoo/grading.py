@@ -0,0 +1,190 @@
+"""도체 등급판정 자료 집계 -> 등급별 출현율·도체중·단가 (암/수 비육우 등급표 자동 입력)"""
+from __future__ import annotations
+
+import os
+from typing import TYPE_CHECKING
+
+from .tables import GRADES
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+# 0: 암비육우 (df_cow), 1: 수비육우 (df_steer)
+SEX_LABELS: tuple[str, ...] = ("암", "수")
+SEX_ALIASES: dict[str, int] = {
+    "암": 0, "암소": 0, "암비육우": 0, "F": 0, "f": 0, "cow": 0,
+    "수": 1, "수소": 1, "거세": 1, "거세우": 1, "수비육우": 1, "M": 1, "m": 1, "steer": 1,
+}
+# 등급판정 내보내기 파일의 흔한 컬럼명 -> 표준 컬럼명
+COLUMN_ALIASES: dict[str, str] = {
+    "판정일자": "date", "도축일자": "date", "농가": "farm", "농가번호": "farm", "농장": "farm",
+    "성별": "sex", "등급": "grade", "도체중": "weight", "경락단가": "price", "경락가": "price",
+}
+GRADING_COLUMNS: tuple[str, ...] = ("date", "farm", "sex", "grade", "weight", "price")
+
+N_GRADES = len(GRADES)
+N_CELLS = 2 * N_GRADES
+# 집계 값: 두수, 도체중 합, 매출(도체중 × 단가) 합
+N_FIELDS = 3
+_DAY_OFFSET = 1 << 20
+_FARM_SHIFT = 1 << 32
+
+def _normalize(chunk: pd.DataFrame, farm_codes: dict[str, int]):
+    """한 청크 -> (키, 값) 유효 행. 키 = 농가 코드 × 2^32 + (일자 + 2^20) × 64 + (성별 × 16 + 등급)"""
+    import numpy as np
+    import pandas as pd
+    df = chunk.rename(columns=COLUMN_ALIASES)
+    dates = pd.to_datetime(df["date"], errors="coerce").to_numpy(dtype="datetime64[D]")
+    day = dates.astype(np.int64)
+    farm_raw = df["farm"].astype(str) if "farm" in df.columns else pd.Series("-", index=df.index)
+    codes, uniques = pd.factorize(farm_raw)
+    farm = np.array([farm_codes.setdefault(u, len(farm_codes)) for u in uniques], dtype=np.int64)[codes]
+    sex = df["sex"].astype(str).str.strip().map(SEX_ALIASES).to_numpy(dtype=np.float64)
+    grade = pd.Index(GRADES).get_indexer(df["grade"].astype(str).str.strip()).astype(np.int64)
+    weight = pd.to_numeric(df["weight"], errors="coerce").to_numpy(dtype=np.float64)
+    price = pd.to_numeric(df["price"], errors="coerce").to_numpy(dtype=np.float64)
+    valid = ~np.isnat(dates) & np.isfinite(sex) & (grade >= 0) & np.isfinite(weight) & np.isfinite(price) & (weight > 0)
+    cell = np.where(valid, np.nan_to_num(sex), 0).astype(np.int64) * N_GRADES + grade
+    keys = farm * _FARM_SHIFT + (day + _DAY_OFFSET) * 64 + cell
+    values = np.stack([np.ones_like(weight), weight, weight * price], axis=1)
+    return keys[valid], values[valid], int(valid.size - valid.sum())
+
+def _reduce(keys, values):
+    import numpy as np
+    uniq, inv = np.unique(keys, return_inverse=True)
+    out = np.empty((uniq.size, N_FIELDS))
+    for j in range(N_FIELDS):
+        out[:, j] = np.bincount(inv, weights=values[:, j], minlength=uniq.size)
+    return uniq, out
+
+class GradeIndex:
+    """(일자, 농가, 성별, 등급) 일별 집계 색인.
+
+    행은 (농가, 일자) 순으로 정렬되어 농가별 기간 조회는 searchsorted 로, 전체 농가 기간 조회는
+    일별 누적합 차이로 원본 재조회 없이 답한다.
+    """
+
+    def __init__(self, keys: np.ndarray, values: np.ndarray, farms, skipped: int = 0):
+        import numpy as np
+        self.farm = (keys // _FARM_SHIFT).astype(np.int64)
+        rest = keys % _FARM_SHIFT
+        self.day = rest // 64 - _DAY_OFFSET
+        self.cell = rest % 64
+        self.values = values
+        self.farms = np.asarray(farms, dtype=object)
+        self.skipped = skipped
+        self.farm_start = np.searchsorted(self.farm, np.arange(len(self.farms) + 1))
+        if self.day.size:
+            self.day0, self.day1 = int(self.day.min()), int(self.day.max())
+        else:
+            self.day0 = self.day1 = 0
+        n_days = self.day1 - self.day0 + 1
+        flat = (self.day - self.day0) * N_CELLS + self.cell
+        daily = np.stack([np.bincount(flat, weights=values[:, j], minlength=n_days * N_CELLS) for j in range(N_FIELDS)], axis=1)
+        self._prefix = np.zeros((n_days + 1, N_CELLS, N_FIELDS))
+        np.cumsum(daily.reshape(n_days, N_CELLS, N_FIELDS), axis=0, out=self._prefix[1:])
+
+    @property
+    def date_range(self) -> tuple[np.datetime64, np.datetime64]:
+        import numpy as np
+        return np.datetime64(self.day0, "D"), np.datetime64(self.day1, "D")
+
+    @property
+    def n_records(self) -> int:
+        return int(self.values[:, 0].sum())
+
+    def _day(self, d, default: int) -> int:
+        import numpy as np
+        return default if d is None else int(np.datetime64(d, "D").astype(np.int64))
+
+    def query(self, start=None, end=None, farms=None) -> np.ndarray:
+        """[start, end] (양끝 포함) 기간, farms (None 이면 전체) 의 (성별, 등급, 값) 합계 배열"""
+        import numpy as np
+        d0 = min(max(self._day(start, self.day0), self.day0), self.day1 + 1)
+        d1 = max(min(self._day(end, self.day1), self.day1), self.day0 - 1)
+        if farms is None:
+            if d1 < d0:
+                return np.zeros((2, N_GRADES, N_FIELDS))
+            return (self._prefix[d1 - self.day0 + 1] - self._prefix[d0 - self.day0]).reshape(2, N_GRADES, N_FIELDS)
+        lookup = {f: i for i, f in enumerate(self.farms)}
+        parts = []
+        for f in farms:
+            i = lookup.get(str(f))
+            if i is None:
+                continue
+            lo, hi = self.farm_start[i], self.farm_start[i + 1]
+            a = lo + np.searchsorted(self.day[lo:hi], d0, side="left")
+            b = lo + np.searchsorted(self.day[lo:hi], d1, side="right")
+            parts.append(np.arange(a, b))
+        rows = np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+        out = np.stack([np.bincount(self.cell[rows], weights=self.values[rows, j], minlength=N_CELLS) for j in range(N_FIELDS)], axis=1)
+        return out.reshape(2, N_GRADES, N_FIELDS)
+
+    def grade_tables(self, start=None, end=None, farms=None, base=None) -> tuple[pd.DataFrame, pd.DataFrame]:
+        """기간·농가 조건의 (암비육우, 수비육우) 등급표 (default_grade_tables 형식).
+
+        출현율(%) = 등급 두수 / 성별 두수, 도체중 = 평균 도체중, 지육단가 = 도체중 가중 평균 단가.
+        판정 자료가 없는 등급은 출현율 0 이며 단가·도체중은 base (기본: default_grade_tables) 값을 쓴다.
+        """
+        import numpy as np
+        from .tables import default_grade_tables
+        agg = self.query(start, end, farms)
+        tables = []
+        for sex, table in enumerate(base or default_grade_tables()):
+            count, weight, revenue = agg[sex, :, 0], agg[sex, :, 1], agg[sex, :, 2]
+            has = count > 0
+            out = table.copy()
+            total = count.sum()
+            out["Ratio(%)"] = count / total * 100 if total else 0.0
+            out["Price(KRW/kg)"] = np.where(has, np.round(np.divide(revenue, weight, out=np.zeros_like(weight), where=has)), out["Price(KRW/kg)"])
+            out["Weight(kg)"] = np.where(has, np.round(np.divide(weight, count, out=np.zeros_like(count), where=has), 1), out["Weight(kg)"])
+            tables.append(out)
+        return tables[0], tables[1]
+
+    def save(self, path) -> None:
+        import numpy as np
+        np.savez_compressed(path, keys=self.farm * _FARM_SHIFT + (self.day + _DAY_OFFSET) * 64 + self.cell,
+                            values=self.values, farms=self.farms.astype(str), skipped=self.skipped)
+
+    @classmethod
+    def load(cls, path) -> GradeIndex:
+        import numpy as np
+        with np.load(path) as z:
+            return cls(z["keys"], z["values"], z["farms"].tolist(), int(z["skipped"]))
+
+def build_grade_index(source, chunk_size: int = 1_000_000, compact_rows: int = 5_000_000) -> GradeIndex:
+    """등급판정 자료 (CSV/Parquet 경로·업로드 파일 또는 DataFrame 반복자) 를 청크 단위로 읽어 GradeIndex 생성.
+
+    필요한 컬럼은 GRADING_COLUMNS (또는 COLUMN_ALIASES 의 한글명) 이며 farm 은 없어도 된다.
+    메모리는 집계 행 수 (일자 × 농가 × 성별 × 등급) 에만 비례한다.
+    """
+    import numpy as np
+    import pandas as pd
+    from .io import iter_chunks
+    match source:
+        case pd.DataFrame():
+            chunks = [source]
+        case str() | os.PathLike():
+            chunks = iter_chunks(source, chunk_size)
+        case _ if hasattr(source, "read"):
+            chunks = iter_chunks(source, chunk_size)
+        case _:
+            chunks = source
+    farm_codes: dict[str, int] = {}
+    keys_acc, values_acc, pending, skipped = [], [], 0, 0
+    for chunk in chunks:
+        k, v, bad = _normalize(chunk, farm_codes)
+        k, v = _reduce(k, v)
+        keys_acc.append(k)
+        values_acc.append(v)
+        pending += k.size
+        skipped += bad
+        if pending > compact_rows:
+            k, v = _reduce(np.concatenate(keys_acc), np.concatenate(values_acc))
+            keys_acc, values_acc, pending = [k], [v], k.size
+    if keys_acc:
+        keys, values = _reduce(np.concatenate(keys_acc), np.concatenate(values_acc))
+    else:
+        keys, values = np.empty(0, dtype=np.int64), np.empty((0, N_FIELDS))
+    return GradeIndex(keys, values, list(farm_codes), skipped)
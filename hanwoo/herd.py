@@ -0,0 +1,237 @@
+"""월 단위 코호트 축군 동태 시뮬레이션 (다년 추이)"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from .scenario import SCENARIO_ARGS, _clamp_int_arr
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+# 상태 축 (번식우는 산차별 두수로 따로 관리 - 분만·도태가 월령과 무관하므로 월령 축을 두지 않는다)
+CALF, HEIFER, FATTEN, KPN = range(4)
+N_STATUS = 4
+MAX_AGE = 240       # 이탈 월령 상한 (월령 축은 init_herd 에서 입력에 맞춰 잡고, 마지막 칸은 누적)
+MAX_PARITY = 12     # 산차 축 길이 (마지막 칸은 누적)
+
+def _ratio(num, den):
+    import numpy as np
+    return np.clip(np.divide(num, den, out=np.zeros_like(num), where=den > 0), 0.0, 1.0)
+
+def init_herd(p: dict) -> dict:
+    """기초 번식우만 있는 초기 상태. 산차 분포는 도태율 기준 기하분포로 둔다.
+
+    모든 코호트는 가장 늦은 이탈 월령 (공통육성·대체우·출하·KPN 종료) 에서 빠져나가므로 월령 축은 그 다음 칸 (누적) 까지만 둔다
+    (폐사 월령도 인덱스로 쓰이므로 함께 포함).
+    """
+    import numpy as np
+    S = p["base_cows"].shape[0]
+    last_exit = max(int(p[k].max()) for k in ("calf_common_months_i", "heifer_exit_i", "ship_m_female_i", "ship_m_male_i", "kpn_exit_months_i", "loss_months_i"))
+    herd = np.zeros((S, N_STATUS, 2, last_exit + 2))
+    cull_rate = np.clip(_ratio(p["annual_culls"], p["base_cows"]), 0.01, 0.99)
+    parity = np.arange(MAX_PARITY + 1)
+    share = cull_rate[:, None] * (1 - cull_rate[:, None]) ** parity
+    share[:, -1] += 1 - share.sum(axis=1)
+    cows = p["base_cows"][:, None] * share
+    return {"herd": herd, "cows": cows}
+
+def _shift(arr) -> None:
+    """월령 1개월 증가 (마지막 칸 누적)"""
+    arr[..., -1] += arr[..., -2]
+    arr[..., 1:-1] = arr[..., :-2].copy()
+    arr[..., 0] = 0.0
+
+def _prepare(params: dict) -> dict:
+    import numpy as np
+    missing = [k for k in SCENARIO_ARGS if k not in params]
+    if missing:
+        raise KeyError(f"누락된 입력: {', '.join(missing)}")
+    cols = np.broadcast_arrays(*(np.atleast_1d(np.asarray(params[k], dtype=np.float64)) for k in SCENARIO_ARGS))
+    p = dict(zip(SCENARIO_ARGS, cols))
+    p["base_cows"] = _clamp_int_arr(p["base_cows"], 1)
+    for k in ("annual_culls", "female_calf_sell", "female_fatten_in", "female_fatten_out", "kpn_male",
+              "male_calf_sell", "male_fatten_in", "male_fatten_out"):
+        p[k] = _clamp_int_arr(p[k])
+    for k in ("calf_common_months", "heifer_nonprofit_months", "kpn_exit_months", "loss_months", "ship_m_female", "ship_m_male"):
+        p[k + "_i"] = np.clip(_clamp_int_arr(p[k]), 1, MAX_AGE - 1).astype(np.int64)
+    p["heifer_exit_i"] = np.minimum(p["calf_common_months_i"] + p["heifer_nonprofit_months_i"], MAX_AGE - 1)
+    # 폐사는 송아지 (공통육성) 상태에서만 일어나고 비육 출하는 공통육성이 끝난 뒤에야 가능하므로 월령을 그 범위로 맞춘다
+    # (그대로 두면 폐사 월령 > 공통육성 기간에서는 폐사가 빠지고, 출하월령 ≤ 공통육성 기간에서는 비육우가 출하되지 않는다)
+    p["loss_months_i"] = np.minimum(p["loss_months_i"], p["calf_common_months_i"])
+    for k in ("ship_m_female_i", "ship_m_male_i"):
+        p[k] = np.clip(p[k], p["calf_common_months_i"] + 1, MAX_AGE - 1)
+
+    # 출생 두수 대비 분배 비율 (compute_scenario 의 연간 분배 두수를 월별 코호트 비율로 환산)
+    birth = p["base_cows"] * p["conception_rate"]
+    bf, bm = birth * p["female_birth_ratio"], birth * (1 - p["female_birth_ratio"])
+    p["q_loss_f"] = _ratio(p["female_loss"], bf)
+    rem_f = bf - p["female_loss"]
+    p["q_repl"] = _ratio(p["annual_culls"], rem_f)
+    p["q_fat_f"] = np.minimum(_ratio(p["female_fatten_in"], rem_f), 1 - p["q_repl"])
+    p["q_sell_f"] = np.minimum(_ratio(p["female_calf_sell"], rem_f), 1 - p["q_repl"] - p["q_fat_f"])
+    p["q_kpn"] = _ratio(p["kpn_male"], bm)
+    rem_m = bm - p["kpn_male"]
+    p["q_loss_m"] = _ratio(p["male_loss"], rem_m)
+    p["q_fat_m"] = _ratio(p["male_fatten_in"], rem_m - p["male_loss"])
+    p["q_sell_m"] = np.minimum(_ratio(p["male_calf_sell"], rem_m - p["male_loss"]), 1 - p["q_fat_m"])
+    p["q_ship_f"] = _ratio(p["female_fatten_out"], p["female_fatten_in"])
+    p["q_ship_m"] = _ratio(p["male_fatten_out"], p["male_fatten_in"])
+    p["cull_rate_m"] = _ratio(p["annual_culls"], p["base_cows"]) / 12.0
+    positive = p["conception_rate"] > 0
+    p["calf_unit"] = np.where(positive, p["cow_cost_y"] / np.where(positive, p["conception_rate"], 1.0) - p["by_product_income_cow"], 0.0)
+    # compute_scenario 는 대체우·비육우에 두당 연간 단가를 한 번 부과하므로 체류 기간 (월) 에 나눠 매월 재고에 부과한다
+    p["heifer_cost_m"] = p["cow_cost_y"] / p["heifer_nonprofit_months_i"]
+    p["fatten_cost_m_f"] = p["cost_fatten_avg_y"] / (p["ship_m_female_i"] - p["calf_common_months_i"])
+    p["fatten_cost_m_m"] = p["cost_fatten_avg_y"] / (p["ship_m_male_i"] - p["calf_common_months_i"])
+    p["ext_net_m"] = (p["ext_sell_n"] * p["ext_sell_p"] - p["ext_buy_n"] * p["ext_buy_p"] - p["ext_buy_n"] * p["ext_cost_y"]) / 12.0
+    p["ext_rev_m"] = p["ext_sell_n"] * p["ext_sell_p"] / 12.0
+    return p
+
+def _cull(cows, n_cull) -> None:
+    """높은 산차부터 n_cull 두를 도태"""
+    import numpy as np
+    above = np.cumsum(cows[:, ::-1], axis=1)[:, ::-1] - cows
+    removed = np.clip(n_cull[:, None] - above, 0.0, cows)
+    cows *= 1 - _ratio(removed, cows)
+
+def step_month(state: dict, p: dict) -> dict:
+    """한 달 진행. 상태 배열을 제자리 갱신하고 해당 월의 두수 흐름과 현금흐름을 반환한다."""
+    import numpy as np
+    herd, cows = state["herd"], state["cows"]
+    S = herd.shape[0]
+    rows = np.arange(S)
+    _shift(herd)
+
+    # 분만: 월 분만율 = 수태율/12, 분만한 번식우는 산차 +1
+    calving = cows * (p["conception_rate"] / 12.0)[:, None]
+    cows -= calving
+    cows[:, 1:] += calving[:, :-1]
+    cows[:, -1] += calving[:, -1]
+    born = calving.sum(axis=1)
+    born_f = born * p["female_birth_ratio"]
+    born_m = born - born_f
+    herd[:, CALF, 0, 0] = born_f
+    herd[:, KPN, 1, 0] = born_m * p["q_kpn"]
+    herd[:, CALF, 1, 0] = born_m * (1 - p["q_kpn"])
+
+    # 폐사 (폐사 월령 도달 코호트)
+    lm = p["loss_months_i"]
+    dead_f = herd[rows, CALF, 0, lm] * p["q_loss_f"]
+    dead_m = herd[rows, CALF, 1, lm] * p["q_loss_m"]
+    herd[rows, CALF, 0, lm] -= dead_f
+    herd[rows, CALF, 1, lm] -= dead_m
+
+    # 공통육성 종료: 대체우 / 자가비육 / 판매
+    cm = p["calf_common_months_i"]
+    f = herd[rows, CALF, 0, cm]
+    m = herd[rows, CALF, 1, cm]
+    herd[rows, CALF, 0, cm] = 0.0
+    herd[rows, CALF, 1, cm] = 0.0
+    herd[rows, HEIFER, 0, cm] += f * p["q_repl"]
+    herd[rows, FATTEN, 0, cm] += f * p["q_fat_f"]
+    herd[rows, FATTEN, 1, cm] += m * p["q_fat_m"]
+    # 판매 두수에 배정되지 않은 나머지는 compute_scenario 처럼 수입 없이 빠진다
+    sold_f = f * p["q_sell_f"]
+    sold_m = m * p["q_sell_m"]
+
+    # 도태 (월초 번식우 기준, 연간 도태 두수 / 기초 번식우 = 연 도태율) 후 대체우 -> 번식우 (산차 0)
+    culled = cows.sum(axis=1) * p["cull_rate_m"]
+    _cull(cows, culled)
+    hx = p["heifer_exit_i"]
+    entering = herd[rows, HEIFER, 0, hx]
+    herd[rows, HEIFER, 0, hx] = 0.0
+    cows[:, 0] += entering
+
+    # 비육 출하 (투입 대비 출하 비율만큼 판매, 나머지는 손실)
+    ship = []
+    for sex, key in ((0, "ship_m_female_i"), (1, "ship_m_male_i")):
+        a = p[key]
+        out = herd[rows, FATTEN, sex, a]
+        herd[rows, FATTEN, sex, a] = 0.0
+        ship.append(out * p["q_ship_f" if sex == 0 else "q_ship_m"])
+
+    # KPN 위탁 종료
+    kx = p["kpn_exit_months_i"]
+    herd[rows, KPN, 1, kx] = 0.0
+
+    n_cows = cows.sum(axis=1)
+    inventory = herd.sum(axis=3)
+    n_heifer = inventory[:, HEIFER].sum(axis=1)
+    n_fatten = inventory[:, FATTEN].sum(axis=1)
+    n_kpn = inventory[:, KPN].sum(axis=1)
+    revenue = (culled * p["price_cull_cow"] + sold_f * p["price_calf_female"] + sold_m * p["price_calf_male"]
+               + ship[0] * p["price_fatten_female"] + ship[1] * p["price_fatten_male"]
+               + n_cows * p["by_product_income_cow"] / 12.0 + p["ext_rev_m"])
+    cost = (n_cows * p["cow_cost_y"] / 12.0 + n_heifer * p["heifer_cost_m"]
+            + inventory[:, FATTEN, 0] * p["fatten_cost_m_f"] + inventory[:, FATTEN, 1] * p["fatten_cost_m_m"]
+            + n_kpn * p["calf_unit"] / 12.0 + (dead_f + dead_m) * p["calf_unit"] * p["loss_months"] / 12.0
+            + (p["ext_rev_m"] - p["ext_net_m"]))
+    return {
+        "cows": n_cows, "heifers": n_heifer, "calves": inventory[:, CALF].sum(axis=1), "fatten": n_fatten, "kpn": n_kpn,
+        "born": born, "culled": culled, "shipped": ship[0] + ship[1], "revenue": revenue, "cost": cost,
+    }
+
+def simulate_herd(params: dict, years: int = 10, warmup_months: int | None = None) -> dict[str, np.ndarray]:
+    """compute_scenario 입력(스칼라 또는 시나리오별 배열)으로 축군을 월 단위로 진행한다.
+
+    분배 두수는 출생 대비 비율로 환산되어 매월 코호트에 적용되며, 유지비는 월말 재고 기준으로 부과된다.
+    비용 기준은 compute_scenario 와 같다: 번식우는 연간 유지비, 대체우·비육우는 두당 연간 단가를 체류 기간에 나눠,
+    KPN 위탁우는 송아지 생산비를 위탁 기간만큼 부과하고, 판매·투입에 배정되지 않은 송아지는 수입 없이 빠진다.
+    따라서 분배가 생산 두수 안에 들면 정상상태 연간 순이익은 compute_scenario 의 Net Final 과 같아진다.
+    폐사 월령은 공통육성 기간 이하로, 출하월령은 공통육성 기간 + 1 이상으로 맞춰 계산한다.
+    기초 번식우 두수를 고정한 채 warmup_months (기본: 가장 긴 파이프라인 + 12개월) 동안 파이프라인을 채운 뒤 years 년을 기록한다.
+    결과는 {지표: (시나리오, 월) 배열} 이다.
+    """
+    import numpy as np
+    p = _prepare(params)
+    state = init_herd(p)
+    if warmup_months is None:
+        warmup_months = int(max(p["heifer_exit_i"].max(), p["ship_m_female_i"].max(), p["ship_m_male_i"].max())) + 12
+    # 워밍업 동안은 번식우 두수를 기초 두수로 유지해 송아지·대체우·비육 파이프라인을 정상상태로 채운다
+    for _ in range(warmup_months):
+        step_month(state, p)
+        total = state["cows"].sum(axis=1)
+        state["cows"] *= np.divide(p["base_cows"], total, out=np.ones_like(total), where=total > 0)[:, None]
+
+    months = years * 12
+    out: dict[str, np.ndarray] = {}
+    for t in range(months):
+        flows = step_month(state, p)
+        for k, v in flows.items():
+            out.setdefault(k, np.empty((v.shape[0], months)))[:, t] = v
+    out["net"] = out["revenue"] - out["cost"]
+    out["state"] = state
+    return out
+
+def herd_annual_frame(result: dict, names=None) -> pd.DataFrame:
+    """월별 결과를 (Scenario, Year) 연간 long-format 표로 집계"""
+    import numpy as np
+    import pandas as pd
+    S, T = result["net"].shape
+    years = T // 12
+    names = list(names) if names is not None else [f"S{i + 1}" for i in range(S)]
+
+    def _annual(key, how):
+        arr = result[key][:, : years * 12].reshape(S, years, 12)
+        return (arr.sum(axis=2) if how == "sum" else arr[:, :, -1]).ravel()
+
+    return pd.DataFrame({
+        "Scenario": np.repeat(names, years),
+        "Year": np.tile(np.arange(1, years + 1), S),
+        "Revenue": _annual("revenue", "sum"), "Cost": _annual("cost", "sum"), "Value": _annual("net", "sum"),
+        "Cows": _annual("cows", "last"), "Heifers": _annual("heifers", "last"), "Fatten": _annual("fatten", "last"),
+    })
+
+def herd_monthly_frame(result: dict, names=None) -> pd.DataFrame:
+    """월별 결과를 (Scenario, Month) long-format 표로 (Year 는 경과 연수 Month / 12, 장기 추이 차트용)"""
+    import numpy as np
+    import pandas as pd
+    S, T = result["net"].shape
+    names = list(names) if names is not None else [f"S{i + 1}" for i in range(S)]
+    months = np.arange(1, T + 1)
+    return pd.DataFrame({
+        "Scenario": np.repeat(names, T), "Month": np.tile(months, S), "Year": np.tile(months / 12.0, S),
+        "Revenue": result["revenue"].ravel(), "Cost": result["cost"].ravel(), "Value": result["net"].ravel(),
+        "Cows": result["cows"].ravel(), "Heifers": result["heifers"].ravel(), "Fatten": result["fatten"].ravel(),
+    })
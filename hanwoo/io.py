@@ -0,0 +1,17 @@
+"""입력 파일 청크 읽기 (CSV / Parquet)"""
+from __future__ import annotations
+
+from pathlib import Path
+
+def iter_chunks(src, chunk_size: int, columns=None):
+    """src (경로 또는 .name 이 있는 파일 객체) 를 chunk_size 행 단위 DataFrame 으로 읽는다. 형식은 확장자로 정한다."""
+    match Path(getattr(src, "name", str(src))).suffix.lower():
+        case ".parquet" | ".pq":
+            import pyarrow.parquet as pq
+            with pq.ParquetFile(src) as f:
+                for batch in f.iter_batches(batch_size=chunk_size, columns=columns):
+                    yield batch.to_pandas()
+        case _:
+            import pandas as pd
+            with pd.read_csv(src, chunksize=chunk_size, usecols=columns) as reader:
+                yield from reader
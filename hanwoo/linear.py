@@ -0,0 +1,169 @@
+"""compute_scenario 의 단항식(계수 × 입력 곱) 표현: 즉시 재평가, 정확한 편미분, 손익분기점"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from .scenario import SCENARIO_ARGS, _clamp_int_arr
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# (구분, 계수, ((입력, 지수), ...), 송아지 생산비 항 여부)
+# 송아지 생산비 항 (cow_cost_y / conception_rate - by_product_income_cow) 은 compute_scenario 와 같이 수태율 ≤ 0 이면 0 이다.
+MONOMIALS: tuple[tuple[str, float, tuple[tuple[str, int], ...], bool], ...] = (
+    ("rev", 1.0, (("annual_culls", 1), ("price_cull_cow", 1)), False),
+    ("rev", 1.0, (("female_calf_sell", 1), ("price_calf_female", 1)), False),
+    ("rev", 1.0, (("male_calf_sell", 1), ("price_calf_male", 1)), False),
+    ("rev", 1.0, (("female_fatten_out", 1), ("price_fatten_female", 1)), False),
+    ("rev", 1.0, (("male_fatten_out", 1), ("price_fatten_male", 1)), False),
+    ("rev", 1.0, (("base_cows", 1), ("by_product_income_cow", 1)), False),
+    ("rev", 1.0, (("ext_sell_n", 1), ("ext_sell_p", 1)), False),
+    ("cost", 1.0, (("base_cows", 1), ("cow_cost_y", 1)), False),
+    ("cost", 1.0, (("annual_culls", 1), ("cow_cost_y", 1)), False),
+    ("cost", 1 / 12, (("kpn_male", 1), ("kpn_exit_months", 1), ("cow_cost_y", 1), ("conception_rate", -1)), True),
+    ("cost", -1 / 12, (("kpn_male", 1), ("kpn_exit_months", 1), ("by_product_income_cow", 1)), True),
+    ("cost", 1.0, (("female_fatten_in", 1), ("cost_fatten_avg_y", 1)), False),
+    ("cost", 1.0, (("male_fatten_in", 1), ("cost_fatten_avg_y", 1)), False),
+    ("cost", 1 / 12, (("female_loss", 1), ("loss_months", 1), ("cow_cost_y", 1), ("conception_rate", -1)), True),
+    ("cost", -1 / 12, (("female_loss", 1), ("loss_months", 1), ("by_product_income_cow", 1)), True),
+    ("cost", 1 / 12, (("male_loss", 1), ("loss_months", 1), ("cow_cost_y", 1), ("conception_rate", -1)), True),
+    ("cost", -1 / 12, (("male_loss", 1), ("loss_months", 1), ("by_product_income_cow", 1)), True),
+    ("cost", 1.0, (("ext_buy_n", 1), ("ext_buy_p", 1)), False),
+    ("cost", 1.0, (("ext_buy_n", 1), ("ext_cost_y", 1)), False),
+)
+
+# compute_scenario 와 같이 정수로 절삭하는 입력 -> 하한
+CLAMPED_ARGS: dict[str, int] = {
+    "base_cows": 1, "annual_culls": 0, "female_calf_sell": 0, "male_calf_sell": 0, "female_fatten_out": 0, "male_fatten_out": 0,
+    "kpn_male": 0, "kpn_exit_months": 0, "female_fatten_in": 0, "male_fatten_in": 0,
+}
+
+# 손익분기 대상: 이름 -> 같은 배율로 함께 움직이는 입력
+BREAK_EVEN_TARGETS: dict[str, tuple[str, ...]] = {
+    "calf_price": ("price_calf_female", "price_calf_male"),
+    "carcass_price": ("price_fatten_female", "price_fatten_male"),
+    "conception_rate": ("conception_rate",),
+    "fatten_cost": ("cost_fatten_avg_y",),
+}
+
+# 입력 -> 그 입력이 들어 있는 단항식 번호
+_TERMS_OF: dict[str, tuple[int, ...]] = {
+    k: tuple(i for i, (_, _, factors, _) in enumerate(MONOMIALS) if any(f == k for f, _ in factors)) for k in SCENARIO_ARGS
+}
+
+def _prepare(name: str, value):
+    import numpy as np
+    value = np.asarray(value, dtype=np.float64)
+    return _clamp_int_arr(value, CLAMPED_ARGS[name]) if name in CLAMPED_ARGS else value
+
+class CompiledScenario:
+    """농장 입력 (스칼라 또는 농장별 배열) 에 대한 단항식 값과 수익/비용 합계.
+
+    set() 은 바뀐 입력이 들어 있는 단항식만 다시 계산해 합계를 증분 갱신하므로 모형 크기와 무관한 상수 시간이다.
+    결과는 compute_scenario 와 반올림 오차 범위에서 같다.
+    """
+
+    def __init__(self, params: dict):
+        import numpy as np
+        cols = np.broadcast_arrays(*(_prepare(k, params[k]) for k in SCENARIO_ARGS))
+        self.x = {k: np.array(v, dtype=np.float64) for k, v in zip(SCENARIO_ARGS, cols)}
+        self.terms = [self._term(i) for i in range(len(MONOMIALS))]
+        self.totals = {
+            kind: sum((t for t, (k, *_) in zip(self.terms, MONOMIALS) if k == kind), np.zeros_like(cols[0], dtype=np.float64))
+            for kind in ("rev", "cost")
+        }
+
+    def _term(self, i: int, skip: str | None = None):
+        """i 번째 단항식 값 (skip 을 주면 그 입력을 뺀 나머지 곱 - 편미분용)"""
+        import numpy as np
+        _, coef, factors, calf_unit = MONOMIALS[i]
+        value = np.full_like(self.x["base_cows"], coef)
+        for name, exp in factors:
+            if name == skip:
+                continue
+            x = self.x[name]
+            value = value * (x if exp == 1 else np.divide(1.0, x, out=np.zeros_like(x), where=x != 0))
+        if calf_unit:
+            value = np.where(self.x["conception_rate"] > 0, value, 0.0)
+        return value
+
+    def set(self, name: str, value) -> None:
+        """입력 하나를 바꾸고 관련 단항식과 합계만 갱신"""
+        import numpy as np
+        self.x[name] = np.broadcast_to(_prepare(name, value), self.x[name].shape).astype(np.float64)
+        for i in _TERMS_OF[name]:
+            new = self._term(i)
+            self.totals[MONOMIALS[i][0]] = self.totals[MONOMIALS[i][0]] + (new - self.terms[i])
+            self.terms[i] = new
+
+    def value(self, output: str = "Net Final"):
+        match output:
+            case "Net Final":
+                return self.totals["rev"] - self.totals["cost"]
+            case "Rev Final":
+                return self.totals["rev"]
+            case "Cost Final":
+                return self.totals["cost"]
+            case _:
+                raise ValueError(f"지원하지 않는 출력: {output}")
+
+    def partial(self, name: str, output: str = "Net Final"):
+        """∂output/∂name (정확한 해석적 미분; 절삭 입력은 정수 사이에서의 기울기)"""
+        import numpy as np
+        grad = np.zeros_like(self.x["base_cows"])
+        for i in _TERMS_OF[name]:
+            kind = MONOMIALS[i][0]
+            if output == "Rev Final" and kind != "rev" or output == "Cost Final" and kind != "cost":
+                continue
+            exp = dict(MONOMIALS[i][2])[name]
+            rest = self._term(i, skip=name)
+            x = self.x[name]
+            d = rest if exp == 1 else -rest * np.divide(1.0, x * x, out=np.zeros_like(x), where=x != 0)
+            grad = grad + (-d if output == "Net Final" and kind == "cost" else d)
+        return grad
+
+    def gradient(self, output: str = "Net Final") -> dict:
+        return {k: self.partial(k, output) for k in SCENARIO_ARGS}
+
+def compile_scenario(params: dict) -> CompiledScenario:
+    return CompiledScenario(params)
+
+def break_even(params: dict, target: str, output: str = "Net Final") -> dict:
+    """target 입력들을 같은 배율 s 로 바꿔 output = 0 이 되는 값 (농장 배열 단위로 한 번에 계산).
+
+    대상 입력에 대해 output 은 a + b·s + c/s 꼴이므로 (b·s² + a·s + c = 0) 닫힌 해로 풀고,
+    양의 근이 둘이면 현재값 (s = 1) 에 가까운 쪽을 쓴다. 해가 없으면 (수태율은 1 을 넘는 경우 포함) NaN 이다.
+    결과는 {"scale": s, 입력명: s × 현재값, ...} 이다.
+    """
+    import numpy as np
+    group = BREAK_EVEN_TARGETS[target]
+    model = CompiledScenario(params)
+    a = np.zeros_like(model.x["base_cows"])
+    b, c = a.copy(), a.copy()
+    for (kind, _, factors, _), term in zip(MONOMIALS, model.terms):
+        if output == "Rev Final" and kind != "rev" or output == "Cost Final" and kind != "cost":
+            continue
+        signed = -term if output == "Net Final" and kind == "cost" else term
+        power = sum(exp for name, exp in factors if name in group)
+        match power:
+            case 0:
+                a = a + signed
+            case 1:
+                b = b + signed
+            case -1:
+                c = c + signed
+            case _:
+                raise ValueError(f"{target}: 지원하지 않는 차수 {power}")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        disc = a * a - 4 * b * c
+        sq = np.sqrt(np.where(disc >= 0, disc, np.nan))
+        r1 = np.where(b != 0, (-a + sq) / (2 * b), np.where(a != 0, -c / a, np.nan))
+        r2 = np.where(b != 0, (-a - sq) / (2 * b), np.nan)
+        r1 = np.where(r1 > 0, r1, np.nan)
+        r2 = np.where(r2 > 0, r2, np.nan)
+        scale = np.where(np.isnan(r2) | (np.abs(r1 - 1) <= np.abs(r2 - 1)), r1, r2)
+        scale = np.where(np.isnan(r1), r2, scale)
+    if target == "conception_rate":
+        rate = model.x["conception_rate"]
+        scale = np.where((rate > 0) & (scale * rate <= 1), scale, np.nan)
+    return {"scale": scale, **{name: scale * model.x[name] for name in group}}
@@ -0,0 +1,178 @@
+"""프로세스 공유 기준 표 + 세션별 셀 변경분 (copy-on-write 오버레이), 세션 메모리 측정"""
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Callable, Mapping
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+_UNSET = object()
+
+def _scalar(v):
+    """numpy 스칼라 -> 파이썬 기본형 (변경분 키 해시·비교용)"""
+    return v.item() if hasattr(v, "item") else v
+
+class SharedTables:
+    """기준 표를 프로세스에 한 벌만 두고, 세션은 기준과 다른 셀만 변경분(delta)으로 들고 있게 한다.
+
+    delta 는 {(행 위치, 열): 값} dict 이고, 행·열 구성이 기준과 다른 표 (예: 다른 버전의 스냅샷) 만 {"frame": DataFrame} 으로 통째로 둔다.
+    변경분이 없으면 기준 표 객체를 그대로 돌려주고, 변경분을 적용한 표는 (이름, 변경분) 키의 LRU 에 두어 같은 편집을 한 세션끼리 공유한다.
+    돌려주는 표는 모두 공유 객체이므로 호출 측에서 수정하지 않는다 (pandas 3 의 copy-on-write 로 파생 객체 수정은 전파되지 않음).
+    """
+
+    def __init__(self, tables: Mapping[str, pd.DataFrame], cache_size: int = 256):
+        self._base = {name: df.reset_index(drop=True) for name, df in tables.items()}
+        self._frames: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.cache_size = cache_size
+
+    def names(self) -> list[str]:
+        return list(self._base)
+
+    def base(self, name: str) -> pd.DataFrame:
+        return self._base[name]
+
+    def frame(self, name: str, delta: dict | None = None) -> pd.DataFrame:
+        """기준 표에 delta 를 적용한 표 (공유 객체)"""
+        if not delta:
+            return self._base[name]
+        if "frame" in delta:
+            return delta["frame"]
+        key = (name, tuple(sorted(delta.items(), key=lambda kv: (kv[0][0], str(kv[0][1])))))
+        with self._lock:
+            df = self._frames.get(key)
+            if df is not None:
+                self._frames.move_to_end(key)
+                return df
+        df = self._apply(self._base[name], delta)
+        with self._lock:
+            self._frames[key] = df
+            while len(self._frames) > self.cache_size:
+                self._frames.popitem(last=False)
+        return df
+
+    @staticmethod
+    def _apply(base: pd.DataFrame, delta: dict) -> pd.DataFrame:
+        import pandas as pd
+        by_col: dict[str, dict[int, object]] = {}
+        for (row, col), value in delta.items():
+            by_col.setdefault(col, {})[row] = value
+        cols = {}
+        for col, changes in by_col.items():
+            values = base[col].tolist()
+            for row, value in changes.items():
+                values[row] = value
+            try:
+                cols[col] = pd.Series(values, index=base.index, dtype=base[col].dtype)
+            except (TypeError, ValueError):
+                cols[col] = pd.Series(values, index=base.index)
+        return base.assign(**cols)
+
+    def diff(self, name: str, df: pd.DataFrame) -> dict:
+        """df 를 기준 표 대비 변경분으로 (기준과 같은 셀은 버림)"""
+        import numpy as np
+        base = self._base[name]
+        if list(df.columns) != list(base.columns) or len(df) != len(base):
+            return {"frame": df.reset_index(drop=True)}
+        delta = {}
+        for col in base.columns:
+            a, b = base[col].reset_index(drop=True), df[col].reset_index(drop=True)
+            changed = ~(a.eq(b).to_numpy(dtype=bool) | (a.isna().to_numpy() & b.isna().to_numpy()))
+            for row in np.flatnonzero(changed):
+                delta[(int(row), col)] = _scalar(b.iat[row])
+        return delta
+
+    def apply_edits(self, name: str, delta: dict | None, edited_rows: Mapping) -> dict:
+        """st.data_editor 의 edited_rows ({행: {열: 값}}) 를 delta 에 제자리에서 반영 (기준값으로 되돌린 셀은 변경분에서 뺌).
+
+        edited_rows 는 편집기를 만든 뒤의 모든 편집을 담고 있으므로 이미 반영된 셀 (delta 와 값이 같은 셀) 은 건너뛴다.
+        """
+        if delta and "frame" in delta:
+            df = delta["frame"].copy()
+            for row, changes in edited_rows.items():
+                for col, value in changes.items():
+                    df.at[int(row), col] = value
+            return self.diff(name, df)
+        base = self._base[name]
+        delta = {} if delta is None else delta
+        for row, changes in edited_rows.items():
+            for col, value in changes.items():
+                key = (int(row), col)
+                value = _scalar(value)
+                if delta.get(key, _UNSET) == value:
+                    continue
+                if _scalar(base[col].iat[int(row)]) == value:
+                    delta.pop(key, None)
+                else:
+                    delta[key] = value
+        return delta
+
+    def is_shared(self, obj) -> bool:
+        """obj 가 이 저장소 자신이거나 저장소가 들고 있는 공유 표인지 (세션 메모리 집계에서 제외)"""
+        if obj is self:
+            return True
+        if type(obj).__name__ != "DataFrame":
+            return False
+        with self._lock:
+            return any(obj is df for df in self._base.values()) or any(obj is df for df in self._frames.values())
+
+    def nbytes(self) -> int:
+        """기준 표와 캐시된 적용 표의 메모리 (바이트)"""
+        with self._lock:
+            frames = [*self._base.values(), *self._frames.values()]
+        return sum(int(df.memory_usage(deep=True).sum()) for df in frames)
+
+def deep_sizeof(obj, exclude: Callable[[object], bool] | None = None, _seen: set | None = None) -> int:
+    """객체가 참조하는 메모리의 근사 합 (DataFrame·ndarray 는 버퍼 크기, 컨테이너·일반 객체는 재귀). exclude 가 참인 객체는 0."""
+    import numpy as np
+    import pandas as pd
+    seen = set() if _seen is None else _seen
+    if id(obj) in seen or (exclude is not None and exclude(obj)):
+        return 0
+    seen.add(id(obj))
+    match obj:
+        case pd.DataFrame() | pd.Series() | pd.Index():
+            usage = obj.memory_usage(deep=True)
+            return int(usage.sum() if hasattr(usage, "sum") else usage)
+        case np.ndarray():
+            return sys.getsizeof(obj)                                           # 데이터를 소유한 배열이면 버퍼 포함
+        case str() | bytes() | int() | float() | bool() | None:
+            return sys.getsizeof(obj)
+        case dict():
+            return sys.getsizeof(obj) + sum(deep_sizeof(k, exclude, seen) + deep_sizeof(v, exclude, seen) for k, v in obj.items())
+        case list() | tuple() | set() | frozenset():
+            return sys.getsizeof(obj) + sum(deep_sizeof(v, exclude, seen) for v in obj)
+    size = sys.getsizeof(obj)
+    attrs = getattr(obj, "__dict__", None)
+    return size + (deep_sizeof(attrs, exclude, seen) if isinstance(attrs, dict) else 0)
+
+def session_footprint(state: Mapping, exclude: Callable[[object], bool] | None = None) -> dict[str, int]:
+    """세션 상태 키별 메모리 (바이트, 큰 순). 키끼리 공유하는 객체는 처음 나온 키에만 센다."""
+    seen: set = set()
+    sizes = {str(k): deep_sizeof(v, exclude, seen) for k, v in state.items()}
+    return dict(sorted(sizes.items(), key=lambda kv: kv[1], reverse=True))
+
+class FootprintRegistry:
+    """세션별 최근 메모리 측정값 (프로세스 공유) - 접속 세션 수가 늘어도 세션당 메모리가 일정한지 확인용"""
+
+    def __init__(self, window_s: float = 1800.0):
+        self.window_s = window_s
+        self._entries: dict[str, tuple[float, int]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, session_id: str, nbytes: int) -> None:
+        now = time.time()
+        with self._lock:
+            self._entries[session_id] = (now, nbytes)
+            for sid in [s for s, (t, _) in self._entries.items() if now - t > self.window_s]:
+                del self._entries[sid]
+
+    def summary(self) -> dict[str, float]:
+        """최근 window_s 초 안에 측정된 세션 수와 세션당 평균/최대 바이트"""
+        with self._lock:
+            sizes = [n for _, n in self._entries.values()]
+        return {"sessions": len(sizes), "mean": sum(sizes) / len(sizes) if sizes else 0.0, "max": max(sizes, default=0)}
@@ -0,0 +1,205 @@
+"""시세 이력 저장소 (일별 가격 시계열, 기간 평균·전년 동월 조회, 백테스트)"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from .scenario import SCENARIO_ARGS, compute_scenario_batch
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+# compute_scenario 가격 인자 -> 기본 시계열 이름
+PRICE_SERIES: dict[str, str] = {
+    "price_calf_female": "calf_female", "price_calf_male": "calf_male", "price_cull_cow": "cull_cow",
+    "ext_buy_p": "calf_male", "ext_sell_p": "fatten_ext",
+}
+# 등급별 지육단가 시계열 이름 접두어 (예: "carcass_cow:1++A")
+CARCASS_SERIES: dict[str, str] = {"price_fatten_female": "carcass_cow", "price_fatten_male": "carcass_steer"}
+
+PRICE_METHODS: dict[str, str] = {"asof": "기준일 시세", "last_3m": "최근 3개월 평균", "same_month_last_year": "전년 동월 평균"}
+
+def _days(x) -> np.ndarray:
+    """날짜(스칼라/배열/문자열) -> 1970-01-01 기준 일수 (int64 배열)"""
+    import numpy as np
+    return np.atleast_1d(np.asarray(x, dtype="datetime64[D]")).astype(np.int64)
+
+def add_months(days, k: int) -> np.ndarray:
+    """일수 배열에 k 개월을 더한다 (말일은 대상 월의 말일로 맞춤)"""
+    import numpy as np
+    d = np.asarray(days, dtype=np.int64).astype("datetime64[D]")
+    month = d.astype("datetime64[M]")
+    dom = (d - month.astype("datetime64[D]")).astype(np.int64)
+    target = (month + k).astype("datetime64[D]")
+    last = ((month + k + 1).astype("datetime64[D]") - 1).astype(np.int64)
+    return np.minimum(target.astype(np.int64) + dom, last)
+
+class PriceStore:
+    """시계열별로 날짜 정렬된 (일자, 가격) 을 CSR 형태로 모아 둔 저장소.
+
+    조회는 시계열 구간 안의 searchsorted (O(log n)) 이며, 기간 평균은 시계열별 누적합 (처음 쓸 때 한 번 계산해 캐시) 의
+    차이로 구하므로 조회 날짜 배열 전체를 한 번에 처리한다.
+    """
+
+    def __init__(self, names, offsets: np.ndarray, day: np.ndarray, value: np.ndarray):
+        import numpy as np
+        self.names = [str(n) for n in names]
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.day = np.asarray(day, dtype=np.int64)
+        self.value = np.asarray(value, dtype=np.float64)
+        self._index = {n: i for i, n in enumerate(self.names)}
+        self._cumsum: dict[str, np.ndarray] = {}
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, date: str = "date", series: str = "series", value: str = "price") -> PriceStore:
+        """long-format 표 (날짜, 시계열명, 가격) 로 생성. 같은 날 여러 값은 평균한다."""
+        import numpy as np
+        import pandas as pd
+        dates = pd.to_datetime(df[date], errors="coerce").to_numpy(dtype="datetime64[D]")
+        frame = pd.DataFrame({"series": df[series].astype(str), "day": dates.astype(np.int64), "value": pd.to_numeric(df[value], errors="coerce")})
+        frame = frame[frame["value"].notna().to_numpy() & ~np.isnat(dates)]
+        frame = frame.groupby(["series", "day"], sort=True)["value"].mean().reset_index()
+        names, starts = np.unique(frame["series"].to_numpy(), return_index=True)
+        offsets = np.append(starts, len(frame))
+        return cls(names, offsets, frame["day"].to_numpy(), frame["value"].to_numpy())
+
+    @classmethod
+    def load(cls, path) -> PriceStore:
+        import numpy as np
+        with np.load(path) as z:
+            return cls(z["names"].tolist(), z["offsets"], z["day"], z["value"])
+
+    def save(self, path) -> None:
+        import numpy as np
+        np.savez_compressed(path, names=np.array(self.names), offsets=self.offsets, day=self.day.astype(np.int32), value=self.value)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._index
+
+    def __len__(self) -> int:
+        return int(self.day.size)
+
+    @property
+    def date_range(self) -> tuple[np.datetime64, np.datetime64]:
+        import numpy as np
+        return np.datetime64(int(self.day.min()), "D"), np.datetime64(int(self.day.max()), "D")
+
+    def _slice(self, name: str) -> tuple[np.ndarray, np.ndarray]:
+        i = self._index[name]
+        lo, hi = self.offsets[i], self.offsets[i + 1]
+        return self.day[lo:hi], self.value[lo:hi]
+
+    def _prefix(self, name: str) -> np.ndarray:
+        cs = self._cumsum.get(name)
+        if cs is None:
+            import numpy as np
+            cs = self._cumsum[name] = np.concatenate([[0.0], np.cumsum(self._slice(name)[1])])
+        return cs
+
+    def series(self, name: str) -> pd.Series:
+        import pandas as pd
+        day, value = self._slice(name)
+        return pd.Series(value, index=day.astype("datetime64[D]"), name=name)
+
+    def history_frame(self, names=None) -> pd.DataFrame:
+        """(date, series, price) long-format 이력 표 (names 가 None 이면 전체 시계열, 시계열·날짜 순)"""
+        import numpy as np
+        import pandas as pd
+        idx = [self._index[n] for n in (self.names if names is None else names) if n in self._index]
+        rows = np.concatenate([np.arange(self.offsets[i], self.offsets[i + 1]) for i in idx]) if idx else np.arange(0)
+        counts = [int(self.offsets[i + 1] - self.offsets[i]) for i in idx]
+        return pd.DataFrame({"date": self.day[rows].astype("datetime64[D]").astype("datetime64[ns]"),
+                             "series": np.repeat([self.names[i] for i in idx], counts).astype(object), "price": self.value[rows]})
+
+    def asof(self, name: str, at) -> np.ndarray:
+        """at (양끝 포함) 이전 마지막 시세. 없으면 NaN."""
+        import numpy as np
+        day, value = self._slice(name)
+        i = np.searchsorted(day, _days(at), side="right") - 1
+        return np.where(i >= 0, value[np.maximum(i, 0)] if value.size else np.nan, np.nan)
+
+    def window_mean(self, name: str, start, end) -> np.ndarray:
+        """[start, end] (양끝 포함) 기간 평균 (날짜 배열 단위로 브로드캐스트). 관측이 없으면 NaN."""
+        import numpy as np
+        day, _ = self._slice(name)
+        cs = self._prefix(name)
+        a = np.searchsorted(day, _days(start), side="left")
+        b = np.searchsorted(day, _days(end), side="right")
+        a, b = np.broadcast_arrays(a, b)
+        n = b - a
+        return np.divide(cs[b] - cs[a], n, out=np.full(n.shape, np.nan), where=n > 0)
+
+    def last_months_mean(self, name: str, at, months: int = 3) -> np.ndarray:
+        """at 기준 최근 months 개월 (at - months 개월, at] 평균"""
+        at = _days(at)
+        return self.window_mean(name, add_months(at, -months) + 1, at)
+
+    def same_month_last_year(self, name: str, at) -> np.ndarray:
+        """at 의 전년 같은 달 (달력 월 전체) 평균"""
+        month = _days(at).astype("datetime64[D]").astype("datetime64[M]") - 12
+        return self.window_mean(name, month.astype("datetime64[D]"), (month + 1).astype("datetime64[D]") - 1)
+
+    def lookup(self, name: str, at, method: str = "last_3m") -> np.ndarray:
+        match method:
+            case "asof":
+                return self.asof(name, at)
+            case "last_3m":
+                return self.last_months_mean(name, at, 3)
+            case "same_month_last_year":
+                return self.same_month_last_year(name, at)
+            case _:
+                raise ValueError(f"지원하지 않는 가격 기준: {method}")
+
+def scenario_prices(store: PriceStore, at, method: str = "last_3m", grade_tables=None, series: dict | None = None) -> dict[str, np.ndarray]:
+    """날짜 배열 at 의 compute_scenario 가격 인자 {인자명: 배열}. 저장소에 없는 시계열의 인자는 빠진다.
+
+    grade_tables=(df_cow, df_steer) 를 주면 등급별 지육단가 시계열로 비육우 두당 가격을 calculate_avg_price 와 같은 방식
+    (Σ 출현율 × 단가 × 도체중, 원 단위 절삭) 으로 다시 계산한다. 시세가 없는 등급·날짜는 표의 단가를 쓴다.
+    """
+    import numpy as np
+    out = {}
+    for arg, name in (series or PRICE_SERIES).items():
+        if name in store:
+            out[arg] = store.lookup(name, at, method)
+    for (arg, prefix), table in zip(CARCASS_SERIES.items(), grade_tables or ()):
+        names = [f"{prefix}:{g}" for g in table["Grade"]]
+        if not any(n in store for n in names):
+            continue
+        base = table["Price(KRW/kg)"].to_numpy(dtype=np.float64)
+        ratio = table["Ratio(%)"].to_numpy(dtype=np.float64) / 100
+        weight = table["Weight(kg)"].to_numpy(dtype=np.float64)
+        price = np.stack([store.lookup(n, at, method) if n in store else np.full(_days(at).shape, b) for n, b in zip(names, base)], axis=1)
+        price = np.where(np.isnan(price), base, price)
+        out[arg] = np.trunc((ratio * price * weight).sum(axis=1))
+    return out
+
+def backtest(store: PriceStore, params: dict, dates, method: str = "last_3m", grade_tables=None) -> pd.DataFrame:
+    """날짜마다 그 시점 가격으로 compute_scenario 를 다시 평가 (배치 한 번). 시세가 없는 날은 params 의 가격을 쓴다."""
+    import numpy as np
+    import pandas as pd
+    at = _days(dates)
+    prices = scenario_prices(store, at, method, grade_tables)
+    cols = {k: params[k] for k in SCENARIO_ARGS}
+    for k, v in prices.items():
+        cols[k] = np.where(np.isnan(v), float(params[k]), v)
+    cols["base_cows"] = np.full(at.shape, float(params["base_cows"]))
+    res = compute_scenario_batch(cols)
+    frame = pd.DataFrame({"date": at.astype("datetime64[D]")})
+    for k in prices:
+        frame[k] = cols[k]
+    for k in ("Rev Final", "Cost Final", "Net Final"):
+        frame[k] = res[k]
+    return frame
+
+def grade_table_prices(store: PriceStore, table: pd.DataFrame, prefix: str, at, method: str = "last_3m") -> pd.DataFrame:
+    """등급표의 지육단가를 at 시점 시세로 바꾼 사본 (시세가 없는 등급은 그대로)"""
+    import numpy as np
+    table = table.copy()
+    col = table.columns.get_loc("Price(KRW/kg)")
+    for i, grade in enumerate(table["Grade"]):
+        name = f"{prefix}:{grade}"
+        if name in store:
+            p = store.lookup(name, at, method)[0]
+            if not np.isnan(p):
+                table.iloc[i, col] = round(p)
+    return table
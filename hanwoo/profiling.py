@@ -0,0 +1,170 @@
+"""재실행 구간별 시간 측정 (Streamlit 비의존, 비활성 시 사실상 비용 없음)"""
+from __future__ import annotations
+
+import contextlib
+import functools
+import json
+import logging
+import threading
+import time
+from collections import deque
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+logger = logging.getLogger("hanwoo.profile")
+
+_NULL = contextlib.nullcontext()
+_local = threading.local()
+_lock = threading.Lock()
+_active = 0
+_orig_copy = None
+
+def _counting_copy(self, *args, **kwargs):
+    counter = getattr(_local, "copies", None)
+    if counter is not None:
+        counter[0] += 1
+    return _orig_copy(self, *args, **kwargs)
+
+def _acquire_copy_counter() -> None:
+    """DataFrame.copy 호출 횟수를 세도록 교체 (count_copies 로 측정 중인 실행이 하나라도 있는 동안만 유지).
+
+    pandas 클래스 속성을 바꾸므로 그동안은 다른 세션·스레드의 copy 호출도 이 래퍼를 거친다 (세지는 않음).
+    """
+    global _active, _orig_copy
+    import pandas as pd
+    with _lock:
+        if _active == 0:
+            _orig_copy = pd.DataFrame.copy
+            pd.DataFrame.copy = _counting_copy
+        _active += 1
+
+def _release_copy_counter() -> None:
+    global _active, _orig_copy
+    import pandas as pd
+    with _lock:
+        _active -= 1
+        if _active == 0:
+            pd.DataFrame.copy = _orig_copy
+            _orig_copy = None
+
+class RerunProfiler:
+    """한 번의 (전체 또는 프래그먼트) 실행을 이름 붙은 구간으로 나눠 시간과 DataFrame.copy 횟수를 기록한다.
+
+    enabled 가 False 이면 phase() 는 공유 nullcontext 를 돌려준다.
+    DataFrame.copy 계수는 pandas 를 전역으로 패치하므로 count_copies 를 따로 켠 디버그 실행에서만 설치되며,
+    꺼져 있으면 copies 는 None 이다. 켜면 같은 스레드(= 같은 세션의 스크립트 실행)에서 호출된 copy 만 센다.
+    끝난 실행은 history 에 쌓이고 logger("hanwoo.profile") 로 JSON 한 줄씩 남는다.
+    """
+
+    def __init__(self, enabled: bool = False, history: int = 20, count_copies: bool = False):
+        self.enabled = enabled
+        self.count_copies = count_copies
+        self.history: deque[dict] = deque(maxlen=history)
+        self._run: dict | None = None
+        self._depth = 0
+
+    @property
+    def active(self) -> bool:
+        return self._run is not None
+
+    def start(self, label: str = "script") -> None:
+        if self._run is not None:
+            # 이전 실행이 st.rerun / 예외로 끝나지 못한 경우: 기록 없이 정리
+            self._end()
+        if not self.enabled:
+            return
+        counter = None
+        if self.count_copies:
+            _acquire_copy_counter()
+            counter = _local.copies = [0]
+        self._depth = 0
+        self._run = {"label": label, "t0": time.perf_counter(), "phases": [], "counter": counter}
+
+    def _end(self) -> dict:
+        run, self._run = self._run, None
+        run["seconds"] = time.perf_counter() - run.pop("t0")
+        counter = run.pop("counter")
+        run["copies"] = None if counter is None else counter[0]
+        if counter is not None:
+            _local.copies = None
+            _release_copy_counter()
+        return run
+
+    def finish(self) -> dict | None:
+        if self._run is None:
+            return None
+        run = self._end()
+        run["time"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+        self.history.append(run)
+        logger.info(json.dumps(run, ensure_ascii=False))
+        return run
+
+    def phase(self, name: str):
+        if self._run is None:
+            return _NULL
+        return self._phase(name)
+
+    @contextlib.contextmanager
+    def _phase(self, name: str):
+        run = self._run
+        t0 = time.perf_counter()
+        counter = run["counter"]
+        c0 = counter[0] if counter is not None else 0
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            run["phases"].append({
+                "name": name, "depth": self._depth, "start": t0 - run["t0"],
+                "seconds": time.perf_counter() - t0, "copies": counter[0] - c0 if counter is not None else None,
+            })
+
+    @contextlib.contextmanager
+    def section(self, name: str):
+        """전체 실행 중이면 구간으로, 아니면 (프래그먼트 단독 재실행) 그 자체를 하나의 실행으로 기록"""
+        if self._run is not None or not self.enabled:
+            with self.phase(name):
+                yield
+            return
+        self.start(name)
+        try:
+            with self.phase(name):
+                yield
+        finally:
+            self.finish()
+
+    def wrap(self, name: str):
+        """section(name) 으로 감싸는 함수 데코레이터"""
+        def deco(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.section(name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return deco
+
+def phases_frame(run: dict) -> pd.DataFrame:
+    """한 실행의 구간 기록을 시작 순서대로 정렬한 표 (하위 구간은 이름 앞에 들여쓰기, copy 열은 계수한 실행만)"""
+    import pandas as pd
+    rows = sorted(run["phases"], key=lambda p: (p["start"], p["depth"]))
+    out = pd.DataFrame({
+        "구간": ["  " * p["depth"] + p["name"] for p in rows],
+        "ms": [p["seconds"] * 1e3 for p in rows],
+        "비율(%)": [p["seconds"] / run["seconds"] * 100 if run["seconds"] else 0.0 for p in rows],
+    })
+    if run.get("copies") is not None:
+        out["copy"] = [p["copies"] for p in rows]
+    return out
+
+def configure_logging(stream=None) -> None:
+    """hanwoo.profile 로그를 stream (기본 stderr) 에 JSON 한 줄씩 출력 (이미 설정되어 있으면 그대로 둠)"""
+    if logger.handlers:
+        return
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
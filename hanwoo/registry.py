@@ -0,0 +1,418 @@
+"""개체(이표) 등록부 -> 상태·성별·월령별 재고와 실제 이력 기반 분배 입력 (교체율 설정 탭의 추정 두수 대체)"""
+from __future__ import annotations
+
+import os
+from typing import TYPE_CHECKING
+
+from .grading import SEX_ALIASES, SEX_LABELS
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+# 상태 (앞의 N_ACTIVE 개가 사육 중, 나머지는 이탈)
+STATUSES: tuple[str, ...] = ("송아지", "대체우", "번식우", "비육우", "KPN", "판매", "출하", "도태", "폐사", "위탁종료")
+CALF, HEIFER, COW, FATTEN, KPN, SOLD, SHIPPED, CULLED, DEAD, KPN_OUT = range(10)
+N_STATUS = len(STATUSES)
+N_ACTIVE = 5
+
+# 이력 종류와 반영 후 상태 (-1: 상태 변화 없음). promote 는 분만으로 송아지·대체우가 번식우가 된 것을 등록부가 직접 기록한다.
+EVENTS: tuple[str, ...] = ("birth", "calf_sale", "heifer_in", "fatten_in", "fatten_out", "kpn_in", "kpn_out", "cull", "death", "weigh", "promote")
+BIRTH, CALF_SALE, HEIFER_IN, FATTEN_IN, FATTEN_OUT, KPN_IN, KPN_EXIT, CULL, DEATH, WEIGH, PROMOTE = range(11)
+EVENT_STATUS: tuple[int, ...] = (CALF, SOLD, HEIFER, FATTEN, SHIPPED, KPN, KPN_OUT, CULLED, DEAD, -1, COW)
+N_EVENTS = len(EVENTS)
+EVENT_LABELS: tuple[str, ...] = ("출생", "송아지 판매", "대체우 선발", "비육 투입", "비육 출하", "KPN 위탁", "KPN 종료", "도태", "폐사", "체중 측정", "번식우 편입")
+EVENT_ALIASES: dict[str, int] = {
+    **{e: i for i, e in enumerate(EVENTS)}, **{e.replace(" ", ""): i for i, e in enumerate(EVENT_LABELS)},
+    "분만": BIRTH, "판매": CALF_SALE, "대체우": HEIFER_IN, "비육입식": FATTEN_IN, "출하": FATTEN_OUT, "KPN": KPN_IN, "체중": WEIGH,
+}
+STATUS_ALIASES: dict[str, int] = {
+    **{s: i for i, s in enumerate(STATUSES)},
+    "calf": CALF, "heifer": HEIFER, "cow": COW, "fatten": FATTEN, "kpn": KPN,
+    "sold": SOLD, "shipped": SHIPPED, "culled": CULLED, "dead": DEAD, "kpn_out": KPN_OUT,
+}
+# 이력·재고 파일의 흔한 컬럼명 -> 표준 컬럼명
+COLUMN_ALIASES: dict[str, str] = {
+    "이표번호": "tag", "개체번호": "tag", "생년월일": "birth_date", "출생일": "birth_date", "성별": "sex",
+    "어미": "dam", "모개체": "dam", "상태": "status", "체중": "weight", "일자": "date", "이력일자": "date", "구분": "event", "이력": "event",
+}
+REGISTRY_COLUMNS: tuple[str, ...] = ("tag", "birth_date", "sex", "dam", "status", "weight")
+EVENT_COLUMNS: tuple[str, ...] = ("tag", "date", "event", "sex", "dam", "weight")
+
+# 월령 구간 경계 (개월, 마지막 구간은 그 이상 전체)
+AGE_BANDS: tuple[int, ...] = (0, 7, 13, 25, 37, 61)
+DAYS_PER_MONTH = 30.4375
+
+# 정렬 키 = 칸 × 2^22 + (일자 + 2^21): 칸 (이력 종류 × 이전 상태 × 성별 / 상태 × 성별) 안에서 일자순
+_DAY_OFFSET = 1 << 21
+_SPAN = 1 << 22
+
+def _days(x) -> np.ndarray:
+    import numpy as np
+    return np.atleast_1d(np.asarray(x, dtype="datetime64[D]")).astype(np.int64)
+
+def _codes(col: pd.Series, aliases: dict) -> np.ndarray:
+    """문자 값 -> 코드 (모르는 값은 NaN). 값 종류가 적으므로 고유값만 정리해 매핑한다."""
+    import numpy as np
+    import pandas as pd
+    codes, uniques = pd.factorize(col)
+    mapped = pd.Index(uniques).astype(str).str.strip().str.replace(" ", "").map(lambda v: aliases.get(v, np.nan)).to_numpy(dtype=np.float64)
+    return np.where(codes >= 0, mapped[codes], np.nan)
+
+def _tags(col: pd.Series) -> tuple[np.ndarray, np.ndarray]:
+    """이표 열 -> (고유 이표 (공백 제거), 행별 고유값 번호). 빈 값은 번호 -1."""
+    import numpy as np
+    import pandas as pd
+    codes, uniques = pd.factorize(col)
+    return pd.Index(uniques).astype(str).str.strip().to_numpy(dtype=object), codes.astype(np.int64)
+
+def _band_labels(bands) -> list[str]:
+    return [f"{lo}~{hi - 1}개월" for lo, hi in zip(bands[:-1], bands[1:])] + [f"{bands[-1]}개월 이상"]
+
+class AnimalRegistry:
+    """개체 열 (이표, 생년월일, 성별, 어미, 상태, 체중) 을 numpy 배열로 둔 등록부와 정렬된 이력 키 배열.
+
+    재고 집계는 (상태, 성별) 칸 안에서 생년월일로 정렬한 키 배열의 searchsorted 로, 기간 이력 두수는
+    (이력 종류, 이전 상태, 성별) 칸 안에서 일자로 정렬한 키 배열의 searchsorted 로 모든 칸을 한 번에 센다.
+    이력을 들여오면 새 이력은 정렬 후 병합 삽입되고 재고 색인은 다음 조회 때 다시 만든다.
+    """
+
+    def __init__(self, tag, birth, sex, dam=None, status=None, weight=None, weight_day=None,
+                 ev_key=None, ev_age=None, skipped: int = 0):
+        import numpy as np
+        self.tag = np.asarray(tag, dtype=object)
+        n = self.tag.size
+        self.birth = np.asarray(birth, dtype=np.int64)
+        self.sex = np.asarray(sex, dtype=np.int8)
+        self.dam = np.full(n, -1, dtype=np.int64) if dam is None else np.asarray(dam, dtype=np.int64)
+        self.status = np.full(n, CALF, dtype=np.int8) if status is None else np.asarray(status, dtype=np.int8)
+        self.weight = np.full(n, np.nan) if weight is None else np.asarray(weight, dtype=np.float64)
+        self.weight_day = self.birth.copy() if weight_day is None else np.asarray(weight_day, dtype=np.int64)
+        self.ev_key = np.empty(0, dtype=np.int64) if ev_key is None else np.asarray(ev_key, dtype=np.int64)
+        self.ev_age = np.empty(0, dtype=np.int64) if ev_age is None else np.asarray(ev_age, dtype=np.int64)
+        self.skipped = skipped
+        self._tag_index: pd.Index | None = None
+        self._inv_key: np.ndarray | None = None
+        self._inv_order: np.ndarray | None = None
+        self._age_prefix: np.ndarray | None = None
+
+    def __len__(self) -> int:
+        return int(self.tag.size)
+
+    @property
+    def n_events(self) -> int:
+        return int(self.ev_key.size)
+
+    @property
+    def last_day(self) -> np.datetime64:
+        """마지막 이력 일자 (이력이 없으면 가장 늦은 생년월일)"""
+        import numpy as np
+        days = self.ev_key % _SPAN - _DAY_OFFSET if self.ev_key.size else self.birth
+        return np.datetime64(int(days.max()) if days.size else 0, "D")
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> AnimalRegistry:
+        """재고 표 (tag, birth_date, sex[, dam, status, weight]) 로 생성. 상태가 없으면 송아지로 두며 형식 오류 행은 skipped 로 센다."""
+        import numpy as np
+        import pandas as pd
+        df = df.rename(columns=COLUMN_ALIASES)
+        n = len(df)
+        uniq, codes = _tags(df["tag"])
+        tag = np.where(codes >= 0, uniq[np.maximum(codes, 0)] if uniq.size else "", "")
+        birth = pd.to_datetime(df["birth_date"], errors="coerce").to_numpy(dtype="datetime64[D]")
+        sex = _codes(df["sex"], SEX_ALIASES)
+        status = _codes(df["status"], STATUS_ALIASES) if "status" in df.columns else np.full(n, float(CALF))
+        valid = ~np.isnat(birth) & np.isfinite(sex) & np.isfinite(status) & (tag != "")
+        valid &= ~pd.Series(tag).duplicated(keep="last").to_numpy()
+        weight = pd.to_numeric(df["weight"], errors="coerce").to_numpy(dtype=np.float64) if "weight" in df.columns else np.full(n, np.nan)
+        reg = cls(tag[valid], birth.astype(np.int64)[valid], sex[valid], status=status[valid], weight=weight[valid],
+                  skipped=int(n - valid.sum()))
+        if "dam" in df.columns:
+            dam_uniq, dam_codes = _tags(df["dam"])
+            dam_rows = reg.rows(dam_uniq)[np.maximum(dam_codes, 0)] if dam_uniq.size else -1
+            reg.dam = np.where(dam_codes >= 0, dam_rows, -1)[valid]
+        return reg
+
+    @classmethod
+    def load(cls, path) -> AnimalRegistry:
+        import numpy as np
+        with np.load(path) as z:
+            return cls(z["tag"].astype(object), z["birth"], z["sex"], z["dam"], z["status"], z["weight"], z["weight_day"],
+                       z["ev_key"], z["ev_age"], int(z["skipped"]))
+
+    def save(self, path) -> None:
+        import numpy as np
+        np.savez_compressed(path, tag=self.tag.astype(str), birth=self.birth, sex=self.sex, dam=self.dam, status=self.status,
+                            weight=self.weight, weight_day=self.weight_day, ev_key=self.ev_key, ev_age=self.ev_age, skipped=self.skipped)
+
+    def rows(self, tags) -> np.ndarray:
+        """이표 -> 행 번호 (등록되지 않은 이표는 -1)"""
+        import numpy as np
+        import pandas as pd
+        if self._tag_index is None:
+            self._tag_index = pd.Index(self.tag)
+        return self._tag_index.get_indexer(np.asarray(tags, dtype=object)).astype(np.int64)
+
+    def _register(self, tag, birth, sex, dam_tag) -> None:
+        """출생 이력의 새 개체 추가 (이미 있는 이표는 생년월일·성별·어미만 갱신)"""
+        import numpy as np
+        import pandas as pd
+        last = ~pd.Series(tag).duplicated(keep="last").to_numpy()
+        tag, birth, sex, dam_tag = tag[last], birth[last], sex[last], dam_tag[last]
+        row = self.rows(tag)
+        new = row < 0
+        n_new = int(new.sum())
+        if n_new:
+            self.tag = np.concatenate([self.tag, tag[new]])
+            self.birth = np.concatenate([self.birth, birth[new]])
+            self.sex = np.concatenate([self.sex, sex[new].astype(np.int8)])
+            self.dam = np.concatenate([self.dam, np.full(n_new, -1, dtype=np.int64)])
+            self.status = np.concatenate([self.status, np.full(n_new, CALF, dtype=np.int8)])
+            self.weight = np.concatenate([self.weight, np.full(n_new, np.nan)])
+            self.weight_day = np.concatenate([self.weight_day, birth[new]])
+            self._tag_index = None
+            row[new] = np.arange(self.tag.size - n_new, self.tag.size)
+        self.birth[row] = birth
+        self.sex[row] = sex
+        self.dam[row] = self.rows(dam_tag)
+
+    def apply_events(self, events: pd.DataFrame) -> int:
+        """이력 표 (tag, date, event[, sex, dam, weight]) 반영. 반영한 건수를 반환한다.
+
+        출생 이력은 새 개체를 등록하고 (sex 필요, dam 이 있으면 어미가 송아지·대체우였을 때 번식우로 바꾼다),
+        나머지 이력은 EVENT_STATUS 에 따라 상태를 바꾼다. 한 묶음 안에서는 개체별 일자순으로 반영하며
+        등록되지 않은 개체·형식 오류 행은 skipped 로 센다.
+        """
+        import numpy as np
+        import pandas as pd
+        df = events.rename(columns=COLUMN_ALIASES)
+        n = len(df)
+        day = pd.to_datetime(df["date"], errors="coerce").to_numpy(dtype="datetime64[D]")
+        kind = _codes(df["event"], EVENT_ALIASES)
+        uniq, codes = _tags(df["tag"])
+        weight = pd.to_numeric(df["weight"], errors="coerce").to_numpy(dtype=np.float64) if "weight" in df.columns else np.full(n, np.nan)
+        valid = ~np.isnat(day) & np.isfinite(kind) & (codes >= 0)
+        day = day.astype(np.int64)
+
+        births = valid & (kind == BIRTH)
+        if births.any():
+            sex = _codes(df["sex"], SEX_ALIASES) if "sex" in df.columns else np.full(n, np.nan)
+            valid &= ~births | np.isfinite(sex)
+            births &= valid
+            if "dam" in df.columns:
+                dam_uniq, dam_codes = _tags(df["dam"])
+                dam_tag = np.where(dam_codes >= 0, dam_uniq[np.maximum(dam_codes, 0)] if dam_uniq.size else "", "")[births]
+            else:
+                dam_tag = np.full(int(births.sum()), "", dtype=object)
+            self._register(uniq[codes[births]], day[births], sex[births], dam_tag)
+        row = np.where(valid, self.rows(uniq)[codes], -1)
+        valid &= row >= 0
+
+        # 개체별 일자순 (같은 날은 파일 순서)
+        idx = np.flatnonzero(valid)
+        order = idx[np.argsort(row[idx] * _SPAN + day[idx] + _DAY_OFFSET, kind="stable")]
+        r, d, k, w = row[order], day[order], kind[order].astype(np.int64), weight[order]
+        m = r.size
+        if m == 0:
+            self.skipped += n
+            return 0
+        pos = np.arange(m)
+        first = np.r_[True, r[1:] != r[:-1]]
+        group = np.maximum.accumulate(np.where(first, pos, 0))
+        new = np.asarray(EVENT_STATUS, dtype=np.int8)[k]
+        init = np.where(k == BIRTH, CALF, self.status[r]).astype(np.int8)
+        last_change = np.maximum.accumulate(np.where(new >= 0, pos, -1))
+        after = np.where(last_change >= group, new[np.maximum(last_change, 0)], init[group])
+        prev = np.where(first, init, np.roll(after, 1))
+
+        last = np.r_[first[1:], True]
+        self.status[r[last]] = after[last]
+        has_w = np.isfinite(w)
+        if has_w.any():
+            rw, dw, ww = r[has_w], d[has_w], w[has_w]
+            lw = np.r_[rw[1:] != rw[:-1], True]
+            self.weight[rw[lw]] = ww[lw]
+            self.weight_day[rw[lw]] = dw[lw]
+        # 분만한 송아지·대체우는 번식우로 (첫 분만일의 번식우 편입 이력으로 기록해 과거 기준일 재고를 되돌릴 수 있게 한다)
+        dams, dam_day = self.dam[r[k == BIRTH]], d[k == BIRTH]
+        dams, dam_day = dams[dams >= 0], dam_day[dams >= 0]
+        o = np.lexsort((dam_day, dams))
+        dams, dam_day = dams[o], dam_day[o]
+        first_calving = np.r_[True, dams[1:] != dams[:-1]] if dams.size else np.zeros(0, dtype=bool)
+        dams, dam_day = dams[first_calving], dam_day[first_calving]
+        heifers = self.status[dams] <= HEIFER
+        promote, promote_day = dams[heifers], dam_day[heifers]
+        promote_prev = self.status[promote].astype(np.int64)
+        self.status[promote] = COW
+
+        cell = np.concatenate([(k * N_STATUS + prev) * 2 + self.sex[r], (PROMOTE * N_STATUS + promote_prev) * 2 + self.sex[promote]])
+        d = np.concatenate([d, promote_day])
+        key = cell * _SPAN + d + _DAY_OFFSET
+        srt = np.argsort(key, kind="stable")
+        key, age = key[srt], (d - self.birth[np.concatenate([r, promote])])[srt]
+        at = np.searchsorted(self.ev_key, key, side="right")
+        self.ev_key = np.insert(self.ev_key, at, key)
+        self.ev_age = np.insert(self.ev_age, at, age)
+        self.invalidate()
+        self.skipped += n - m
+        return m
+
+    def invalidate(self) -> None:
+        """재고 정렬 색인과 월령 누적합을 버린다 (다음 조회에서 다시 만든다). 배열을 직접 고친 뒤에도 부른다."""
+        self._inv_key = self._inv_order = self._age_prefix = None
+
+    def _inventory_index(self) -> tuple[np.ndarray, np.ndarray]:
+        """(상태 × 2 + 성별, 생년월일) 정렬 키와 행 순서"""
+        import numpy as np
+        if self._inv_key is None:
+            key = (self.status.astype(np.int64) * 2 + self.sex) * _SPAN + self.birth + _DAY_OFFSET
+            self._inv_order = np.argsort(key, kind="stable")
+            self._inv_key = key[self._inv_order]
+        return self._inv_key, self._inv_order
+
+    def _cutoffs(self, at, bands) -> np.ndarray:
+        """월령 구간 경계 -> 해당 월령 이상인 생년월일 상한 (구간 수 + 1, 마지막은 하한 없음)"""
+        import numpy as np
+        at_day = int(_days(self.last_day if at is None else at)[0])
+        edges = np.round(np.asarray(bands, dtype=np.float64) * DAYS_PER_MONTH).astype(np.int64)
+        return np.append(at_day - edges, -_DAY_OFFSET)
+
+    def counts(self, at=None, bands=AGE_BANDS) -> np.ndarray:
+        """at (기본: 마지막 이력일) 기준 (상태, 성별, 월령 구간) 두수 배열. at 이후 출생은 제외하며,
+        at 이후의 상태 변화 이력은 되돌려 at 시점의 상태로 센다 (이력이 없는 재고 파일의 상태는 at 에도 그대로)."""
+        import numpy as np
+        key, _ = self._inventory_index()
+        cut = self._cutoffs(at, bands)
+        cells = np.arange(N_STATUS * 2, dtype=np.int64)[:, None] * _SPAN
+        below = np.searchsorted(key, cells + cut + _DAY_OFFSET, side="right")
+        out = (below[:, :-1] - below[:, 1:]).reshape(N_STATUS, 2, len(bands))
+        if at is not None and self.ev_key.size:
+            out += self._rollback(int(_days(at)[0]), cut)
+        return out
+
+    def _rollback(self, at_day: int, cut: np.ndarray) -> np.ndarray:
+        """at_day 이후 상태 변화 이력 (이전 상태 -> 반영 후 상태) 을 되돌리는 (상태, 성별, 월령 구간) 보정.
+
+        이력 키에는 개체가 없지만 이력 시점 일령이 있으므로 생년월일 (= 일자 - 일령) 로 at_day 기준 월령 구간을 구한다.
+        """
+        import numpy as np
+        out = np.zeros((N_STATUS, 2, cut.size - 1), dtype=np.int64)
+        day = self.ev_key % _SPAN - _DAY_OFFSET
+        cell = self.ev_key // _SPAN
+        kind, prev, sex = cell // (N_STATUS * 2), cell // 2 % N_STATUS, cell % 2
+        new = np.asarray(EVENT_STATUS, dtype=np.int64)[kind]
+        later = (day > at_day) & (new >= 0) & (new != prev)
+        if not later.any():
+            return out
+        birth = (day - self.ev_age)[later]
+        band = np.searchsorted(-cut, -birth, side="right") - 1
+        ok = (band >= 0) & (band < cut.size - 1)
+        sex, band = sex[later][ok], band[ok]
+        np.add.at(out, (new[later][ok], sex, band), -1)
+        np.add.at(out, (prev[later][ok], sex, band), 1)
+        return out
+
+    def members(self, status: int, sex: int, band: int | None = None, at=None, bands=AGE_BANDS) -> np.ndarray:
+        """현재 (상태, 성별[, 월령 구간]) 개체의 행 번호 (생년월일 내림차순, 월령은 at 기준)"""
+        import numpy as np
+        key, order = self._inventory_index()
+        base = (status * 2 + sex) * _SPAN + _DAY_OFFSET
+        cut = self._cutoffs(at, bands)
+        lo_day, hi_day = (cut[-1], cut[0]) if band is None else (cut[band + 1], cut[band])
+        lo = np.searchsorted(key, base + lo_day, side="right")
+        hi = np.searchsorted(key, base + hi_day, side="right")
+        return order[lo:hi][::-1]
+
+    def inventory(self, at=None, bands=AGE_BANDS) -> pd.DataFrame:
+        """사육 중인 개체의 (상태, 성별) × 월령 구간 두수 표"""
+        import pandas as pd
+        counts = self.counts(at, bands)[:N_ACTIVE]
+        index = pd.MultiIndex.from_product([STATUSES[:N_ACTIVE], SEX_LABELS], names=["상태", "성별"])
+        out = pd.DataFrame(counts.reshape(N_ACTIVE * 2, len(bands)), index=index, columns=_band_labels(bands))
+        out["합계"] = out.sum(axis=1)
+        return out
+
+    def flows(self, start, end) -> tuple[np.ndarray, np.ndarray]:
+        """[start, end] (양끝 포함) 기간의 (이력 종류, 이전 상태, 성별) 두수와 이력 시점 일령 합계"""
+        import numpy as np
+        if self._age_prefix is None:
+            self._age_prefix = np.concatenate([[0], np.cumsum(self.ev_age)])
+        cells = np.arange(N_EVENTS * N_STATUS * 2, dtype=np.int64) * _SPAN + _DAY_OFFSET
+        lo = np.searchsorted(self.ev_key, cells + _days(start)[0], side="left")
+        hi = np.searchsorted(self.ev_key, cells + _days(end)[0], side="right")
+        shape = (N_EVENTS, N_STATUS, 2)
+        return (hi - lo).reshape(shape), (self._age_prefix[hi] - self._age_prefix[lo]).reshape(shape)
+
+    def _window(self, at, months: int) -> tuple[np.ndarray, np.ndarray]:
+        from .prices import add_months
+        end = _days(self.last_day if at is None else at)
+        return add_months(end, -months) + 1, end
+
+    def flow_frame(self, at=None, months: int = 12) -> pd.DataFrame:
+        """at 까지 최근 months 개월의 이력 종류 × 성별 두수 표 (체중 측정 제외)"""
+        import pandas as pd
+        counts, _ = self.flows(*self._window(at, months))
+        by_sex = counts.sum(axis=1)[:WEIGH]
+        return pd.DataFrame(by_sex, index=pd.Index(EVENT_LABELS[:WEIGH], name="이력"), columns=list(SEX_LABELS))
+
+    def farm_inputs(self, at=None, months: int = 12) -> dict[str, float]:
+        """at 까지 최근 months 개월 이력 (연 환산) 과 at 시점 번식우 두수로 만든 compute_scenario 입력.
+
+        번식우·수태율·암 성비 (출생 두수 기준) 와 분배 항목 (ALLOC_KEYS) 을 채운다. 폐사는 송아지 상태에서의 폐사이며
+        폐사 월령은 폐사 시점 평균 월령으로, 기간 중 폐사가 없으면 넣지 않는다 (기존 입력 유지).
+        """
+        counts, age = self.flows(*self._window(at, months))
+        scale = 12.0 / months
+
+        def n(event, sex, prev=None):
+            c = counts[event, :, sex] if prev is None else counts[event, prev, sex]
+            return int(round(float(c.sum()) * scale))
+
+        base_cows = int(self.counts(at)[COW, 0].sum())
+        born_f, born_m = float(counts[BIRTH, :, 0].sum()) * scale, float(counts[BIRTH, :, 1].sum()) * scale
+        out: dict[str, float] = {
+            "base_cows": base_cows,
+            "conception_rate": round((born_f + born_m) / base_cows, 4) if base_cows else 0.0,
+            "female_birth_ratio": round(born_f / (born_f + born_m), 4) if born_f + born_m else 0.5,
+            "annual_culls": n(CULL, 0),
+            "female_calf_sell": n(CALF_SALE, 0), "male_calf_sell": n(CALF_SALE, 1),
+            "female_fatten_in": n(FATTEN_IN, 0), "male_fatten_in": n(FATTEN_IN, 1),
+            "female_fatten_out": n(FATTEN_OUT, 0), "male_fatten_out": n(FATTEN_OUT, 1),
+            "female_loss": n(DEATH, 0, CALF), "male_loss": n(DEATH, 1, CALF),
+            "kpn_male": n(KPN_IN, 1),
+        }
+        dead = counts[DEATH, CALF].sum()
+        if dead:
+            out["loss_months"] = max(1, int(round(age[DEATH, CALF].sum() / dead / DAYS_PER_MONTH)))
+        return out
+
+def load_registry(inventory=None, events=None, chunk_size: int = 1_000_000) -> AnimalRegistry:
+    """재고 (CSV/Parquet 경로·업로드 파일·DataFrame 또는 save 로 저장한 .npz) 와 이력으로 등록부 생성.
+
+    events 는 이력 파일 하나 또는 그 목록이며 파일은 청크 단위로 읽어 순서대로 반영한다.
+    """
+    import pandas as pd
+    from .io import iter_chunks
+
+    def _chunks(src):
+        match src:
+            case pd.DataFrame():
+                return [src]
+            case str() | os.PathLike():
+                return iter_chunks(src, chunk_size)
+            case _ if hasattr(src, "read"):
+                return iter_chunks(src, chunk_size)
+            case _:
+                return src
+
+    if inventory is None:
+        reg = AnimalRegistry([], [], [])
+    elif str(getattr(inventory, "name", inventory)).lower().endswith(".npz"):
+        reg = AnimalRegistry.load(inventory)
+    else:
+        frames = list(_chunks(inventory))
+        reg = AnimalRegistry.from_frame(pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0])
+    for src in events if isinstance(events, (list, tuple)) else ([] if events is None else [events]):
+        for chunk in _chunks(src):
+            reg.apply_events(chunk)
+    return reg
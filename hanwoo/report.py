@@ -0,0 +1,74 @@
+"""계산 결과의 표(엑셀 형식) 변환"""
+from __future__ import annotations
+
+import math
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+def fmt_money(x):
+    if x is None or (isinstance(x, float) and math.isnan(x)): return "-"
+    return f"{x:,.0f}"
+
+def _loss_basis(n_key):
+    return lambda r: f"{r[n_key]}두 * ({fmt_money(r['cost_y_cow'])}/{r['rate_concept']}) * ({r['loss_months']}/12)"
+
+# make_excel_view 의 행 정의: (구분, 항목, 금액 키, 부호, 산출 근거)
+LINE_ITEMS: tuple[tuple, ...] = (
+    ("수익", "도태우 판매", "v_cull", 1, lambda r: f"{r['n_cull']}두 * {fmt_money(r['p_cull'])}"),
+    ("수익", "암송아지 판매", "v_calf_f", 1, lambda r: f"{r['n_calf_f']}두 * {fmt_money(r['p_calf_f'])}"),
+    ("수익", "수송아지 판매", "v_calf_m", 1, lambda r: f"{r['n_calf_m']}두 * {fmt_money(r['p_calf_m'])}"),
+    ("수익", "암비육우 출하", "v_fat_out_f", 1, lambda r: f"{r['n_fat_out_f']}두 * {fmt_money(r['p_fat_f'])}"),
+    ("수익", "수비육우 출하", "v_fat_out_m", 1, lambda r: f"{r['n_fat_out_m']}두 * {fmt_money(r['p_fat_m'])}"),
+    ("수익", "부산물 수입", "v_byprod", 1, lambda r: f"{r['n_base']}두 * {fmt_money(r['unit_byprod'])}"),
+    ("비용", "기초 번식우 유지", "c_breed_main", -1, lambda r: f"{r['n_base']}두 * {fmt_money(r['cost_y_cow'])}"),
+    ("비용", "대체우 육성", "c_breed_repl", -1, lambda r: f"투입 {r['n_repl']}두 * 1년 * {fmt_money(r['cost_y_cow'])}"),
+    ("비용", "KPN 위탁", "c_kpn", -1, lambda r: f"{r['n_kpn']}두 * ({fmt_money(r['cost_y_cow'])}/{r['rate_concept']} - {fmt_money(r['unit_byprod'])}) * ({r['months_kpn']}/12)"),
+    ("비용", "자가 암비육", "c_fat_in_f", -1, lambda r: f"투입 {r['n_fat_in_f']}두 * 1년 * {fmt_money(r['cost_avg_fatten'])}"),
+    ("비용", "자가 수비육", "c_fat_in_m", -1, lambda r: f"투입 {r['n_fat_in_m']}두 * 1년 * {fmt_money(r['cost_avg_fatten'])}"),
+    ("비용(손실)", "암송아지 폐사", "val_loss_f", -1, _loss_basis("n_loss_f")),
+    ("비용(손실)", "수송아지 폐사", "val_loss_m", -1, _loss_basis("n_loss_m")),
+    ("외부", "비육우 매출", "v_ext_rev", 1, lambda r: f"{r['n_ext_sell']}두 * {fmt_money(r['p_ext_sell'])}"),
+    ("외부", "송아지 매입", "c_ext_buy", -1, lambda r: f"{r['n_ext_buy']}두 * {fmt_money(r['p_ext_buy'])}"),
+    ("외부", "사육 유지비", "c_ext_maint", -1, lambda r: f"매입 {r['n_ext_buy']}두 * 1년 * {fmt_money(r['cost_y_ext'])}"),
+    ("결과", "순이익 (Net Profit)", "Net Final", 1, lambda r: "수익 - 비용"),
+)
+
+# 배치 출력에 함께 싣는 합계 컬럼
+TOTAL_KEYS: tuple[str, ...] = ("Rev Final", "Cost Final", "Net Final")
+
+def make_excel_view(res: dict) -> pd.DataFrame:
+    import pandas as pd
+    return pd.DataFrame([
+        {"구분": group, "항목": item, "산출 근거": basis(res), "금액 (Amount)": sign * res[key]}
+        for group, item, key, sign, basis in LINE_ITEMS
+    ])
+
+def line_items_frame(batch: dict, ids=None, layout: str = "wide") -> pd.DataFrame:
+    """compute_scenario_batch 결과를 make_excel_view 와 같은 부호의 항목별 금액 표로 변환.
+
+    layout="wide" 는 한 행에 한 농장 (항목명 컬럼 + 합계 컬럼), "long" 은 (농장, 구분, 항목, 금액) 행이다.
+    """
+    import numpy as np
+    import pandas as pd
+    n = batch["Net Final"].shape[0]
+    ids = np.arange(n) if ids is None else np.asarray(ids)
+    match layout:
+        case "wide":
+            cols = {"id": ids}
+            cols.update({item: sign * batch[key] for _, item, key, sign, _ in LINE_ITEMS if key != "Net Final"})
+            cols.update({k: batch[k] for k in TOTAL_KEYS})
+            return pd.DataFrame(cols)
+        case "long":
+            groups = list(dict.fromkeys(g for g, *_ in LINE_ITEMS))
+            codes = np.tile(np.arange(len(LINE_ITEMS)), n)
+            group_codes = np.array([groups.index(g) for g, *_ in LINE_ITEMS])
+            return pd.DataFrame({
+                "id": np.repeat(ids, len(LINE_ITEMS)),
+                "구분": pd.Categorical.from_codes(group_codes[codes], groups),
+                "항목": pd.Categorical.from_codes(codes, [item for _, item, *_ in LINE_ITEMS]),
+                "금액 (Amount)": np.stack([sign * batch[key] for _, _, key, sign, _ in LINE_ITEMS], axis=1).ravel(),
+            })
+        case _:
+            raise ValueError(f"지원하지 않는 layout: {layout}")
@@ -0,0 +1,201 @@
+"""몬테카를로 위험 분석 (확률 입력 -> 순이익 분포)"""
+from __future__ import annotations
+
+import math
+import os
+from typing import TYPE_CHECKING
+
+from .scenario import SCENARIO_ARGS, compute_scenario_batch
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+# 등급표 출현율을 디리클레 분포로 뽑을 때 쓰는 spec 키 -> 가격 인자
+GRADE_SPEC_KEYS: dict[str, str] = {"cow_grade_ratio": "price_fatten_female", "steer_grade_ratio": "price_fatten_male"}
+
+class QuantileSketch:
+    """상대오차 보장 로그 버킷 분위수 스케치 (DDSketch 방식).
+
+    메모리는 값의 범위(버킷 수)에만 비례하고 표본 수와 무관하며, merge 는 순서와 무관하게 같은 결과를 낸다.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.005):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.pos: dict[int, int] = {}
+        self.neg: dict[int, int] = {}
+        self.zero = 0
+        self.count = 0
+
+    def _add_store(self, store: dict[int, int], values) -> None:
+        import numpy as np
+        keys, counts = np.unique(np.ceil(np.log(values) / self._log_gamma).astype(np.int64), return_counts=True)
+        for k, c in zip(keys.tolist(), counts.tolist()):
+            store[k] = store.get(k, 0) + c
+
+    def add(self, values) -> None:
+        import numpy as np
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[np.isfinite(values)]
+        self._add_store(self.pos, values[values > 0])
+        self._add_store(self.neg, -values[values < 0])
+        self.zero += int(np.count_nonzero(values == 0))
+        self.count += values.size
+
+    def merge(self, other: QuantileSketch) -> None:
+        if other.gamma != self.gamma:
+            raise ValueError("relative_accuracy 가 다른 스케치는 병합할 수 없습니다.")
+        for store, src in ((self.pos, other.pos), (self.neg, other.neg)):
+            for k, c in src.items():
+                store[k] = store.get(k, 0) + c
+        self.zero += other.zero
+        self.count += other.count
+
+    def _value(self, key: int) -> float:
+        return 2 * self.gamma ** key / (self.gamma + 1)
+
+    def quantile(self, q: float) -> float:
+        if self.count == 0:
+            return math.nan
+        rank = q * (self.count - 1)
+        seen = 0
+        for k in sorted(self.neg, reverse=True):
+            seen += self.neg[k]
+            if seen > rank:
+                return -self._value(k)
+        seen += self.zero
+        if seen > rank:
+            return 0.0
+        for k in sorted(self.pos):
+            seen += self.pos[k]
+            if seen > rank:
+                return self._value(k)
+        return self._value(max(self.pos)) if self.pos else 0.0
+
+def default_risk_spec(params: dict, price_cv: float = 0.15, grade_concentration: float = 200.0) -> dict:
+    """현재 입력값을 중심으로 한 기본 확률 분포 설정"""
+    conc = min(max(params["conception_rate"], 1e-3), 1 - 1e-3)
+    fbr = min(max(params["female_birth_ratio"], 1e-3), 1 - 1e-3)
+    spec = {
+        "conception_rate": ("beta", conc * 100, (1 - conc) * 100),
+        "female_birth_ratio": ("beta", fbr * 400, (1 - fbr) * 400),
+        "cow_grade_ratio": ("dirichlet", grade_concentration),
+        "steer_grade_ratio": ("dirichlet", grade_concentration),
+    }
+    for k in ("price_calf_female", "price_calf_male", "price_cull_cow"):
+        spec[k] = ("normal", params[k], abs(params[k]) * price_cv)
+    return spec
+
+def _draw(rng: np.random.Generator, dist, n: int) -> np.ndarray:
+    import numpy as np
+    if not isinstance(dist, (tuple, list)):
+        return np.full(n, float(dist))
+    kind, *args = dist
+    match kind:
+        case "fixed":
+            return np.full(n, float(args[0]))
+        case "normal":
+            return rng.normal(args[0], args[1], n)
+        case "lognormal":
+            return args[0] * rng.lognormal(0.0, args[1], n)
+        case "uniform":
+            return rng.uniform(args[0], args[1], n)
+        case "triangular":
+            return rng.triangular(args[0], args[1], args[2], n)
+        case "beta":
+            lo, hi = (args[2], args[3]) if len(args) == 4 else (0.0, 1.0)
+            return lo + (hi - lo) * rng.beta(args[0], args[1], n)
+        case _:
+            raise ValueError(f"지원하지 않는 분포: {kind}")
+
+def _draw_grade_price(rng: np.random.Generator, table, concentration: float, n: int) -> np.ndarray:
+    """등급 출현율을 디리클레 분포로 뽑아 calculate_avg_price 와 같은 방식으로 두당 가격 산출"""
+    import numpy as np
+    ratio = table["Ratio(%)"].to_numpy(dtype=np.float64)
+    unit = table["Price(KRW/kg)"].to_numpy(dtype=np.float64) * table["Weight(kg)"].to_numpy(dtype=np.float64)
+    g = rng.standard_gamma(concentration * ratio / ratio.sum(), size=(n, ratio.size))
+    draws = g / g.sum(axis=1, keepdims=True) * ratio.sum()
+    return np.trunc((draws / 100 * unit).sum(axis=1))
+
+def _apply_birth_shortfall(rng: np.random.Generator, cols: dict, n: int) -> None:
+    """수태율·성비 표본으로 실제 생산 두수를 이항분포로 뽑고, 부족분을 판매 -> 자가비육 -> 대체우/KPN 순으로 차감"""
+    import numpy as np
+    cows = np.broadcast_to(np.maximum(cols["base_cows"], 0), (n,)).astype(np.int64)
+    p_f = np.clip(cols["conception_rate"] * cols["female_birth_ratio"], 0, 1)
+    born_f = rng.binomial(cows, np.broadcast_to(p_f, (n,)))
+    born_m = rng.binomial(cows - born_f, np.broadcast_to(np.clip(cols["conception_rate"] - p_f, 0, 1) / np.maximum(1 - p_f, 1e-12), (n,)))
+    for born, loss, order in (
+        (born_f, "female_loss", ("female_calf_sell", "female_fatten_in", "annual_culls")),
+        (born_m, "male_loss", ("male_calf_sell", "male_fatten_in", "kpn_male")),
+    ):
+        short = np.maximum(0, sum(np.broadcast_to(cols[k], (n,)) for k in order) + cols[loss] - born)
+        for k in order:
+            cut = np.minimum(short, np.broadcast_to(cols[k], (n,)))
+            cols[k] = cols[k] - cut
+            short = short - cut
+    cols["female_fatten_out"] = np.minimum(cols["female_fatten_out"], cols["female_fatten_in"])
+    cols["male_fatten_out"] = np.minimum(cols["male_fatten_out"], cols["male_fatten_in"])
+
+def _run_chunk(params: dict, spec: dict, grade_tables: dict, n: int, seed, relative_accuracy: float):
+    import numpy as np
+    rng = np.random.default_rng(seed)
+    cols = {k: (_draw(rng, spec[k], n) if k in spec else np.full(n, float(params[k]))) for k in SCENARIO_ARGS}
+    for k in ("conception_rate", "female_birth_ratio"):
+        cols[k] = np.clip(cols[k], 0, 1)
+    for spec_key, price_key in GRADE_SPEC_KEYS.items():
+        if spec_key in spec:
+            cols[price_key] = _draw_grade_price(rng, grade_tables[spec_key], spec[spec_key][1], n)
+    if "conception_rate" in spec or "female_birth_ratio" in spec:
+        _apply_birth_shortfall(rng, cols, n)
+    net = compute_scenario_batch(cols)["Net Final"]
+    sketch = QuantileSketch(relative_accuracy)
+    sketch.add(net)
+    return sketch, int(np.count_nonzero(net < 0)), math.fsum(net.tolist())
+
+def simulate_risk(params: dict, spec: dict, grade_tables: dict | None = None, n: int = 1_000_000, chunk_size: int = 100_000,
+                  seed: int = 0, workers: int | None = None, relative_accuracy: float = 0.005) -> dict:
+    """확률 입력으로 n 개 농장-연도를 평가해 순이익 분위수와 손실 확률을 구한다.
+
+    params 는 compute_scenario 인자명 기준의 기준값, spec 은 {인자명: 분포} 이며 분포는
+    ("normal", 평균, 표준편차) / ("lognormal", 중앙값, sigma) / ("uniform", lo, hi) / ("triangular", lo, mode, hi) /
+    ("beta", a, b[, lo, hi]) / ("fixed", 값) 중 하나이다. "cow_grade_ratio" / "steer_grade_ratio" 에
+    ("dirichlet", 집중도) 를 주면 grade_tables 의 같은 키(df_cow/df_steer 형식)의 출현율을 뽑아 비육우 가격을 다시 계산한다.
+    수태율·성비가 spec 에 있으면 실제 생산 두수를 이항분포로 뽑아 분배 부족분을 차감한다.
+    청크마다 SeedSequence 로 시드를 나누므로 결과는 workers 수와 무관하게 seed 로 재현된다.
+    """
+    import numpy as np
+    missing = [k for k in GRADE_SPEC_KEYS if k in spec and k not in (grade_tables or {})]
+    if missing:
+        raise KeyError(f"등급표 누락: {', '.join(missing)}")
+    sizes = [chunk_size] * (n // chunk_size) + ([n % chunk_size] if n % chunk_size else [])
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    jobs = [(params, spec, grade_tables or {}, size, s, relative_accuracy) for size, s in zip(sizes, seeds)]
+
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    if workers <= 1:
+        parts = [_run_chunk(*job) for job in jobs]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(_run_chunk, *zip(*jobs)))
+
+    sketch = QuantileSketch(relative_accuracy)
+    n_loss = 0
+    for part_sketch, part_loss, _ in parts:
+        sketch.merge(part_sketch)
+        n_loss += part_loss
+    return {
+        "n": n,
+        "mean": math.fsum(total for _, _, total in parts) / n if n else math.nan,
+        "p5": sketch.quantile(0.05), "p50": sketch.quantile(0.50), "p95": sketch.quantile(0.95),
+        "prob_loss": n_loss / n if n else math.nan,
+        "sketch": sketch,
+    }
+
+def sketch_cdf(sketch: QuantileSketch, points: int = 101) -> pd.DataFrame:
+    """차트용 누적분포 (확률, 순이익)"""
+    import pandas as pd
+    probs = [i / (points - 1) for i in range(points)]
+    return pd.DataFrame({"Probability": probs, "Net Final": [sketch.quantile(q) for q in probs]})
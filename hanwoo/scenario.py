@@ -0,0 +1,280 @@
+"""시나리오 경제성 계산 (스칼라/배치)"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# compute_scenario 의 위치 인자 순서 (name 제외)
+SCENARIO_ARGS: tuple[str, ...] = (
+    "base_cows", "conception_rate", "female_birth_ratio", "heifer_nonprofit_months", "calf_common_months", "kpn_exit_months",
+    "annual_culls", "female_calf_sell", "female_fatten_in", "female_fatten_out", "female_loss", "loss_months",
+    "male_calf_sell", "male_fatten_in", "male_fatten_out", "male_loss", "kpn_male",
+    "cow_cost_y", "cost_fatten_avg_y", "price_calf_female", "price_calf_male", "price_fatten_female", "price_fatten_male", "price_cull_cow",
+    "ship_m_female", "ship_m_male", "ext_buy_n", "ext_buy_p", "ext_sell_n", "ext_sell_p", "ext_cost_y", "ext_period_y", "by_product_income_cow",
+)
+
+# 교체율 설정 탭에서 입력하는 분배 항목 (compute_scenario 인자명과 동일)
+ALLOC_KEYS: tuple[str, ...] = (
+    "annual_culls", "female_calf_sell", "female_fatten_in", "female_fatten_out", "female_loss", "loss_months",
+    "kpn_male", "male_calf_sell", "male_fatten_in", "male_fatten_out", "male_loss",
+)
+
+# 사이드바 / 교체율 설정 탭 기본값 (표에서 산출되는 비용·비육우 가격은 default_farm_args 에서 채운다)
+FARM_DEFAULTS: dict[str, float] = {
+    "base_cows": 100, "conception_rate": 0.70, "female_birth_ratio": 0.50,
+    "heifer_nonprofit_months": 18, "calf_common_months": 6, "kpn_exit_months": 6,
+    "annual_culls": 15, "female_calf_sell": 0, "female_fatten_in": 10, "female_fatten_out": 10, "female_loss": 0, "loss_months": 4,
+    "kpn_male": 10, "male_calf_sell": 0, "male_fatten_in": 25, "male_fatten_out": 25, "male_loss": 0,
+    "price_calf_female": 2302000, "price_calf_male": 4441000, "price_cull_cow": 468000,
+    "ship_m_female": 30, "ship_m_male": 30,
+    "ext_buy_n": 80, "ext_buy_p": 3950000, "ext_sell_n": 78, "ext_sell_p": 10721983, "ext_cost_y": 4330500, "ext_period_y": 2.0,
+    "by_product_income_cow": 0,
+}
+
+def default_farm_args(mode: str = "경영비") -> dict[str, float]:
+    """앱 기본 화면과 같은 compute_scenario 입력 (기본 비용표·등급표 기준)"""
+    from .tables import calculate_avg_price, calculate_cost_from_table, default_cost_tables, default_grade_tables
+    breed, fatten = default_cost_tables()
+    cow, steer = default_grade_tables()
+    return FARM_DEFAULTS | {
+        "cow_cost_y": calculate_cost_from_table(breed, mode), "cost_fatten_avg_y": calculate_cost_from_table(fatten, mode),
+        "price_fatten_female": calculate_avg_price(cow), "price_fatten_male": calculate_avg_price(steer),
+    }
+
+def clamp_int(x, lo=0):
+    try: return max(lo, int(x))
+    except: return lo
+
+def compute_scenario(name, base_cows, conception_rate, female_birth_ratio, heifer_nonprofit_months, calf_common_months, kpn_exit_months, annual_culls, female_calf_sell, female_fatten_in, female_fatten_out, female_loss, loss_months, male_calf_sell, male_fatten_in, male_fatten_out, male_loss, kpn_male, cow_cost_y, cost_fatten_avg_y, price_calf_female, price_calf_male, price_fatten_female, price_fatten_male, price_cull_cow, ship_m_female, ship_m_male, ext_buy_n, ext_buy_p, ext_sell_n, ext_sell_p, ext_cost_y, ext_period_y, by_product_income_cow):
+    base_cows = clamp_int(base_cows, 1)
+    annual_culls = clamp_int(annual_culls, 0)
+
+    val_cull = annual_culls * price_cull_cow
+    val_calf_f = clamp_int(female_calf_sell) * price_calf_female
+    val_calf_m = clamp_int(male_calf_sell) * price_calf_male
+    val_fat_out_f = clamp_int(female_fatten_out) * price_fatten_female
+    val_fat_out_m = clamp_int(male_fatten_out) * price_fatten_male
+    val_byprod = base_cows * by_product_income_cow
+    rev_internal = val_cull + val_calf_f + val_calf_m + val_fat_out_f + val_fat_out_m + val_byprod
+    
+    cost_breeding_main = base_cows * cow_cost_y
+    cost_breeding_repl = annual_culls * cow_cost_y
+
+    if conception_rate > 0:
+        calf_prod_cost_unit = (cow_cost_y / conception_rate) - by_product_income_cow
+    else:
+        calf_prod_cost_unit = 0
+    val_kpn_loss = clamp_int(kpn_male) * calf_prod_cost_unit * (clamp_int(kpn_exit_months, 0) / 12.0)
+    
+    val_fat_cost_f = clamp_int(female_fatten_in) * cost_fatten_avg_y
+    val_fat_cost_m = clamp_int(male_fatten_in) * cost_fatten_avg_y
+    
+    cost_loss_head = calf_prod_cost_unit * (loss_months / 12.0)
+    val_loss_f = female_loss * cost_loss_head
+    val_loss_m = male_loss * cost_loss_head
+    
+    cost_internal = cost_breeding_main + cost_breeding_repl + val_kpn_loss + val_fat_cost_f + val_fat_cost_m + val_loss_f + val_loss_m
+    net_internal = rev_internal - cost_internal
+
+    val_ext_rev = ext_sell_n * ext_sell_p
+    val_ext_buy = ext_buy_n * ext_buy_p
+    val_ext_maint = ext_buy_n * ext_cost_y
+    
+    net_external = val_ext_rev - val_ext_buy - val_ext_maint
+
+    net_final = net_internal + net_external
+    rev_final = rev_internal + val_ext_rev
+    cost_final = cost_internal + val_ext_buy + val_ext_maint
+
+    fatten_period_f = max(0, ship_m_female - calf_common_months) / 12.0
+    fatten_period_m = max(0, ship_m_male - calf_common_months) / 12.0
+
+    cost_breakdown = [
+        {"Category": "기초 번식우 유지", "Value": cost_breeding_main + cost_breeding_repl},
+        {"Category": "자가 사육비", "Value": val_fat_cost_f + val_fat_cost_m},
+        {"Category": "폐사 손실", "Value": val_loss_f + val_loss_m},
+        {"Category": "외부 송아지 매입", "Value": val_ext_buy},
+        {"Category": "외부 사육비", "Value": val_ext_maint},
+        {"Category": "기타 (KPN 위탁 등)", "Value": val_kpn_loss}
+    ]
+
+    return {
+        "Scenario": name,
+        "Net Final": net_final, "Rev Final": rev_final, "Cost Final": cost_final,
+        "Cost Breakdown": cost_breakdown,
+        "months_heifer": heifer_nonprofit_months, "months_kpn": kpn_exit_months, "rate_concept": conception_rate,
+        "period_f": fatten_period_f, "period_m": fatten_period_m, "period_ext": ext_period_y, "cost_avg_fatten": cost_fatten_avg_y,
+        "v_cull": val_cull, "n_cull": annual_culls, "v_calf_f": val_calf_f, "n_calf_f": female_calf_sell,
+        "v_calf_m": val_calf_m, "n_calf_m": male_calf_sell, "v_fat_out_f": val_fat_out_f, "n_fat_out_f": female_fatten_out,
+        "v_fat_out_m": val_fat_out_m, "n_fat_out_m": male_fatten_out, "c_breed_main": cost_breeding_main, "n_base": base_cows,
+        "c_breed_repl": cost_breeding_repl, "n_repl": annual_culls, "c_kpn": val_kpn_loss, "n_kpn": kpn_male,
+        "c_fat_in_f": val_fat_cost_f, "n_fat_in_f": female_fatten_in, "c_fat_in_m": val_fat_cost_m, "n_fat_in_m": male_fatten_in,
+        "val_loss_f": val_loss_f, "val_loss_m": val_loss_m, "n_loss_f": female_loss, "n_loss_m": male_loss,
+        "cost_loss_head": cost_loss_head, "loss_months": loss_months, "v_ext_rev": val_ext_rev, "n_ext_sell": ext_sell_n,
+        "c_ext_buy": val_ext_buy, "n_ext_buy": ext_buy_n, "c_ext_maint": val_ext_maint, "n_ext_stock": ext_sell_n * ext_period_y,
+        "p_cull": price_cull_cow, "p_calf_f": price_calf_female, "p_calf_m": price_calf_male,
+        "p_fat_f": price_fatten_female, "p_fat_m": price_fatten_male, "cost_y_cow": cow_cost_y, 
+        "p_ext_sell": ext_sell_p, "p_ext_buy": ext_buy_p, "cost_y_ext": ext_cost_y,
+        "v_byprod": val_byprod, "unit_byprod": by_product_income_cow
+    }
+
+def _clamp_int_arr(x, lo=0, out=None):
+    """clamp_int 의 벡터 버전 (정수 절삭, NaN/inf 는 lo). out 을 주면 그 자리에 쓴다."""
+    import numpy as np
+    x = np.asarray(x, dtype=np.float64)
+    out = np.trunc(x, out=np.empty_like(x) if out is None else out)
+    np.fmax(out, lo, out=out)
+    np.copyto(out, lo, where=np.isinf(out))
+    return out
+
+# compute_scenario_batch 한 번에 행 길이 배열이 최대 몇 개 생기는지 (넘치면 따로 할당)
+_BATCH_ROWS = 64
+# 이보다 행이 적으면 블록 없이 배열마다 할당한다 (작은 배열은 힙에서 재사용되어 페이지 폴트가 없다)
+_BLOCK_MIN_ROWS = 4096
+
+class _RowBlock:
+    """compute_scenario_batch 의 행 길이 중간·결과 배열 자리.
+
+    배열마다 새로 할당하면 새 메모리의 페이지 폴트가 계산보다 오래 걸리므로 (10만 행 기준 연산당 약 0.2ms)
+    한 블록을 잡아 두고 잘라 쓴다. 블록이 크면 큰 페이지로 잡혀 폴트가 거의 없다.
+    피연산자가 모두 스칼라(또는 짧은 축)인 결과는 블록을 쓰지 않고 그 모양 그대로 계산한다.
+    """
+
+    def __init__(self, shape: tuple, size: int = _BATCH_ROWS):
+        import math
+        import numpy as np
+        self.shape = shape if math.prod(shape) >= _BLOCK_MIN_ROWS else ()
+        self.rows = iter(np.empty((size, *self.shape))) if self.shape else iter(())
+
+    def slot(self, *operands) -> np.ndarray | None:
+        """피연산자의 브로드캐스트 결과가 행 길이이면 비어 있는 자리, 아니면 None"""
+        import numpy as np
+        if not self.shape:
+            return None
+        shapes = [np.shape(x) for x in operands]
+        if self.shape not in shapes and (len(self.shape) <= 1 or np.broadcast_shapes(*shapes) != self.shape):
+            return None
+        return next(self.rows, None)
+
+    def __call__(self, ufunc, *operands) -> np.ndarray:
+        if not self.shape:
+            return ufunc(*operands)
+        return ufunc(*operands, out=self.slot(*operands))
+
+    def float(self, x) -> np.ndarray:
+        """x 를 float64 배열로 (이미 float64 이면 복사하지 않는다)"""
+        import numpy as np
+        if not self.shape:
+            return np.asarray(x, dtype=np.float64)
+        x = np.asarray(x)
+        if x.dtype == np.float64:
+            return x
+        out = self.slot(x)
+        if out is None:
+            return x.astype(np.float64)
+        np.copyto(out, x, casting="unsafe")
+        return out
+
+    def clamp(self, x, lo=0) -> np.ndarray:
+        return _clamp_int_arr(x, lo, self.slot(x))
+
+    def sum(self, *terms) -> np.ndarray:
+        """terms 를 왼쪽부터 차례로 더한 값 (compute_scenario 와 같은 덧셈 순서). 행 길이가 된 뒤로는 제자리에서 더한다."""
+        import numpy as np
+        out = self(np.add, terms[0], terms[1])
+        for t in terms[2:]:
+            if self.shape and np.shape(out) == self.shape:
+                np.add(out, t, out=out)
+            else:
+                out = self(np.add, out, t)
+        return out
+
+def compute_scenario_batch(data=None, /, **columns) -> dict[str, np.ndarray]:
+    """compute_scenario 의 배치 버전.
+
+    data 는 DataFrame 또는 {인자명: 배열} 매핑이며, 키워드 인자로 개별 컬럼을 덮어쓸 수 있다.
+    스칼라는 전체 행에 브로드캐스트된다. 결과는 compute_scenario 의 수치 키별 배열이며
+    ("Cost Breakdown" 제외), 스칼라 경로와 같은 값을 낸다.
+    스칼라 입력은 펼치지 않고 계산하므로 입력 행에 따라 달라지지 않는 결과는 읽기 전용 브로드캐스트 뷰다.
+    """
+    import numpy as np
+    missing = [k for k in SCENARIO_ARGS if k not in columns and (data is None or k not in data)]
+    if missing:
+        raise KeyError(f"누락된 입력: {', '.join(missing)}")
+    raw = {k: np.asarray(columns[k] if k in columns else data[k]) for k in SCENARIO_ARGS}
+    shape = np.broadcast_shapes(*(v.shape for v in raw.values()))
+    r = _RowBlock(shape)
+    if r.shape:
+        a = {k: r.float(v) for k, v in raw.items()}
+    else:
+        # 행이 적으면 입력을 먼저 펼치는 편이 결과 ~40개를 펼치는 것보다 싸다
+        a = dict(zip(SCENARIO_ARGS, np.broadcast_arrays(*(v.astype(np.float64, copy=False) for v in raw.values()))))
+
+    base_cows = r.clamp(a["base_cows"], 1)
+    annual_culls = r.clamp(a["annual_culls"], 0)
+    cow_cost_y = a["cow_cost_y"]
+    cost_fatten_avg_y = a["cost_fatten_avg_y"]
+    conception_rate = a["conception_rate"]
+    by_product_income_cow = a["by_product_income_cow"]
+
+    val_cull = r(np.multiply, annual_culls, a["price_cull_cow"])
+    val_calf_f = r(np.multiply, r.clamp(a["female_calf_sell"]), a["price_calf_female"])
+    val_calf_m = r(np.multiply, r.clamp(a["male_calf_sell"]), a["price_calf_male"])
+    val_fat_out_f = r(np.multiply, r.clamp(a["female_fatten_out"]), a["price_fatten_female"])
+    val_fat_out_m = r(np.multiply, r.clamp(a["male_fatten_out"]), a["price_fatten_male"])
+    val_byprod = r(np.multiply, base_cows, by_product_income_cow)
+    rev_internal = r.sum(val_cull, val_calf_f, val_calf_m, val_fat_out_f, val_fat_out_m, val_byprod)
+
+    cost_breeding_main = r(np.multiply, base_cows, cow_cost_y)
+    cost_breeding_repl = r(np.multiply, annual_culls, cow_cost_y)
+
+    # 수태율이 0 이하인 행은 나눗셈 결과를 버리고 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        calf_prod_cost_unit = np.asarray(r(np.subtract, r(np.divide, cow_cost_y, conception_rate), by_product_income_cow))
+    np.copyto(calf_prod_cost_unit, 0.0, where=~(conception_rate > 0))
+    val_kpn_loss = r(np.multiply, r(np.multiply, r.clamp(a["kpn_male"]), calf_prod_cost_unit), r(np.divide, r.clamp(a["kpn_exit_months"], 0), 12.0))
+
+    val_fat_cost_f = r(np.multiply, r.clamp(a["female_fatten_in"]), cost_fatten_avg_y)
+    val_fat_cost_m = r(np.multiply, r.clamp(a["male_fatten_in"]), cost_fatten_avg_y)
+
+    cost_loss_head = r(np.multiply, calf_prod_cost_unit, r(np.divide, a["loss_months"], 12.0))
+    val_loss_f = r(np.multiply, a["female_loss"], cost_loss_head)
+    val_loss_m = r(np.multiply, a["male_loss"], cost_loss_head)
+
+    cost_internal = r.sum(cost_breeding_main, cost_breeding_repl, val_kpn_loss, val_fat_cost_f, val_fat_cost_m, val_loss_f, val_loss_m)
+    net_internal = r(np.subtract, rev_internal, cost_internal)
+
+    val_ext_rev = r(np.multiply, a["ext_sell_n"], a["ext_sell_p"])
+    val_ext_buy = r(np.multiply, a["ext_buy_n"], a["ext_buy_p"])
+    val_ext_maint = r(np.multiply, a["ext_buy_n"], a["ext_cost_y"])
+    net_external = r(np.subtract, r(np.subtract, val_ext_rev, val_ext_buy), val_ext_maint)
+
+    def period(ship):
+        return r(np.divide, r(np.maximum, 0.0, r(np.subtract, ship, a["calf_common_months"])), 12.0)
+
+    out = {k: v if np.shape(v) == shape else np.broadcast_to(v, shape) for k, v in {
+        "Net Final": r(np.add, net_internal, net_external),
+        "Rev Final": r(np.add, rev_internal, val_ext_rev),
+        "Cost Final": r.sum(cost_internal, val_ext_buy, val_ext_maint),
+        "months_heifer": a["heifer_nonprofit_months"], "months_kpn": a["kpn_exit_months"], "rate_concept": conception_rate,
+        "period_f": period(a["ship_m_female"]), "period_m": period(a["ship_m_male"]),
+        "period_ext": a["ext_period_y"], "cost_avg_fatten": cost_fatten_avg_y,
+        "v_cull": val_cull, "n_cull": annual_culls, "v_calf_f": val_calf_f, "n_calf_f": a["female_calf_sell"],
+        "v_calf_m": val_calf_m, "n_calf_m": a["male_calf_sell"], "v_fat_out_f": val_fat_out_f, "n_fat_out_f": a["female_fatten_out"],
+        "v_fat_out_m": val_fat_out_m, "n_fat_out_m": a["male_fatten_out"], "c_breed_main": cost_breeding_main, "n_base": base_cows,
+        "c_breed_repl": cost_breeding_repl, "n_repl": annual_culls, "c_kpn": val_kpn_loss, "n_kpn": a["kpn_male"],
+        "c_fat_in_f": val_fat_cost_f, "n_fat_in_f": a["female_fatten_in"], "c_fat_in_m": val_fat_cost_m, "n_fat_in_m": a["male_fatten_in"],
+        "val_loss_f": val_loss_f, "val_loss_m": val_loss_m, "n_loss_f": a["female_loss"], "n_loss_m": a["male_loss"],
+        "cost_loss_head": cost_loss_head, "loss_months": a["loss_months"], "v_ext_rev": val_ext_rev, "n_ext_sell": a["ext_sell_n"],
+        "c_ext_buy": val_ext_buy, "n_ext_buy": a["ext_buy_n"], "c_ext_maint": val_ext_maint, "n_ext_stock": r(np.multiply, a["ext_sell_n"], a["ext_period_y"]),
+        "p_cull": a["price_cull_cow"], "p_calf_f": a["price_calf_female"], "p_calf_m": a["price_calf_male"],
+        "p_fat_f": a["price_fatten_female"], "p_fat_m": a["price_fatten_male"], "cost_y_cow": cow_cost_y,
+        "p_ext_sell": a["ext_sell_p"], "p_ext_buy": a["ext_buy_p"], "cost_y_ext": a["ext_cost_y"],
+        "v_byprod": val_byprod, "unit_byprod": by_product_income_cow,
+    }.items()}
+    name = columns.get("name", None if data is None or "name" not in data else data["name"])
+    if name is not None:
+        out["Scenario"] = np.broadcast_to(np.asarray(name, dtype=object), shape)
+    return out
@@ -0,0 +1,108 @@
+"""민감도 분석: 단일 변수 토네이도 + Sobol 분산 기반 지수 (배치 모델 평가)"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from .cache import memoize
+from .scenario import SCENARIO_ARGS, compute_scenario_batch
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+SENSITIVITY_OUTPUTS: tuple[str, ...] = ("Net Final", "Rev Final", "Cost Final")
+# 0~1 비율 입력 (범위를 [0, 1] 로 자름)
+RATE_ARGS: frozenset[str] = frozenset({"conception_rate", "female_birth_ratio"})
+
+def default_ranges(params: dict, rel: float = 0.2, keys=None) -> dict[str, tuple[float, float]]:
+    """기준값 ± rel 범위 (0 인 입력은 변화가 없으므로 제외)"""
+    ranges = {}
+    for k in keys or SCENARIO_ARGS:
+        v = float(params[k])
+        if v == 0:
+            continue
+        lo, hi = sorted((v * (1 - rel), v * (1 + rel)))
+        if k in RATE_ARGS:
+            lo, hi = max(lo, 0.0), min(hi, 1.0)
+        ranges[k] = (lo, hi)
+    return ranges
+
+@memoize(32, "sensitivity.base_point")
+def base_point(params: dict) -> dict[str, float]:
+    """기준점 평가 (토네이도·Sobol 이 같은 입력이면 한 번만 계산)"""
+    res = compute_scenario_batch({k: [params[k]] for k in SCENARIO_ARGS})
+    return {k: float(res[k][0]) for k in SENSITIVITY_OUTPUTS}
+
+def _evaluate(params: dict, overrides: dict) -> dict[str, np.ndarray]:
+    res = compute_scenario_batch({k: params[k] for k in SCENARIO_ARGS}, **overrides)
+    return {k: res[k] for k in SENSITIVITY_OUTPUTS}
+
+def tornado(params: dict, ranges: dict[str, tuple[float, float]]) -> pd.DataFrame:
+    """입력 하나씩 범위 양끝으로 바꾼 결과 (long-format: input, output, low, high, base, swing). 2 × 입력 수 행을 한 번에 평가한다."""
+    import numpy as np
+    import pandas as pd
+    names = list(ranges)
+    k = len(names)
+    cols = {}
+    for j, name in enumerate(names):
+        col = np.full(2 * k, float(params[name]))
+        col[2 * j], col[2 * j + 1] = ranges[name]
+        cols[name] = col
+    out = _evaluate(params, cols) if k else {o: np.empty(0) for o in SENSITIVITY_OUTPUTS}
+    base = base_point(params)
+    frames = []
+    for o in SENSITIVITY_OUTPUTS:
+        low, high = out[o][0::2], out[o][1::2]
+        frames.append(pd.DataFrame({
+            "input": names, "output": o, "low_value": [ranges[n][0] for n in names], "high_value": [ranges[n][1] for n in names],
+            "low": low, "high": high, "base": base[o], "swing": np.abs(high - low),
+        }))
+    return pd.concat(frames, ignore_index=True).sort_values(["output", "swing"], ascending=[True, False], ignore_index=True)
+
+def sobol_indices(params: dict, ranges: dict[str, tuple[float, float]], n: int = 4096, seed: int = 0) -> pd.DataFrame:
+    """compute_scenario 출력 (순이익·수익·비용) 의 Sobol 1차(S1)·전체(ST) 지수. 입력은 범위 내 균등분포로 본다.
+
+    표본 n × (입력 수 + 2) 행을 한 번의 배치로 평가하며 같은 표본으로 모든 출력의 지수를 구한다 (추정은 saltelli 참고).
+    """
+    return saltelli(lambda cols: _evaluate(params, cols), ranges, SENSITIVITY_OUTPUTS, n, seed)
+
+def saltelli(evaluate, ranges: dict[str, tuple[float, float]], outputs, n: int = 4096, seed: int = 0) -> pd.DataFrame:
+    """evaluate({입력명: 배열}) -> {출력명: 배열} 모델의 Sobol 1차(S1)·전체(ST) 지수.
+
+    Saltelli 표본 설계: Sobol 준난수 (2 × 입력 수 차원) 를 A, B 두 행렬로 나누고 입력별로 A 의 한 열을 B 로 바꾼 AB_i 를 만들어
+    n × (입력 수 + 2) 행을 evaluate 한 번으로 평가한다. S1 은 Saltelli (2010), ST 는 Jansen 추정량이다.
+    """
+    import numpy as np
+    import pandas as pd
+    from scipy.stats import qmc
+    names = list(ranges)
+    k = len(names)
+    if k == 0:
+        return pd.DataFrame(columns=["input", "output", "S1", "ST"])
+    m = max(1, int(np.ceil(np.log2(max(n, 2)))))
+    u = qmc.Sobol(2 * k, scramble=True, seed=seed).random_base2(m)
+    n = u.shape[0]
+    lo = np.array([ranges[x][0] for x in names])
+    hi = np.array([ranges[x][1] for x in names])
+    A = lo + (hi - lo) * u[:, :k]
+    B = lo + (hi - lo) * u[:, k:]
+    # 행 블록: [A, B, AB_0, ..., AB_{k-1}]
+    X = np.tile(A, (k + 2, 1))
+    X[n:2 * n] = B
+    for i in range(k):
+        X[(i + 2) * n:(i + 3) * n, i] = B[:, i]
+    out = evaluate({name: X[:, i] for i, name in enumerate(names)})
+
+    rows = []
+    for o in outputs:
+        y = np.asarray(out[o], dtype=np.float64)
+        fA, fB = y[:n], y[n:2 * n]
+        fAB = y[2 * n:].reshape(k, n)
+        var = np.var(np.concatenate([fA, fB]))
+        if var > 0:
+            s1 = np.mean(fB * (fAB - fA), axis=1) / var
+            st = 0.5 * np.mean((fA - fAB) ** 2, axis=1) / var
+        else:
+            s1 = st = np.zeros(k)
+        rows.append(pd.DataFrame({"input": names, "output": o, "S1": s1, "ST": st}))
+    return pd.concat(rows, ignore_index=True).sort_values(["output", "ST"], ascending=[True, False], ignore_index=True)
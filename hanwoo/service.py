@@ -0,0 +1,341 @@
+"""로컬 HTTP/JSON 시나리오 평가 서비스 (python -m hanwoo serve)
+
+    POST /evaluate  {"inputs": {...}, "tables": {...}, "mode": "경영비"}   -> {"result": {항목: 금액, ...}}
+    POST /batch     {"scenarios": [{"inputs": ..., "tables": ...}, ...], "tables": ..., "mode": ...} -> {"results": [...], "failed": 건수}
+    GET  /health    상태·통계,  GET /args  입력 인자와 기본값
+
+/batch 의 results 는 요청 순서대로 {"result": {...}} 또는 {"error": 메시지} 이며, 상태 코드는 모두 성공이면 200,
+일부만 실패하면 207 (Multi-Status), 모두 실패하면 400 이다. 요청 자체가 잘못되면 (JSON·scenarios 형식) results 없이 400 이다.
+
+inputs 는 compute_scenario 인자 (없는 값은 FARM_DEFAULTS), tables 는 cost_breed / cost_fatten / cow / steer 표
+(행 dict 목록 또는 컬럼 dict, 없으면 기본 표) 이며 표에서 번식우·비육우 유지비와 비육우 평균 가격을 구한다.
+단건 요청은 디스패처가 모아 (micro-batch) 작업 프로세스에서 compute_scenario_batch 한 번으로 평가하고,
+처리 중인 같은 요청은 하나로 합치며 (coalescing), 대기 건수가 max_pending 을 넘으면 503 으로 거절한다.
+"""
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from typing import TYPE_CHECKING
+
+from .cache import memoize, stable_hash
+from .scenario import FARM_DEFAULTS, SCENARIO_ARGS
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# 요청 tables 키 -> 표 종류
+TABLE_KEYS: tuple[str, ...] = ("cost_breed", "cost_fatten", "cow", "steer")
+# 표 종류별 필요한 열 (묶음마다 그중 하나가 있어야 함) 과 숫자여야 하는 열
+_COST_COLUMNS = (("항목",), ("금액(천원/년)", "금액(원/년)"))
+_GRADE_COLUMNS = (("Ratio(%)",), ("Price(KRW/kg)",), ("Weight(kg)",))
+TABLE_COLUMNS: dict[str, tuple[tuple[str, ...], ...]] = {
+    "cost_breed": _COST_COLUMNS, "cost_fatten": _COST_COLUMNS, "cow": _GRADE_COLUMNS, "steer": _GRADE_COLUMNS,
+}
+_NUMERIC_COLUMNS = frozenset(("금액(천원/년)", "금액(원/년)", "Ratio(%)", "Price(KRW/kg)", "Weight(kg)"))
+COST_MODES: tuple[str, ...] = ("경영비", "생산비")
+MAX_BODY_BYTES = 8 * 1024 * 1024
+
+class Overloaded(Exception):
+    """대기 건수 한도 초과 (HTTP 503)"""
+
+@memoize(256, "service.table_inputs")
+def table_inputs(tables: dict, mode: str) -> dict[str, float]:
+    """요청 표 (없는 표는 기본 표) -> 표에서 산출되는 compute_scenario 입력"""
+    import pandas as pd
+    from .tables import calculate_avg_price, calculate_cost_from_table, default_cost_tables, default_grade_tables
+    unknown = set(tables) - set(TABLE_KEYS)
+    if unknown:
+        raise ValueError(f"알 수 없는 표: {', '.join(sorted(unknown))}")
+    if mode not in COST_MODES:
+        raise ValueError(f"지원하지 않는 mode: {mode}")
+    frames = dict(zip(TABLE_KEYS, (*default_cost_tables(), *default_grade_tables())))
+    for key, rows in tables.items():
+        frames[key] = _table_frame(key, rows)
+    return {
+        "cow_cost_y": calculate_cost_from_table(frames["cost_breed"], mode),
+        "cost_fatten_avg_y": calculate_cost_from_table(frames["cost_fatten"], mode),
+        "price_fatten_female": calculate_avg_price(frames["cow"]),
+        "price_fatten_male": calculate_avg_price(frames["steer"]),
+    }
+
+def _table_frame(key: str, rows) -> pd.DataFrame:
+    """요청 표 (행 dict 목록 또는 컬럼 dict) -> DataFrame. 필요한 열이 없거나 숫자 열이 숫자가 아니면 ValueError."""
+    import pandas as pd
+    try:
+        df = pd.DataFrame(rows)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"{key} 표 형식이 잘못되었습니다: {e}") from None
+    for group in TABLE_COLUMNS[key]:
+        if not any(c in df.columns for c in group):
+            raise ValueError(f"{key} 표에 필요한 열이 없습니다: {' 또는 '.join(group)}")
+    for col in _NUMERIC_COLUMNS & set(df.columns):
+        if not pd.api.types.is_numeric_dtype(df[col]) or pd.api.types.is_bool_dtype(df[col]):
+            raise ValueError(f"{key} 표의 {col} 열은 숫자여야 합니다")
+    return df
+
+def resolve_args(payload: dict, shared: dict | None = None) -> dict[str, float]:
+    """요청 하나 -> compute_scenario 전체 입력 (우선순위: inputs > 표 산출값 > FARM_DEFAULTS). shared 는 /batch 공통 tables·mode."""
+    if not isinstance(payload, dict):
+        raise ValueError("요청은 JSON 객체여야 합니다")
+    shared = shared or {}
+    inputs = payload.get("inputs", {})
+    unknown = set(inputs) - set(SCENARIO_ARGS)
+    if unknown:
+        raise ValueError(f"알 수 없는 입력: {', '.join(sorted(unknown))}")
+    tables = {**shared.get("tables", {}), **payload.get("tables", {})}
+    args = FARM_DEFAULTS | table_inputs(tables, payload.get("mode", shared.get("mode", "경영비"))) | inputs
+    for k, v in args.items():
+        if isinstance(v, bool) or not isinstance(v, (int, float)):
+            raise ValueError(f"{k}: 숫자가 아닌 값 {v!r}")
+    return args
+
+def evaluate_payloads(payloads: list[dict], shared: dict | None = None) -> list[dict]:
+    """요청 목록을 compute_scenario_batch 한 번으로 평가 -> 요청별 {"result": {...}} 또는 {"error": 메시지}"""
+    import numpy as np
+    from .report import line_items_frame
+    from .scenario import compute_scenario_batch
+    out: list[dict] = [{} for _ in payloads]
+    rows, args = [], []
+    for i, payload in enumerate(payloads):
+        try:
+            args.append(resolve_args(payload, shared))
+            rows.append(i)
+        except (ValueError, TypeError, KeyError, AttributeError) as e:
+            out[i] = {"error": str(e.args[0]) if e.args else type(e).__name__}
+    if rows:
+        batch = compute_scenario_batch({k: np.array([a[k] for a in args], dtype=np.float64) for k in SCENARIO_ARGS})
+        frame = line_items_frame(batch, ids=rows, layout="wide")
+        for record in frame.to_dict("records"):
+            out[int(record.pop("id"))] = {"result": record}
+    return out
+
+def _warm() -> None:
+    """작업 프로세스 초기화: numpy/pandas 를 불러오고 기본 입력으로 한 번 평가해 둔다"""
+    evaluate_payloads([{}])
+
+class Dispatcher:
+    """단건 요청을 모아 작업 풀에 배치로 넘긴다.
+
+    submit() 은 요청 해시로 처리 중인 같은 요청을 찾아 같은 Future 를 돌려주고, 최근 결과는 LRU 에서 바로 돌려준다.
+    배치 스레드는 첫 요청 뒤 max_wait 초 또는 max_batch 건이 모일 때까지 기다렸다 평가하며, 작업 풀에 동시에 넘기는 배치는
+    작업자 수 × 2 개로 제한한다. 대기·처리 중인 요청이 max_pending 건이면 Overloaded 를 던진다 (호출 측은 503).
+    workers=0 이면 배치 스레드에서 직접 평가한다 (단일 CPU·테스트용).
+    """
+
+    def __init__(self, workers: int = 0, max_batch: int = 256, max_wait: float = 0.002, max_pending: int = 10_000, cache_size: int = 4096):
+        self.workers = workers
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.max_pending = max_pending
+        self.cache_size = cache_size
+        self.stats = {"requests": 0, "coalesced": 0, "cache_hits": 0, "rejected": 0, "batches": 0, "evaluated": 0}
+        self._queue: deque = deque()
+        self._inflight: dict[str, Future] = {}
+        self._results: OrderedDict = OrderedDict()
+        self._cond = threading.Condition()
+        self._pending = 0
+        self._closed = False
+        self._pool = None
+        self._slots = threading.BoundedSemaphore(max(1, workers) * 2)
+        if workers > 0:
+            from concurrent.futures import ProcessPoolExecutor
+            self._pool = ProcessPoolExecutor(max_workers=workers, initializer=_warm)
+            for f in [self._pool.submit(_warm) for _ in range(workers)]:
+                f.result()
+        else:
+            _warm()
+        self._thread = threading.Thread(target=self._run, name="hanwoo-dispatcher", daemon=True)
+        self._thread.start()
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def submit(self, payload: dict) -> Future:
+        key = stable_hash(payload)
+        with self._cond:
+            self.stats["requests"] += 1
+            fut = self._inflight.get(key)
+            if fut is not None:
+                self.stats["coalesced"] += 1
+                return fut
+            if key in self._results:
+                self.stats["cache_hits"] += 1
+                self._results.move_to_end(key)
+                fut = Future()
+                fut.set_result(self._results[key])
+                return fut
+            if self._closed or self._pending >= self.max_pending:
+                self.stats["rejected"] += 1
+                raise Overloaded(f"대기 중인 요청 {self._pending:,}건")
+            fut = self._inflight[key] = Future()
+            self._pending += 1
+            self._queue.append((key, payload, fut))
+            self._cond.notify()
+        return fut
+
+    def evaluate_batch(self, payloads: list[dict], shared: dict | None = None) -> list[dict]:
+        """/batch 요청: 큐를 거치지 않고 max_batch 단위로 나눠 바로 평가 (대기 건수 한도는 같이 적용)"""
+        if len(payloads) > self.max_pending:
+            raise ValueError(f"한 번에 최대 {self.max_pending:,}건까지 평가할 수 있습니다")
+        with self._cond:
+            if self._closed or self._pending + len(payloads) > self.max_pending:
+                self.stats["rejected"] += 1
+                raise Overloaded(f"대기 중인 요청 {self._pending:,}건")
+            self._pending += len(payloads)
+            self.stats["requests"] += 1
+        try:
+            step = max(self.max_batch, 1024)
+            parts = [self._execute(payloads[i:i + step], shared) for i in range(0, len(payloads), step)]
+            return [r for part in parts for r in part.result()]
+        finally:
+            with self._cond:
+                self._pending -= len(payloads)
+
+    def _execute(self, payloads: list[dict], shared: dict | None = None) -> Future:
+        self._slots.acquire()
+        if self._pool is not None:
+            fut = self._pool.submit(evaluate_payloads, payloads, shared)
+        else:
+            fut = Future()
+            try:
+                fut.set_result(evaluate_payloads(payloads, shared))
+            except Exception as e:
+                fut.set_exception(e)
+        fut.add_done_callback(lambda _: self._slots.release())
+        with self._cond:
+            self.stats["batches"] += 1
+            self.stats["evaluated"] += len(payloads)
+        return fut
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._queue and not self._closed:
+                    self._cond.wait()
+                if self._closed and not self._queue:
+                    return
+                deadline = time.monotonic() + self.max_wait
+                while len(self._queue) < self.max_batch and not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                items = [self._queue.popleft() for _ in range(min(self.max_batch, len(self._queue)))]
+            self._execute([p for _, p, _ in items]).add_done_callback(lambda fut, items=items: self._finish(items, fut))
+
+    def _finish(self, items: list, fut: Future) -> None:
+        try:
+            results = fut.result()
+        except Exception as e:
+            results = [{"error": f"평가 실패: {e}"}] * len(items)
+        with self._cond:
+            for (key, _, _), res in zip(items, results):
+                self._inflight.pop(key, None)
+                if "result" in res:
+                    self._results[key] = res
+            while len(self._results) > self.cache_size:
+                self._results.popitem(last=False)
+            self._pending -= len(items)
+        for (_, _, f), res in zip(items, results):
+            f.set_result(res)
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+        if self._pool is not None:
+            self._pool.shutdown()
+
+class ScenarioHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"          # keep-alive (연결 재사용)
+    disable_nagle_algorithm = True         # 헤더·본문을 따로 쓰므로 Nagle + delayed ACK 로 응답마다 ~40ms 지연되는 것을 막음
+    server: ScenarioServer
+
+    def log_message(self, format, *args):  # 요청마다 stderr 에 쓰지 않음
+        pass
+
+    def _send(self, status: int, body: dict, headers: dict | None = None) -> None:
+        data = json.dumps(body, ensure_ascii=False, default=lambda x: x.item() if hasattr(x, "item") else str(x)).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY_BYTES:
+            self.close_connection = True
+            raise ValueError(f"요청 본문이 너무 큽니다 ({length:,}바이트)")
+        body = json.loads(self.rfile.read(length) or b"{}")
+        if not isinstance(body, dict):
+            raise ValueError("요청 본문은 JSON 객체여야 합니다")
+        return body
+
+    def do_GET(self):
+        dispatcher = self.server.dispatcher
+        match self.path:
+            case "/health":
+                self._send(HTTPStatus.OK, {"status": "ok", "workers": dispatcher.workers, "pending": dispatcher.pending, **dispatcher.stats})
+            case "/args":
+                self._send(HTTPStatus.OK, {"args": list(SCENARIO_ARGS), "defaults": FARM_DEFAULTS, "tables": list(TABLE_KEYS), "modes": list(COST_MODES)})
+            case _:
+                self._send(HTTPStatus.NOT_FOUND, {"error": f"없는 경로: {self.path}"})
+
+    def do_POST(self):
+        dispatcher = self.server.dispatcher
+        try:
+            body = self._read_json()
+            match self.path:
+                case "/evaluate":
+                    res = dispatcher.submit(body).result(timeout=self.server.timeout_s)
+                    status = HTTPStatus.BAD_REQUEST if "error" in res else HTTPStatus.OK
+                case "/batch":
+                    scenarios = body.get("scenarios")
+                    if not isinstance(scenarios, list):
+                        raise ValueError("scenarios 는 요청 목록이어야 합니다")
+                    results = dispatcher.evaluate_batch(scenarios, {k: body[k] for k in ("tables", "mode") if k in body})
+                    failed = sum("error" in r for r in results)
+                    res = {"results": results, "failed": failed}
+                    status = HTTPStatus.OK if not failed else HTTPStatus.MULTI_STATUS if failed < len(results) else HTTPStatus.BAD_REQUEST
+                case _:
+                    self._send(HTTPStatus.NOT_FOUND, {"error": f"없는 경로: {self.path}"})
+                    return
+        except Overloaded as e:
+            self._send(HTTPStatus.SERVICE_UNAVAILABLE, {"error": f"요청이 많습니다: {e}"}, {"Retry-After": "1"})
+            return
+        except (ValueError, TypeError) as e:   # JSON 오류 (JSONDecodeError 는 ValueError), 잘못된 입력
+            self._send(HTTPStatus.BAD_REQUEST, {"error": str(e)})
+            return
+        except TimeoutError:
+            self._send(HTTPStatus.GATEWAY_TIMEOUT, {"error": "평가 시간 초과"})
+            return
+        self._send(status, res)
+
+class ScenarioServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, address: tuple[str, int], dispatcher: Dispatcher, timeout_s: float = 30.0):
+        super().__init__(address, ScenarioHandler)
+        self.dispatcher = dispatcher
+        self.timeout_s = timeout_s
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.dispatcher.close()
+
+def make_server(host: str = "127.0.0.1", port: int = 8765, workers: int = 0, **options) -> ScenarioServer:
+    """서버 생성 (port=0 이면 빈 포트; 실제 주소는 server.server_address). serve_forever() 로 실행한다."""
+    return ScenarioServer((host, port), Dispatcher(workers=workers, **options))
@@ -0,0 +1,142 @@
+"""시나리오 스냅샷 저장소 (내용 주소 방식 - 같은 표는 한 번만 저장, 농가별 저장 이력)"""
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import time
+import zlib
+from hashlib import sha256
+from pathlib import Path
+from typing import TYPE_CHECKING
+from urllib.parse import quote, unquote
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+SNAPSHOT_VERSION = 1
+
+def _json_default(x):
+    """numpy 스칼라 등 -> 파이썬 기본형"""
+    if hasattr(x, "item"):
+        return x.item()
+    raise TypeError(f"JSON 으로 저장할 수 없는 값: {type(x).__name__}")
+
+def _dumps(obj) -> bytes:
+    # 같은 내용이면 같은 바이트가 되도록 키 정렬·공백 없이 직렬화
+    return json.dumps(obj, ensure_ascii=False, sort_keys=True, separators=(",", ":"), default=_json_default).encode()
+
+def encode_table(df: pd.DataFrame) -> bytes:
+    """DataFrame -> 컬럼 단위 JSON 바이트 (dtype 보존, 기본 RangeIndex 는 생략)"""
+    import pandas as pd
+    payload = {
+        "columns": [str(c) for c in df.columns],
+        "dtypes": [str(t) for t in df.dtypes],
+        "data": [df[c].tolist() for c in df.columns],
+    }
+    if not df.index.equals(pd.RangeIndex(len(df))):
+        payload["index"] = df.index.tolist()
+    return _dumps(payload)
+
+def decode_table(data: bytes) -> pd.DataFrame:
+    import pandas as pd
+    payload = json.loads(data)
+    # 열마다 같은 인덱스로 만들어야 한다 (기본 인덱스 Series 를 index= 로 재색인하면 값이 모두 NaN 이 된다)
+    index = payload.get("index")
+    return pd.DataFrame(
+        {c: pd.Series(v, dtype=t, index=index) for c, t, v in zip(payload["columns"], payload["dtypes"], payload["data"])},
+        index=index,
+    )
+
+class SnapshotStore:
+    """root 아래 두 종류의 파일로 스냅샷을 보관한다.
+
+    objects/<해시 앞 2자리>/<나머지>: 원본 바이트의 sha256 을 이름으로 하는 zlib 압축 blob (표·매니페스트).
+    refs/<농가>.log: 저장 이력 (한 줄 = 시각, 매니페스트 해시, 메모). 추가만 하므로 버전 수와 무관하게 저장은 상수 시간이다.
+    같은 내용의 표는 스냅샷이 몇 개든 blob 하나만 남고, 읽은 표는 해시별로 캐시한다 (blob 은 바뀌지 않음).
+    """
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self._tables: dict[str, pd.DataFrame] = {}
+
+    def _object_path(self, digest: str) -> Path:
+        return self.root / "objects" / digest[:2] / digest[2:]
+
+    def _ref_path(self, farm: str) -> Path:
+        return self.root / "refs" / f"{quote(farm, safe='')}.log"
+
+    def put(self, data: bytes) -> str:
+        digest = sha256(data).hexdigest()
+        path = self._object_path(digest)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=path.parent)
+            with os.fdopen(fd, "wb") as f:
+                f.write(zlib.compress(data, 6))
+            os.replace(tmp, path)
+        return digest
+
+    def get(self, digest: str) -> bytes:
+        return zlib.decompress(self._object_path(digest).read_bytes())
+
+    def put_table(self, df: pd.DataFrame) -> str:
+        return self.put(encode_table(df))
+
+    def get_table(self, digest: str) -> pd.DataFrame:
+        df = self._tables.get(digest)
+        if df is None:
+            df = self._tables[digest] = decode_table(self.get(digest))
+        return df.copy()
+
+    def save(self, farm: str, inputs: dict, tables: dict[str, pd.DataFrame], label: str = "") -> str:
+        """스냅샷 저장 -> 매니페스트 해시. inputs 는 JSON 으로 저장 가능한 값 (숫자·문자열) 이어야 한다."""
+        manifest = {
+            "version": SNAPSHOT_VERSION, "farm": farm, "label": label, "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "inputs": inputs, "tables": {name: self.put_table(df) for name, df in tables.items()},
+        }
+        digest = self.put(_dumps(manifest))
+        path = self._ref_path(farm)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("a", encoding="utf-8") as f:
+            f.write(f"{manifest['created']}\t{digest}\t{' '.join(label.split())}\n")
+        return digest
+
+    def manifest(self, digest: str) -> dict:
+        return json.loads(self.get(digest))
+
+    def load(self, digest: str) -> dict:
+        """매니페스트 해시 -> {"farm", "label", "created", "inputs", "tables": {이름: DataFrame}}"""
+        manifest = self.manifest(digest)
+        if manifest.get("version") != SNAPSHOT_VERSION:
+            raise ValueError(f"지원하지 않는 스냅샷 버전: {manifest.get('version')}")
+        return {**manifest, "tables": {name: self.get_table(h) for name, h in manifest["tables"].items()}}
+
+    def history(self, farm: str, limit: int | None = None) -> list[dict]:
+        """농가의 저장 이력 (최신순)"""
+        path = self._ref_path(farm)
+        if not path.exists():
+            return []
+        lines = path.read_text(encoding="utf-8").splitlines()
+        entries = []
+        for line in reversed(lines[-limit:] if limit else lines):
+            created, digest, label = line.split("\t", 2)
+            entries.append({"created": created, "digest": digest, "label": label})
+        return entries
+
+    def latest(self, farm: str) -> str | None:
+        entries = self.history(farm, limit=1)
+        return entries[0]["digest"] if entries else None
+
+    def farms(self) -> list[str]:
+        refs = self.root / "refs"
+        return sorted(unquote(p.stem) for p in refs.glob("*.log")) if refs.exists() else []
+
+    def stats(self) -> dict[str, int]:
+        """저장된 blob 수와 압축 후 크기 (바이트)"""
+        files = [p for p in (self.root / "objects").glob("*/*") if p.is_file()]
+        return {"objects": len(files), "bytes": sum(p.stat().st_size for p in files)}
+
+def default_store_root() -> Path:
+    """HANWOO_SNAPSHOT_DIR (없으면 ~/.hanwoo/snapshots)"""
+    return Path(os.environ.get("HANWOO_SNAPSHOT_DIR") or Path.home() / ".hanwoo" / "snapshots")
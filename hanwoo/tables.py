@@ -0,0 +1,88 @@
+"""비용/매출 기준표와 집계 함수"""
+from __future__ import annotations
+
+import math
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+COST_ITEMS: tuple[str, ...] = (
+    "사료비", "수도광열비", "방역치료비", "자동차비", "농구비", "영농시설비", "기타재료비", "종부료",
+    "차입금이자", "토지임차료", "고용노동비", "분뇨처리비", "생산관리비", "기타비용",
+    "자가노동비", "자본용역비", "토지용역비",
+)
+
+GRADES: tuple[str, ...] = ("1++A", "1++B", "1++C", "1+A", "1+B", "1+C", "1A", "1B", "1C", "2A", "2B", "2C", "3A", "3B", "3C", "D")
+
+OPPORTUNITY_ITEMS: set[str] = {"자가노동비", "자본용역비", "토지용역비"}
+
+# [비용 데이터] - 천원 단위 적용 (기존 값 / 1000)
+_COST_BREED = [1500, 140, 110, 80, 50, 40, 30, 50, 60, 5, 20, 10, 20, 30, 800, 200, 50]
+_COST_FATTEN = [2300, 140, 80, 80, 50, 40, 30, 0, 60, 5, 20, 20, 20, 30, 600, 150, 50]
+
+# [매출 데이터]
+_COW = {
+    "Ratio(%)": [5, 5, 5, 10, 10, 10, 10, 10, 10, 5, 5, 5, 2, 2, 1, 5],
+    "Price(KRW/kg)": [25000, 24000, 23000, 21000, 20000, 19000, 18000, 17000, 16000, 14000, 13000, 12000, 10000, 9000, 8000, 5000],
+    "Weight(kg)": [350] * 16,
+}
+_STEER = {
+    "Ratio(%)": [10, 10, 5, 15, 15, 5, 10, 10, 5, 5, 5, 2, 1, 1, 0, 1],
+    "Price(KRW/kg)": [29000, 28000, 27000, 25000, 24000, 23000, 21000, 20000, 19000, 17000, 16000, 15000, 13000, 12000, 11000, 8000],
+    "Weight(kg)": [450] * 16,
+}
+
+def default_cost_tables() -> tuple[pd.DataFrame, pd.DataFrame]:
+    """기본 (번식우, 비육우) 유지비 표"""
+    import pandas as pd
+    breed = pd.DataFrame({"항목": list(COST_ITEMS), "금액(천원/년)": list(_COST_BREED)})
+    fatten = pd.DataFrame({"항목": list(COST_ITEMS), "금액(천원/년)": list(_COST_FATTEN)})
+    return breed, fatten
+
+def default_grade_tables() -> tuple[pd.DataFrame, pd.DataFrame]:
+    """기본 (암비육우, 수비육우) 등급별 매출 표"""
+    import pandas as pd
+    cow = pd.DataFrame({"Grade": list(GRADES), **{k: list(v) for k, v in _COW.items()}})
+    steer = pd.DataFrame({"Grade": list(GRADES), **{k: list(v) for k, v in _STEER.items()}})
+    return cow, steer
+
+def _get_amount_series(df: pd.DataFrame) -> pd.Series:
+    match '금액(천원/년)' in df.columns:
+        case True:
+            return df['금액(천원/년)'] * 1000
+        case False:
+            return df['금액(원/년)']
+
+FEED_ITEM = "사료비"
+
+def exact_sum(values) -> float:
+    """정확히 반올림한 합 (math.fsum, 유한하지 않은 값·빈 칸은 건너뜀).
+
+    합산 순서와 무관하므로 aggregates 의 증분 합계 (정확한 유리수 누적) 와 비트 단위로 같다.
+    """
+    import numpy as np
+    arr = np.asarray(values, dtype=np.float64)
+    return math.fsum(arr[np.isfinite(arr)].tolist())
+
+def calculate_cost_from_table(df: pd.DataFrame, mode: str = "경영비", feed_cost: float | None = None) -> float:
+    """표의 연간 비용 합계 (원). feed_cost 를 주면 사료비 행 금액 대신 그 값 (사료 배합 결과, 원/년) 을 쓴다."""
+    amounts = _get_amount_series(df)
+    if feed_cost is not None:
+        amounts = amounts.where(df['항목'] != FEED_ITEM, feed_cost)
+    match mode:
+        case "경영비":
+            mask = ~df['항목'].isin(OPPORTUNITY_ITEMS)
+            return exact_sum(amounts[mask])
+        case "생산비" | _:
+            return exact_sum(amounts)
+
+def calculate_opportunity_cost(df: pd.DataFrame) -> float:
+    amounts  = _get_amount_series(df)
+    mask     = df['항목'].isin(OPPORTUNITY_ITEMS)
+    return exact_sum(amounts[mask])
+
+def calculate_avg_price(df: pd.DataFrame) -> int:
+    return int(
+        exact_sum(df["Ratio(%)"] / 100 * df["Price(KRW/kg)"] * df["Weight(kg)"])
+    )
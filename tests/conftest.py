@@ -0,0 +1,33 @@
+"""테스트에서 저장소 루트의 hanwoo 패키지를 import 할 수 있게 하고, 여러 파일이 쓰는 무작위 농장 입력을 둔다"""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from hanwoo.scenario import default_farm_args  # noqa: E402
+
+N_FARMS = 200
+
+@pytest.fixture(scope="module")
+def farms() -> dict:
+    """기본 입력 주변의 무작위 농장 (두수는 정수·실수 섞어 절삭 경로도 확인)"""
+    rng = np.random.default_rng(42)
+    base = default_farm_args()
+    out = {k: np.full(N_FARMS, float(v)) for k, v in base.items()}
+    out |= {
+        "base_cows": rng.integers(1, 400, N_FARMS).astype(float), "conception_rate": rng.uniform(0.0, 1.0, N_FARMS),
+        "female_birth_ratio": rng.uniform(0.3, 0.7, N_FARMS), "annual_culls": rng.uniform(0, 60, N_FARMS),
+        "female_fatten_in": rng.integers(0, 40, N_FARMS).astype(float), "female_fatten_out": rng.integers(0, 40, N_FARMS).astype(float),
+        "male_fatten_in": rng.uniform(0, 60, N_FARMS), "male_fatten_out": rng.uniform(0, 60, N_FARMS), "kpn_male": rng.integers(0, 20, N_FARMS).astype(float),
+        "female_calf_sell": rng.integers(0, 20, N_FARMS).astype(float), "male_calf_sell": rng.uniform(0, 20, N_FARMS),
+        "female_loss": rng.integers(0, 5, N_FARMS).astype(float), "male_loss": rng.integers(0, 5, N_FARMS).astype(float),
+        "loss_months": rng.integers(0, 12, N_FARMS).astype(float), "kpn_exit_months": rng.integers(0, 12, N_FARMS).astype(float),
+        "price_calf_female": rng.uniform(1e6, 4e6, N_FARMS), "price_calf_male": rng.uniform(2e6, 6e6, N_FARMS),
+        "price_fatten_female": rng.uniform(5e6, 12e6, N_FARMS), "price_fatten_male": rng.uniform(7e6, 14e6, N_FARMS),
+        "cow_cost_y": rng.uniform(1e6, 3e6, N_FARMS), "cost_fatten_avg_y": rng.uniform(2e6, 5e6, N_FARMS),
+        "ext_buy_n": rng.integers(0, 100, N_FARMS).astype(float), "by_product_income_cow": rng.uniform(0, 2e5, N_FARMS),
+    }
+    return out
@@ -0,0 +1,78 @@
+"""증분 집계: 무작위 셀 편집·되돌리기 후에도 전체 재계산과 비트 단위로 같은지 (검증 모드 포함)"""
+import numpy as np
+import pytest
+
+from hanwoo.aggregates import COST_TABLES, GRADE_COLUMNS, TableAggregates
+from hanwoo.overlay import SharedTables
+from hanwoo.tables import FEED_ITEM, OPPORTUNITY_ITEMS, calculate_cost_from_table, default_cost_tables, default_grade_tables
+
+EDITS = 3_000
+ITEMS = (FEED_ITEM, *sorted(OPPORTUNITY_ITEMS), "기타 비용", None)
+
+@pytest.fixture
+def tables() -> SharedTables:
+    breed, fatten = default_cost_tables()
+    cow, steer = default_grade_tables()
+    return SharedTables({"df_cost_breed": breed, "df_cost_fatten": fatten, "df_cow": cow, "df_steer": steer})
+
+def _value(rng):
+    """편집 값: 정수·소수·큰 값·음수·NaN·None"""
+    match rng.integers(0, 7):
+        case 0:
+            return None
+        case 1:
+            return float("nan")
+        case 2:
+            return float(rng.uniform(-1e3, 1e3))
+        case 3:
+            return float(rng.uniform(0, 1e12))
+        case _:
+            return int(rng.integers(0, 5_000))
+
+def _fuzz(tables, agg, rng, edits):
+    """무작위 편집·되돌리기를 edits 번 적용하며 매번 (표 이름, 변경분) 을 돌려준다"""
+    deltas = {name: {} for name in tables.names()}
+    for _ in range(edits):
+        name = tables.names()[rng.integers(0, 4)]
+        delta = dict(deltas[name])
+        n_rows = len(tables.base(name))
+        if delta and rng.random() < 0.25:
+            del delta[list(delta)[rng.integers(0, len(delta))]]  # 되돌리기
+        elif name in COST_TABLES and rng.random() < 0.3:
+            delta[(int(rng.integers(0, n_rows)), "항목")] = ITEMS[rng.integers(0, len(ITEMS))]
+        else:
+            col = "금액(천원/년)" if name in COST_TABLES else GRADE_COLUMNS[rng.integers(0, 3)]
+            delta[(int(rng.integers(0, n_rows)), col)] = _value(rng)
+        deltas[name] = delta
+        yield name, delta
+
+def test_random_edits_match_full_recompute(tables):
+    rng = np.random.default_rng(7)
+    agg = TableAggregates(tables)
+    for name, delta in _fuzz(tables, agg, rng, EDITS):
+        assert agg.mismatches(name, delta) == {}
+        if name in COST_TABLES and rng.random() < 0.1:
+            feed, mode = float(rng.uniform(0, 5e6)), ("경영비", "생산비")[rng.integers(0, 2)]
+            assert agg.cost(name, delta, mode, feed) == calculate_cost_from_table(tables.frame(name, delta), mode, feed)
+    assert agg.rebuilds == 4
+
+def test_verify_mode_checks_every_change(tables):
+    agg = TableAggregates(tables, verify=True)
+    for name, delta in _fuzz(tables, agg, np.random.default_rng(11), 300):
+        agg.cost(name, delta) if name in COST_TABLES else agg.avg_price(name, delta)
+    assert 0 < agg.checks <= 300
+
+def test_reverting_all_edits_restores_base_totals(tables):
+    agg = TableAggregates(tables)
+    base = agg.cost("df_cost_breed", None, "생산비"), agg.avg_price("df_cow", None)
+    agg.cost("df_cost_breed", {(0, "금액(천원/년)"): 9_999, (1, "항목"): FEED_ITEM}, "생산비")
+    agg.avg_price("df_cow", {(2, "Ratio(%)"): float("nan"), (3, "Weight(kg)"): None})
+    assert (agg.cost("df_cost_breed", {}, "생산비"), agg.avg_price("df_cow", {})) == base
+
+def test_whole_frame_delta_rebuilds(tables):
+    agg = TableAggregates(tables, verify=True)
+    frame = tables.base("df_steer").iloc[:5].assign(**{"Ratio(%)": [40, 30, 20, 5, 5]})
+    agg.avg_price("df_steer", {(0, "Ratio(%)"): 7})
+    assert agg.mismatches("df_steer", {"frame": frame}) == {}
+    assert agg.mismatches("df_steer", {(1, "Price(KRW/kg)"): 30_000}) == {}
+    assert agg.rebuilds == 3
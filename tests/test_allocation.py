@@ -0,0 +1,51 @@
+"""송아지 분배 최적화: 제약 충족, 교체율별 최대 순이익 곡선, 번식우 수 절삭"""
+import numpy as np
+import pytest
+
+from hanwoo.allocation import DECISION_KEYS, _net_coefficients, optimize_allocation
+from hanwoo.scenario import compute_scenario_batch, default_farm_args
+
+def _feasible(params, alloc, repl_range):
+    born = int(params["base_cows"]) * params["conception_rate"]
+    female, male = born * params["female_birth_ratio"], born * (1 - params["female_birth_ratio"])
+    assert alloc["annual_culls"] + alloc["female_calf_sell"] + alloc["female_fatten_in"] <= female - params["female_loss"] + 1e-9
+    assert alloc["kpn_male"] + alloc["male_calf_sell"] + alloc["male_fatten_in"] <= male - params["male_loss"] + 1e-9
+    assert alloc["female_fatten_out"] <= alloc["female_fatten_in"] and alloc["male_fatten_out"] <= alloc["male_fatten_in"]
+    assert repl_range[0] <= alloc["annual_culls"] / int(params["base_cows"]) * 100 <= repl_range[1]
+    assert all(alloc[k] >= 0 for k in DECISION_KEYS)
+
+@pytest.mark.parametrize("overrides", [{}, {"female_loss": 2, "male_loss": 3}, {"price_fatten_female": 1e6, "price_calf_female": 4e6}])
+def test_optimum_is_feasible_and_beats_input_allocation(overrides):
+    params = default_farm_args() | overrides
+    opt = optimize_allocation(params, (5.0, 30.0))
+    _feasible(params, opt["alloc"], (5.0, 30.0))
+    assert opt["alloc"]["kpn_male"] == params["kpn_male"]
+    assert opt["Net Final"] >= compute_scenario_batch(params)["Net Final"] - 1e-6
+    # 선형 계수로 본 값과 compute_scenario 재평가가 같아야 한다
+    const, coef = _net_coefficients(params)
+    x = np.array([opt["alloc"][k] for k in DECISION_KEYS], dtype=float)
+    assert const + coef @ x == pytest.approx(opt["Net Final"], rel=1e-9)
+
+def test_profile_is_max_profit_per_repl_rate():
+    params = default_farm_args()
+    opt = optimize_allocation(params, (5.0, 30.0))
+    profile = opt["profile"]
+    assert profile["annual_culls"].is_monotonic_increasing and profile["annual_culls"].is_unique
+    assert profile["annual_culls"].between(5, 30).all()
+    # 곡선의 최댓값 = 전체 최적값, 각 점은 해당 도태 두수에서 다시 푼 값과 같다
+    assert profile["Net Final"].max() == pytest.approx(opt["Net Final"], rel=1e-9)
+    row = profile.iloc[len(profile) // 2]
+    fixed = optimize_allocation(params, (row["repl_rate"], row["repl_rate"]), profile_points=0)
+    assert fixed["Net Final"] == pytest.approx(row["Net Final"], rel=1e-9)
+    assert "profile" not in fixed
+
+def test_fractional_base_cows_uses_clamped_herd_size():
+    # 100두 x 0.7 x 0.4986 = 34.9 마리, 절삭 전 100.9두로 계산하면 35.2 마리가 되어 한 마리가 더 분배된다
+    params = default_farm_args() | {"base_cows": 100, "conception_rate": 0.7, "female_birth_ratio": 0.4986}
+    whole, frac = optimize_allocation(params, (5.0, 30.0)), optimize_allocation(params | {"base_cows": 100.9}, (5.0, 30.0))
+    assert whole["alloc"] == frac["alloc"]
+    _feasible(params | {"base_cows": 100.9}, frac["alloc"], (5.0, 30.0))
+
+def test_infeasible_range_raises():
+    with pytest.raises(ValueError):
+        optimize_allocation(default_farm_args(), (60.0, 60.5))
@@ -0,0 +1,37 @@
+"""내용 해시와 LRU 메모이제이션"""
+import numpy as np
+import pandas as pd
+
+from hanwoo.cache import LRUCache, memoize, stable_hash
+
+def test_stable_hash_follows_content():
+    df = pd.DataFrame({"등급": ["1++", "1+"], "Ratio(%)": [10.0, 20.0]})
+    assert stable_hash(df, {"a": 1, "b": np.arange(3)}) == stable_hash(df.copy(), {"b": np.arange(3), "a": 1})
+    assert stable_hash(df) != stable_hash(df.assign(**{"Ratio(%)": [10.0, 20.5]}))
+    assert stable_hash(1) != stable_hash(1.0) != stable_hash("1")
+    assert stable_hash([1, 2]) != stable_hash([[1, 2]])
+
+def test_lru_evicts_least_recent():
+    cache = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.get("b", None) is None and cache.get("a") == 1
+    assert cache.stats() | {"hit_rate": 0} == {"size": 2, "maxsize": 2, "hits": 2, "misses": 1, "evictions": 1, "hit_rate": 0}
+
+def test_memoize_reuses_result_by_content():
+    calls = []
+
+    @memoize(4, "tests.square")
+    def square(x):
+        calls.append(x)
+        return x * x
+
+    square.cache_clear()
+    assert square(np.arange(3)).tolist() == [0, 1, 4]
+    assert square(np.arange(3)).tolist() == [0, 1, 4]
+    assert square(np.arange(4)).tolist() == [0, 1, 4, 9]
+    assert len(calls) == 2 and square.cache.hits == 1
+    square.cache_clear()
+    assert square(np.arange(3)).tolist() == [0, 1, 4] and len(calls) == 3
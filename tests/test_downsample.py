@@ -0,0 +1,84 @@
+"""차트 축약: LTTB·최소최대의 끝점·크기 불변식, SeriesFrame 행 수 상한과 줌 캐시"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from hanwoo.downsample import DOWNSAMPLE_METHODS, MIN_POINTS, SeriesFrame, lttb_indices, minmax_indices
+
+@pytest.mark.parametrize("n, n_out", [(1, 5), (2, 2), (10, 10), (10, 11), (1000, 2), (1000, 3), (1000, 50), (997, 600)])
+def test_lttb_size_and_endpoints(n, n_out):
+    rng = np.random.default_rng(n + n_out)
+    x, y = np.sort(rng.uniform(0, 100, n)), rng.normal(size=n).cumsum()
+    idx = lttb_indices(x, y, n_out)
+    assert idx.size == min(n, n_out) or (n <= 2 and idx.size == n)
+    assert idx[0] == 0 and idx[-1] == n - 1 and (np.diff(idx) > 0).all()
+
+def test_lttb_picks_largest_triangle_per_bucket():
+    rng = np.random.default_rng(1)
+    n, n_out = 500, 40
+    x, y = np.arange(n, dtype=float), rng.normal(size=n).cumsum()
+    idx = lttb_indices(x, y, n_out)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        a = idx[i]
+        nxt = (x[edges[i + 1]:edges[i + 2]].mean(), y[edges[i + 1]:edges[i + 2]].mean()) if i < n_out - 3 else (x[-1], y[-1])
+        area = [abs((x[a] - nxt[0]) * (y[j] - y[a]) - (x[a] - x[j]) * (nxt[1] - y[a])) for j in range(lo, hi)]
+        assert idx[i + 1] == lo + int(np.argmax(area))
+    # 뾰족한 이상값은 반드시 남는다
+    y[250] = 1e3
+    assert 250 in lttb_indices(x, y, n_out)
+
+def test_minmax_keeps_extremes_and_endpoints():
+    rng = np.random.default_rng(2)
+    code = np.repeat([0, 1, 2], [400, 7, 900])
+    x = np.concatenate([np.sort(rng.uniform(0, 10, k)) for k in (400, 7, 900)])
+    y = rng.normal(size=code.size)
+    n_buckets = 16
+    idx = minmax_indices(code, x, y, 0.0, 10.0, n_buckets)
+    assert (np.diff(idx) > 0).all()
+    for s in range(3):
+        rows = np.flatnonzero(code == s)
+        kept = np.intersect1d(idx, rows)
+        assert kept.size <= 2 * n_buckets + 2
+        assert {rows[0], rows[-1], rows[np.argmin(y[rows])], rows[np.argmax(y[rows])]} <= set(kept)
+        b = np.clip((x[rows] / 10 * n_buckets).astype(int), 0, n_buckets - 1)
+        for k in np.unique(b):
+            in_b = rows[b == k]
+            assert in_b[np.argmin(y[in_b])] in kept and in_b[np.argmax(y[in_b])] in kept
+    assert minmax_indices([], [], [], 0, 1, 4).size == 0
+
+@pytest.fixture(scope="module")
+def trajectories():
+    rng = np.random.default_rng(3)
+    n_series, n_months = 30, 600
+    df = pd.DataFrame({"Scenario": np.repeat([f"S{i}" for i in range(n_series)], n_months),
+                       "Year": np.tile(np.arange(1, n_months + 1) / 12, n_series),
+                       "Value": rng.normal(0, 1e6, n_series * n_months).cumsum()})
+    return df.sample(frac=1.0, random_state=0)  # 정렬 안 된 입력
+
+@pytest.mark.parametrize("method", list(DOWNSAMPLE_METHODS))
+@pytest.mark.parametrize("x_range", [None, (10, 20), (49.9, 50)])
+def test_view_row_cap_and_series_endpoints(trajectories, method, x_range):
+    sf = SeriesFrame(trajectories, x="Year", method=method, max_rows=2_000)
+    view = sf.view(x_range)
+    assert len(view) <= max(sf.max_rows, len(sf.names) * MIN_POINTS)
+    assert set(view["Scenario"]) == set(sf.names)
+    lo, hi = (1 / 12, 50) if x_range is None else x_range
+    for name, g in view.groupby("Scenario"):
+        src = trajectories[trajectories["Scenario"] == name].sort_values("Year")
+        assert g["Year"].is_monotonic_increasing
+        # 보이는 구간을 덮는다: 양끝이 구간 경계 또는 그 바깥 한 행까지
+        assert g["Year"].iloc[0] <= max(lo, src["Year"].iloc[0]) + (1 if method == "mean" else 0)
+        assert g["Year"].iloc[-1] >= min(hi, src["Year"].iloc[-1]) - (1 if method == "mean" else 0)
+        if method != "mean":
+            assert g["Value"].isin(src["Value"]).all()  # 원본 행만 고른다
+
+def test_small_window_is_returned_unreduced_and_cached(trajectories):
+    sf = SeriesFrame(trajectories, x="Year", max_rows=100_000)
+    full = sf.view()
+    assert len(full) == len(trajectories)
+    first = sf.view((10, 20))
+    assert sf.view((10.01, 19.99)) is first and sf.cache.hits >= 1
+    with pytest.raises(ValueError):
+        SeriesFrame(trajectories, x="Year", method="median")
@@ -0,0 +1,68 @@
+"""보고서 내보내기: 형식별로 청크를 이어 쓴 행 수와 값이 한 번에 계산한 표와 같은지"""
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import hanwoo.export as export
+from hanwoo.export import EXPORT_FORMATS, export_report
+from hanwoo.report import LINE_ITEMS, line_items_frame
+from hanwoo.scenario import SCENARIO_ARGS, compute_scenario_batch, default_farm_args
+
+N_SCENARIOS = 1_234
+
+@pytest.fixture(scope="module")
+def source():
+    rng = np.random.default_rng(11)
+    return pd.DataFrame({"id": np.arange(N_SCENARIOS) * 10, "base_cows": rng.integers(20, 300, N_SCENARIOS),
+                         "annual_culls": rng.integers(0, 40, N_SCENARIOS), "male_fatten_out": rng.integers(0, 30, N_SCENARIOS)})
+
+def _expected(source, layout):
+    args = default_farm_args()
+    batch = compute_scenario_batch({k: (source[k].to_numpy() if k in source else args[k]) for k in SCENARIO_ARGS})
+    return line_items_frame(batch, ids=source["id"].to_numpy(), layout=layout)
+
+def _read(buf, fmt):
+    buf.seek(0)
+    match fmt:
+        case "csv":
+            assert buf.read(3) == "\ufeff".encode()  # UTF-8 BOM
+            buf.seek(0)
+            return pd.read_csv(buf, encoding="utf-8-sig")
+        case "parquet":
+            return pd.read_parquet(buf)
+        case "xlsx":
+            sheets = pd.read_excel(buf, sheet_name=None)
+            return pd.concat(sheets.values(), ignore_index=True)
+
+@pytest.mark.parametrize("fmt", list(EXPORT_FORMATS))
+@pytest.mark.parametrize("layout", ["wide", "long"])
+def test_chunked_export_row_counts_and_values(source, fmt, layout):
+    buf = io.BytesIO()
+    rows = export_report(source, buf, fmt, layout=layout, chunk_size=500, defaults=default_farm_args())
+    expected = _expected(source, layout)
+    assert rows == len(expected) == len(source) * (1 if layout == "wide" else len(LINE_ITEMS))
+    got = _read(buf, fmt)
+    assert list(got.columns) == [str(c) for c in expected.columns] and len(got) == rows
+    num = expected.select_dtypes("number").columns
+    np.testing.assert_allclose(got[num].to_numpy(dtype=float), expected[num].to_numpy(dtype=float), rtol=1e-12)
+
+def test_xlsx_continues_on_next_sheet(source, monkeypatch):
+    monkeypatch.setattr(export, "XLSX_MAX_ROWS", 100)
+    buf = io.BytesIO()
+    rows = export_report(source.iloc[:250], buf, "xlsx", chunk_size=64, defaults=default_farm_args())
+    sheets = pd.read_excel(buf, sheet_name=None)
+    assert rows == 250 and [len(s) for s in sheets.values()] == [99, 99, 52]  # 머리글 포함 시트당 100행
+    assert list(pd.concat(sheets.values())["id"]) == list(source["id"].iloc[:250])
+
+@pytest.mark.parametrize("fmt", list(EXPORT_FORMATS))
+def test_export_to_path_and_empty_source(source, fmt, tmp_path):
+    path = tmp_path / f"report{EXPORT_FORMATS[fmt][1]}"
+    assert export_report(source.iloc[:37], path, defaults=default_farm_args()) == 37
+    assert len(_read(io.BytesIO(path.read_bytes()), fmt)) == 37
+    assert export_report(source.iloc[:0], io.BytesIO(), fmt, defaults=default_farm_args()) == 0
+
+def test_missing_input_column_is_named(source):
+    with pytest.raises(KeyError, match="cow_cost_y"):
+        export_report(source, io.BytesIO(), "csv")
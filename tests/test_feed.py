@@ -0,0 +1,22 @@
+"""사료 배합: 편집기에서 빈 칸이 생겨도 예외 없이 풀리는지"""
+import math
+
+import numpy as np
+
+from hanwoo.feed import default_feed_tables, ration_costs, solve_rations
+
+def test_blank_cells_do_not_raise():
+    feeds, stages = default_feed_tables()
+    feeds.loc[0, "TDN(%)"] = np.nan
+    feeds.loc[1, "최대(%)"] = np.nan
+    stages.loc[1, "TDN 최소(%)"] = np.nan
+    result = solve_rations.__wrapped__(feeds, stages)
+    assert result["missing"].tolist() == [False, True, False, False]
+    assert result["feasible"][0].tolist() == [True, False, True, True]
+    costs = ration_costs.__wrapped__(feeds, stages)
+    assert math.isfinite(costs["번식우"]) and math.isnan(costs["비육우"])
+
+def test_inconsistent_bounds_are_infeasible():
+    feeds, stages = default_feed_tables()
+    feeds.loc[0, ["최소(%)", "최대(%)"]] = (80, 10)
+    assert not solve_rations.__wrapped__(feeds, stages)["feasible"].any()
@@ -0,0 +1,17 @@
+"""다세대 개량 전망: 선발 강도 경계값과 대체우 부족 표시"""
+import numpy as np
+
+from hanwoo.genetics import genetic_gain_frames, project_genetic_gain, selection_intensity
+from hanwoo.scenario import default_farm_args
+
+WEIGHTS = {"CW": 18564, "MS": 591204, "EMA": 9163, "BFT": -57237}
+
+def test_selection_intensity_bounds():
+    i = selection_intensity([0.0, 0.5, 1.0, 1.5])
+    assert i[0] == 0 and i[2] == 0 and i[3] == 0
+    assert np.isclose(i[1], 0.7978845608)
+
+def test_infeasible_replacement_rates_are_flagged():
+    summary, _ = genetic_gain_frames(project_genetic_gain(default_farm_args(), WEIGHTS, [0.0, 0.1, 0.5], years=5))
+    assert summary["선발 강도"].iloc[0] == 0
+    assert summary["대체우 충분"].tolist() == [True, True, False]
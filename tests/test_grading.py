@@ -0,0 +1,73 @@
+"""등급판정 색인: 청크·압축 경로와 기간·농가 조회를 pandas groupby 와 비교"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from hanwoo.grading import N_GRADES, SEX_ALIASES, build_grade_index
+from hanwoo.tables import GRADES
+
+N_ROWS = 3_000
+
+@pytest.fixture(scope="module")
+def records() -> pd.DataFrame:
+    """한글 컬럼명·성별 별칭에 무효 행 (등급 오기, 도체중 0/결측, 날짜 오류) 을 섞은 판정 자료"""
+    rng = np.random.default_rng(7)
+    df = pd.DataFrame({
+        "판정일자": (pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 400, N_ROWS), unit="D")).strftime("%Y-%m-%d"),
+        "농가번호": rng.choice(["F01", "F02", "F03", "F04", "F05"], N_ROWS),
+        "성별": rng.choice(["암", "수", "거세", "cow", "F", "M"], N_ROWS),
+        "등급": rng.choice(list(GRADES), N_ROWS),
+        "도체중": rng.uniform(280, 520, N_ROWS).round(1),
+        "경락단가": rng.integers(8_000, 26_000, N_ROWS).astype(float),
+    })
+    bad = rng.choice(N_ROWS, 120, replace=False)
+    df.loc[bad[:30], "등급"] = "1+++"
+    df.loc[bad[30:60], "도체중"] = 0.0
+    df.loc[bad[60:90], "경락단가"] = np.nan
+    df.loc[bad[90:], "판정일자"] = "not-a-date"
+    return df
+
+def _expected(df, start=None, end=None, farms=None) -> np.ndarray:
+    """(성별, 등급, [두수, 도체중 합, 매출 합]) 을 pandas 로 직접 집계"""
+    d = df.assign(date=pd.to_datetime(df["판정일자"], errors="coerce"), sex=df["성별"].map(SEX_ALIASES),
+                  grade=df["등급"].map({g: i for i, g in enumerate(GRADES)}).fillna(-1).astype(int), revenue=df["도체중"] * df["경락단가"])
+    d = d[d["date"].notna() & (d["grade"] >= 0) & (d["도체중"] > 0) & d["경락단가"].notna()]
+    if start is not None:
+        d = d[d["date"] >= pd.Timestamp(start)]
+    if end is not None:
+        d = d[d["date"] <= pd.Timestamp(end)]
+    if farms is not None:
+        d = d[d["농가번호"].isin(farms)]
+    g = d.groupby(["sex", "grade"]).agg(n=("도체중", "size"), w=("도체중", "sum"), r=("revenue", "sum"))
+    out = np.zeros((2, N_GRADES, 3))
+    out[g.index.get_level_values(0), g.index.get_level_values(1)] = g.to_numpy()
+    return out
+
+@pytest.fixture(scope="module")
+def index(records):
+    # 300행 청크, 누적 600행마다 압축: 청크 사이에서 같은 (농가, 일자, 칸) 키가 합쳐지는 경로를 지난다
+    return build_grade_index((records.iloc[i:i + 300] for i in range(0, N_ROWS, 300)), compact_rows=600)
+
+def test_chunked_and_compacted_index_matches_single_pass(records, index):
+    whole = build_grade_index(records)
+    assert index.skipped == whole.skipped == 120
+    np.testing.assert_array_equal(index.farm, whole.farm)
+    np.testing.assert_array_equal(index.day, whole.day)
+    np.testing.assert_allclose(index.values, whole.values, rtol=1e-12)
+
+@pytest.mark.parametrize("start, end, farms", [
+    (None, None, None), ("2024-03-01", "2024-09-30", None), ("2024-06-15", "2024-06-15", None), ("2025-06-01", None, None),
+    (None, None, ["F02"]), ("2024-02-10", "2024-11-20", ["F01", "F04", "없는 농가"]), ("2024-05-01", "2024-04-01", ["F03"]),
+])
+def test_query_matches_groupby(records, index, start, end, farms):
+    np.testing.assert_allclose(index.query(start, end, farms), _expected(records, start, end, farms), rtol=1e-9, atol=1e-6)
+
+def test_grade_tables_from_groupby(records, index):
+    exp = _expected(records, "2024-01-01", "2024-06-30", ["F05"])
+    cow, steer = index.grade_tables("2024-01-01", "2024-06-30", ["F05"])
+    for sex, table in enumerate((cow, steer)):
+        n, w, r = exp[sex, :, 0], exp[sex, :, 1], exp[sex, :, 2]
+        np.testing.assert_allclose(table["Ratio(%)"], n / n.sum() * 100, rtol=1e-12)
+        has = n > 0
+        np.testing.assert_allclose(table["Price(KRW/kg)"][has], np.round(r[has] / w[has]))
+        np.testing.assert_allclose(table["Weight(kg)"][has], np.round(w[has] / n[has], 1))
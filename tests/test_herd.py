@@ -0,0 +1,40 @@
+"""축군 시뮬레이션: 공통육성 기간과 맞지 않는 폐사·출하 월령, 정상상태 연간 값과 compute_scenario 의 일치"""
+import numpy as np
+
+from hanwoo.herd import herd_annual_frame, simulate_herd
+from hanwoo.scenario import SCENARIO_ARGS, compute_scenario, default_farm_args
+
+def _run(**overrides):
+    args = default_farm_args() | {"female_loss": 3, "male_loss": 2, "calf_common_months": 6} | overrides
+    return simulate_herd(args, years=3)
+
+def test_loss_after_common_rearing_is_applied_at_its_end():
+    late, at_end, none = _run(loss_months=10), _run(loss_months=6), _run(female_loss=0, male_loss=0)
+    # 폐사 비용의 사육 기간은 입력한 폐사 월령 그대로 (compute_scenario 와 같음), 두수 흐름만 공통육성 종료 시점으로
+    np.testing.assert_array_equal(late["revenue"], at_end["revenue"])
+    np.testing.assert_array_equal(late["calves"], at_end["calves"])
+    assert (late["revenue"] < none["revenue"]).all()
+
+def test_early_shipping_age_still_ships():
+    early, next_month = _run(ship_m_female=4, ship_m_male=5), _run(ship_m_female=7, ship_m_male=7)
+    np.testing.assert_array_equal(early["shipped"], next_month["shipped"])
+    assert early["shipped"].min() > 0 and early["fatten"].max() < 1e4
+
+FEASIBLE = [
+    {},
+    {"female_loss": 3, "male_loss": 2, "annual_culls": 12, "female_calf_sell": 3, "male_calf_sell": 2, "male_fatten_in": 20, "male_fatten_out": 19, "kpn_exit_months": 8},
+    {"base_cows": 250, "conception_rate": 0.8, "annual_culls": 40, "female_fatten_in": 50, "female_fatten_out": 48, "male_fatten_in": 80,
+     "male_fatten_out": 80, "kpn_male": 15, "ship_m_female": 28, "ship_m_male": 31, "heifer_nonprofit_months": 14, "by_product_income_cow": 1e5},
+]
+
+def test_steady_state_year_matches_compute_scenario():
+    # 분배가 생산 두수 안에 들면 워밍업 뒤의 매년 수입·비용·순이익은 compute_scenario 의 연간 값과 같다 (부동소수 합산 오차 rel 1e-9)
+    args = [default_farm_args() | ov for ov in FEASIBLE]
+    annual = herd_annual_frame(simulate_herd({k: [a[k] for a in args] for k in SCENARIO_ARGS}, years=3))
+    for i, a in enumerate(args):
+        res = compute_scenario(f"S{i + 1}", **a)
+        rows = annual[annual["Scenario"] == f"S{i + 1}"]
+        np.testing.assert_allclose(rows["Value"], res["Net Final"], rtol=1e-9)
+        np.testing.assert_allclose(rows["Revenue"], res["Rev Final"], rtol=1e-9)
+        np.testing.assert_allclose(rows["Cost"], res["Cost Final"], rtol=1e-9)
+        np.testing.assert_allclose(rows["Cows"], a["base_cows"], rtol=1e-9)
@@ -0,0 +1,43 @@
+"""단항식으로 컴파일한 모델이 단건 compute_scenario 와 같은 값을 내고, 손익분기 입력값에서 순이익이 0 인지"""
+import numpy as np
+import pytest
+
+from hanwoo.linear import BREAK_EVEN_TARGETS, CompiledScenario, break_even
+from hanwoo.scenario import SCENARIO_ARGS, compute_scenario, compute_scenario_batch
+
+def _scalar(farms: dict, i: int) -> dict:
+    return compute_scenario(f"S{i}", **{k: farms[k][i].item() for k in SCENARIO_ARGS})
+
+def test_compiled_matches_scalar(farms):
+    model = CompiledScenario(farms)
+    net = model.value("Net Final")
+    expected = np.array([_scalar(farms, i)["Net Final"] for i in range(len(net))])
+    np.testing.assert_allclose(net, expected, rtol=1e-12, atol=1e-6)
+
+@pytest.mark.parametrize("target", list(BREAK_EVEN_TARGETS))
+def test_break_even_roots_zero_net(farms, target):
+    be = break_even(farms, target)
+    ok = np.isfinite(be["scale"])
+    assert ok.any()
+    moved = {k: np.where(ok, be[k], farms[k]) for k in BREAK_EVEN_TARGETS[target]}
+    net = compute_scenario_batch({**farms, **moved})["Net Final"][ok]
+    scale = np.abs(compute_scenario_batch(farms)["Rev Final"][ok]) + 1.0
+    np.testing.assert_allclose(net / scale, 0.0, atol=1e-9)
+
+def test_set_matches_recompile(farms):
+    model = CompiledScenario(farms)
+    changed = {"price_calf_male": farms["price_calf_male"] * 1.3, "conception_rate": farms["conception_rate"][::-1], "kpn_male": 7.0}
+    for k, v in changed.items():
+        model.set(k, v)
+    fresh = CompiledScenario({**farms, **changed})
+    for output in ("Rev Final", "Cost Final", "Net Final"):
+        np.testing.assert_allclose(model.value(output), fresh.value(output), rtol=1e-12, atol=1e-3)
+
+@pytest.mark.parametrize("name", ["price_fatten_male", "conception_rate", "cost_fatten_avg_y", "loss_months"])
+def test_partial_matches_finite_difference(farms, name):
+    ok = farms["conception_rate"] > 0.05
+    step = np.maximum(np.abs(farms[name]), 1.0) * 1e-6
+    up = compute_scenario_batch(farms, **{name: farms[name] + step})["Net Final"]
+    down = compute_scenario_batch(farms, **{name: farms[name] - step})["Net Final"]
+    grad = CompiledScenario(farms).partial(name)
+    np.testing.assert_allclose(grad[ok], ((up - down) / (2 * step))[ok], rtol=1e-5, atol=1e-3)
@@ -0,0 +1,59 @@
+"""공유 기준 표 + 세션 변경분: diff/frame 왕복, 편집기 변경분 반영·되돌리기, 공유 캐시"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from hanwoo.overlay import SharedTables
+from hanwoo.tables import default_cost_tables, default_grade_tables
+
+@pytest.fixture()
+def tables():
+    breed, _ = default_cost_tables()
+    cow, _ = default_grade_tables()
+    return SharedTables({"df_breed": breed, "df_cow": cow}, cache_size=4)
+
+def test_diff_frame_round_trip_random_edits(tables):
+    rng = np.random.default_rng(5)
+    base = tables.base("df_cow")
+    for _ in range(50):
+        df = base.copy()
+        for _ in range(rng.integers(0, 6)):
+            row, col = int(rng.integers(len(df))), str(rng.choice(["Ratio(%)", "Price(KRW/kg)", "Weight(kg)"]))
+            df.iloc[row, df.columns.get_loc(col)] = int(rng.integers(0, 30_000))
+        delta = tables.diff("df_cow", df)
+        assert all(df.at[r, c] != base.at[r, c] for r, c in delta)
+        pd.testing.assert_frame_equal(tables.frame("df_cow", delta), df)
+    assert tables.diff("df_cow", base.copy()) == {} and tables.frame("df_cow", {}) is base
+
+def test_apply_edits_accumulates_and_drops_reverted_cells(tables):
+    base = tables.base("df_breed")
+    col = base.columns[-1]
+    first = base[col].iat[0]
+    delta = tables.apply_edits("df_breed", None, {0: {col: first + 1}, 2: {col: 7}})
+    assert delta == {(0, col): first + 1, (2, col): 7}
+    # data_editor 는 이전 편집까지 모두 다시 보낸다: 이미 반영된 셀은 그대로, 기준값으로 돌린 셀은 변경분에서 빠진다
+    same = tables.apply_edits("df_breed", delta, {0: {col: first}, 2: {col: 7}})
+    assert same is delta and delta == {(2, col): 7}
+    assert tables.frame("df_breed", delta)[col].iat[2] == 7
+    assert tables.apply_edits("df_breed", delta, {2: {col: base[col].iat[2]}}) == {}
+
+def test_structural_change_kept_as_frame(tables):
+    df = tables.base("df_cow").iloc[:-1]
+    delta = tables.diff("df_cow", df)
+    assert set(delta) == {"frame"}
+    pd.testing.assert_frame_equal(tables.frame("df_cow", delta), df.reset_index(drop=True))
+    edited = tables.apply_edits("df_cow", delta, {0: {"Ratio(%)": 42}})
+    assert set(edited) == {"frame"} and edited["frame"].at[0, "Ratio(%)"] == 42 and delta["frame"].at[0, "Ratio(%)"] != 42
+
+def test_applied_frames_are_shared_and_isolated(tables):
+    base = tables.base("df_cow")
+    delta = {(0, "Ratio(%)"): 9}
+    shared = tables.frame("df_cow", delta)
+    assert tables.frame("df_cow", dict(delta)) is shared and tables.is_shared(shared) and tables.is_shared(base)
+    # copy-on-write: 파생 객체를 고쳐도 기준 표·캐시 표는 그대로
+    derived = shared[["Ratio(%)"]]
+    derived.iloc[1, 0] = 123
+    assert shared["Ratio(%)"].iat[1] == base["Ratio(%)"].iat[1] != 123
+    for i in range(5):
+        tables.frame("df_cow", {(1, "Ratio(%)"): i})
+    assert not tables.is_shared(shared)  # cache_size=4 를 넘어 밀려남
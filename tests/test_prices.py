@@ -0,0 +1,63 @@
+"""시세 저장소: 누적합 기반 기간 평균·전년 동월·기준일 시세를 pandas rolling/resample/asof 와 비교"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from hanwoo.prices import PriceStore
+
+@pytest.fixture(scope="module")
+def store_and_series():
+    """빈 날이 많은 두 시계열, 같은 날 중복 관측과 결측 가격 포함"""
+    rng = np.random.default_rng(3)
+    frames = []
+    for name, n in (("calf_male", 700), ("cull_cow", 250)):
+        days = pd.Timestamp("2022-01-01") + pd.to_timedelta(rng.integers(0, 1100, n), unit="D")
+        frames.append(pd.DataFrame({"date": days, "series": name, "price": rng.normal(4e6, 3e5, n).round()}))
+    df = pd.concat(frames, ignore_index=True)
+    df.loc[rng.choice(len(df), 20, replace=False), "price"] = np.nan
+    store = PriceStore.from_frame(df)
+    expected = {name: g.dropna().groupby("date")["price"].mean().sort_index() for name, g in df.groupby("series")}
+    return store, expected
+
+@pytest.mark.parametrize("name", ["calf_male", "cull_cow"])
+def test_series_averages_duplicate_days(store_and_series, name):
+    store, expected = store_and_series
+    pd.testing.assert_series_equal(store.series(name), expected[name], check_names=False, check_index_type=False, check_freq=False)
+
+@pytest.mark.parametrize("name", ["calf_male", "cull_cow"])
+@pytest.mark.parametrize("days", [1, 30, 90])
+def test_window_mean_matches_time_rolling(store_and_series, name, days):
+    # rolling("30D") 은 (t - 30일, t] 창이므로 [t - 29일, t] 와 같다
+    store, expected = store_and_series
+    s = expected[name]
+    at = s.index.to_numpy(dtype="datetime64[D]")
+    got = store.window_mean(name, at - (days - 1), at)
+    np.testing.assert_allclose(got, s.rolling(f"{days}D").mean().to_numpy(), rtol=1e-12)
+
+def test_window_mean_arbitrary_ranges(store_and_series):
+    store, expected = store_and_series
+    s = expected["cull_cow"]
+    rng = np.random.default_rng(0)
+    start = np.datetime64("2021-12-01") + rng.integers(0, 1200, 200)
+    end = start + rng.integers(-5, 120, 200)
+    want = [s.loc[a:b].mean() if b >= a else np.nan for a, b in zip(pd.to_datetime(start), pd.to_datetime(end))]
+    np.testing.assert_allclose(store.window_mean("cull_cow", start, end), want, rtol=1e-12)
+
+def test_last_months_and_same_month_last_year(store_and_series):
+    store, expected = store_and_series
+    s = expected["calf_male"]
+    at = pd.date_range("2022-02-15", "2025-02-28", freq="17D")
+    monthly = s.resample("MS").mean()
+    last_year = monthly.reindex(at.to_period("M").to_timestamp() - pd.DateOffset(months=12)).to_numpy()
+    np.testing.assert_allclose(store.same_month_last_year("calf_male", at.to_numpy()), last_year, rtol=1e-12)
+    last_3m = [s.loc[t - pd.DateOffset(months=3) + pd.Timedelta(days=1):t].mean() for t in at]
+    np.testing.assert_allclose(store.lookup("calf_male", at.to_numpy(), "last_3m"), last_3m, rtol=1e-12)
+    np.testing.assert_array_equal(store.asof("calf_male", at.to_numpy()), s.asof(at).to_numpy())
+
+def test_save_load_round_trip(store_and_series, tmp_path):
+    store, _ = store_and_series
+    store.save(tmp_path / "prices.npz")
+    loaded = PriceStore.load(tmp_path / "prices.npz")
+    assert loaded.names == store.names
+    np.testing.assert_array_equal(loaded.day, store.day)
+    np.testing.assert_array_equal(loaded.value, store.value)
@@ -0,0 +1,38 @@
+"""재실행 프로파일러: DataFrame.copy 계수는 count_copies 를 켠 실행 동안에만 pandas 를 바꾼다"""
+import pandas as pd
+
+from hanwoo.profiling import RerunProfiler, phases_frame
+
+def test_timing_alone_leaves_pandas_untouched():
+    original = pd.DataFrame.copy
+    prof = RerunProfiler(enabled=True)
+    prof.start()
+    assert pd.DataFrame.copy is original
+    with prof.phase("work"):
+        pd.DataFrame({"a": [1]}).copy()
+    run = prof.finish()
+    assert run["copies"] is None and run["phases"][0]["copies"] is None
+    assert "copy" not in phases_frame(run).columns
+
+def test_count_copies_patches_only_while_running():
+    original = pd.DataFrame.copy
+    prof = RerunProfiler(enabled=True, count_copies=True)
+    prof.start()
+    assert pd.DataFrame.copy is not original
+    with prof.phase("outer"):
+        df = pd.DataFrame({"a": [1]})
+        df.copy()
+        with prof.phase("inner"):
+            df.copy()
+    run = prof.finish()
+    assert pd.DataFrame.copy is original
+    assert run["copies"] == 2 and {p["name"]: p["copies"] for p in run["phases"]} == {"inner": 1, "outer": 2}
+    assert list(phases_frame(run)["copy"]) == [2, 1]
+
+def test_disabled_profiler_records_nothing():
+    prof = RerunProfiler(count_copies=True)
+    prof.start()
+    assert not prof.active and prof.finish() is None
+    with prof.section("frag"):
+        pass
+    assert not prof.history
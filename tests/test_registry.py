@@ -0,0 +1,40 @@
+"""개체 등록부: 빈 어미 열, 과거 기준일 재고, 색인 무효화"""
+import pandas as pd
+
+from hanwoo.registry import CALF, COW, FATTEN, HEIFER, AnimalRegistry
+
+def _inventory(**extra):
+    return pd.DataFrame({"tag": ["A1", "A2", "A3"], "birth_date": ["2019-03-01", "2022-05-01", "2023-06-01"],
+                         "sex": ["암", "암", "수"], "status": ["번식우", "대체우", "송아지"], **extra})
+
+def test_blank_dam_column():
+    reg = AnimalRegistry.from_frame(_inventory(dam=[None, None, None]))
+    assert reg.dam.tolist() == [-1, -1, -1]
+    events = pd.DataFrame({"tag": ["C1", "C2"], "date": ["2024-02-01", "2024-02-03"], "event": ["출생", "출생"],
+                           "sex": ["암", "수"], "dam": ["", None]})
+    assert reg.apply_events(events) == 2
+    assert len(reg) == 5 and reg.dam[-2:].tolist() == [-1, -1]
+
+def test_counts_at_past_date_rolls_back_status():
+    reg = AnimalRegistry.from_frame(_inventory())
+    reg.apply_events(pd.DataFrame({
+        "tag": ["N1", "A3", "A1"], "date": ["2024-03-01", "2024-04-01", "2024-05-01"], "event": ["출생", "비육 투입", "도태"],
+        "sex": ["수", None, None], "dam": ["A2", None, None],
+    }))
+    now = reg.counts()
+    assert now[COW, 0].sum() == 1 and now[HEIFER, 0].sum() == 0 and now[FATTEN, 1].sum() == 1
+    past = reg.counts(at="2024-02-15")
+    assert past[COW, 0].sum() == 1 and past[HEIFER, 0].sum() == 1 and past[CALF, 1].sum() == 1 and past[FATTEN].sum() == 0
+    assert past.sum() == 3
+    assert reg.farm_inputs(at="2024-02-15")["base_cows"] == 1
+    assert reg.farm_inputs(at="2024-04-15")["base_cows"] == 2
+    assert reg.farm_inputs()["base_cows"] == 1
+
+def test_invalidate_rebuilds_indexes_after_direct_edit():
+    reg = AnimalRegistry.from_frame(_inventory())
+    before = reg.counts()
+    assert before[HEIFER, 0].sum() == 1
+    reg.status[1] = COW  # 배열을 직접 고치면 색인이 낡으므로 invalidate 로 버린다
+    reg.invalidate()
+    after = reg.counts()
+    assert after[HEIFER, 0].sum() == 0 and after[COW, 0].sum() == 2
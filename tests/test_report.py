@@ -0,0 +1,16 @@
+"""항목별 금액 표: 항목 합계가 순이익과 같은지"""
+import numpy as np
+
+from hanwoo.report import line_items_frame, make_excel_view
+from hanwoo.scenario import compute_scenario, compute_scenario_batch, default_farm_args
+
+def test_line_items_add_up_to_net():
+    args = default_farm_args()
+    rng = np.random.default_rng(0)
+    batch = compute_scenario_batch(args, kpn_male=rng.integers(0, 30, 50), kpn_exit_months=rng.integers(0, 12, 50))
+    wide = line_items_frame(batch)
+    items = wide.drop(columns=["id", "Rev Final", "Cost Final", "Net Final"])
+    np.testing.assert_allclose(items.sum(axis=1), wide["Net Final"], rtol=1e-12)
+    view = make_excel_view(compute_scenario("기본", **args))
+    amounts = view["금액 (Amount)"]
+    assert np.isclose(amounts[view["구분"] != "결과"].sum(), amounts[view["구분"] == "결과"].iloc[0], rtol=1e-12)
@@ -0,0 +1,16 @@
+"""배치 경로가 단건 compute_scenario 와 같은 값을 내는지 (성능 변경 회귀 방지)"""
+import pytest
+
+from hanwoo.scenario import SCENARIO_ARGS, compute_scenario, compute_scenario_batch
+
+OUTPUTS = ("Rev Final", "Cost Final", "Net Final")
+
+def _scalar(farms: dict, i: int) -> dict:
+    return compute_scenario(f"S{i}", **{k: farms[k][i].item() for k in SCENARIO_ARGS})
+
+def test_batch_matches_scalar(farms):
+    batch = compute_scenario_batch(farms)
+    for i in range(len(farms["base_cows"])):
+        res = _scalar(farms, i)
+        for key in OUTPUTS:
+            assert batch[key][i] == pytest.approx(res[key], rel=1e-12, abs=1e-6), (i, key)
@@ -0,0 +1,35 @@
+"""민감도: Saltelli/Jansen 추정량을 해석해가 있는 Ishigami 함수로 확인, 모델 출력의 지수 범위"""
+import numpy as np
+import pytest
+
+from hanwoo.scenario import default_farm_args
+from hanwoo.sensitivity import SENSITIVITY_OUTPUTS, default_ranges, saltelli, sobol_indices
+
+def _ishigami(cols, a=7.0, b=0.1):
+    x1, x2, x3 = cols["x1"], cols["x2"], cols["x3"]
+    return {"y": np.sin(x1) + a * np.sin(x2) ** 2 + b * x3 ** 4 * np.sin(x1)}
+
+def _ishigami_exact(a=7.0, b=0.1):
+    v1 = 0.5 * (1 + b * np.pi ** 4 / 5) ** 2
+    v2 = a ** 2 / 8
+    v13 = b ** 2 * np.pi ** 8 * (1 / 18 - 1 / 50)
+    var = v1 + v2 + v13
+    return {"x1": (v1 / var, (v1 + v13) / var), "x2": (v2 / var, v2 / var), "x3": (0.0, v13 / var)}
+
+def test_ishigami_indices_match_analytic():
+    # S1 = (0.314, 0.442, 0), ST = (0.558, 0.442, 0.244). 2^14 표본에서 추정 오차는 seed 에 관계없이 0.005 안팎이라 0.01 로 확인
+    ranges = {x: (-np.pi, np.pi) for x in ("x1", "x2", "x3")}
+    got = saltelli(_ishigami, ranges, ["y"], n=1 << 14, seed=1).set_index("input")
+    for name, (s1, st) in _ishigami_exact().items():
+        assert got.loc[name, "S1"] == pytest.approx(s1, abs=0.01)
+        assert got.loc[name, "ST"] == pytest.approx(st, abs=0.01)
+    assert list(got.index) == ["x1", "x2", "x3"]  # ST 내림차순
+
+def test_scenario_indices_are_bounded_and_cover_outputs():
+    params = default_farm_args()
+    ranges = default_ranges(params, 0.2)
+    df = sobol_indices(params, ranges, n=1024)
+    assert set(df["output"]) == set(SENSITIVITY_OUTPUTS) and len(df) == len(ranges) * len(SENSITIVITY_OUTPUTS)
+    assert df["ST"].between(-0.05, 1.05).all() and (df["ST"] >= df["S1"] - 0.05).all()
+    # compute_scenario 는 입력 대부분에 대해 가법적이므로 순이익의 S1 합은 1 에 가깝다
+    assert df.loc[df["output"] == "Net Final", "S1"].sum() == pytest.approx(1.0, abs=0.1)
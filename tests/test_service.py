@@ -0,0 +1,114 @@
+"""평가 서비스: 배치 평가, 요청 합치기, 대기 한도 (503), 오류 응답"""
+import json
+import threading
+import time
+import urllib.request
+from urllib.error import HTTPError
+
+import pytest
+
+from hanwoo.scenario import SCENARIO_ARGS, compute_scenario, default_farm_args
+from hanwoo.service import Dispatcher, Overloaded, evaluate_payloads, make_server
+
+def _post(url: str, body) -> tuple[int, dict]:
+    data = body if isinstance(body, bytes) else json.dumps(body).encode()
+    req = urllib.request.Request(url, data=data, headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(req, timeout=10) as resp:
+            return resp.status, json.loads(resp.read())
+    except HTTPError as e:
+        return e.code, json.loads(e.read())
+
+@pytest.fixture
+def server():
+    srv = make_server(port=0, workers=0, max_wait=0.001, max_pending=8)
+    thread = threading.Thread(target=srv.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    host, port = srv.server_address[:2]
+    srv.url = f"http://{host}:{port}"
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+def test_batch_matches_scalar_and_reports_row_errors():
+    payloads = [{"inputs": {"base_cows": n, "annual_culls": n // 5}} for n in (20, 100, 300)]
+    payloads.insert(1, {"inputs": {"no_such_input": 1}})
+    payloads.append({"inputs": {"base_cows": "many"}})
+    out = evaluate_payloads(payloads)
+    assert [("result" in r, "error" in r) for r in out] == [(True, False), (False, True), (True, False), (True, False), (False, True)]
+    assert "no_such_input" in out[1]["error"] and "base_cows" in out[4]["error"]
+    for payload, res in zip([payloads[0], *payloads[2:4]], [out[0], *out[2:4]]):
+        expected = compute_scenario("x", **(default_farm_args() | payload["inputs"]))
+        assert res["result"]["Net Final"] == pytest.approx(expected["Net Final"], rel=1e-12)
+
+def test_dispatcher_batches_and_coalesces():
+    dispatcher = Dispatcher(workers=0, max_batch=64, max_wait=0.2)
+    try:
+        futures = [dispatcher.submit({"inputs": {"base_cows": 10 + i % 20}}) for i in range(40)]
+        results = [f.result(timeout=10) for f in futures]
+        assert all("result" in r for r in results)
+        assert results[0] == results[20]
+        assert dispatcher.stats["coalesced"] == 20 and dispatcher.stats["batches"] == 1 and dispatcher.stats["evaluated"] == 20
+        assert dispatcher.submit({"inputs": {"base_cows": 10}}).result() == results[0]
+        assert dispatcher.stats["cache_hits"] == 1
+    finally:
+        dispatcher.close()
+
+def test_dispatcher_rejects_over_max_pending():
+    dispatcher = Dispatcher(workers=0, max_batch=64, max_wait=0.5, max_pending=2)
+    try:
+        first = [dispatcher.submit({"inputs": {"base_cows": n}}) for n in (1, 2)]
+        with pytest.raises(Overloaded):
+            dispatcher.submit({"inputs": {"base_cows": 3}})
+        with pytest.raises(Overloaded):
+            dispatcher.evaluate_batch([{}])
+        assert all("result" in f.result(timeout=10) for f in first)
+        assert dispatcher.stats["rejected"] == 2 and dispatcher.pending == 0
+    finally:
+        dispatcher.close()
+
+def test_worker_process_pool():
+    dispatcher = Dispatcher(workers=1, max_batch=4, max_wait=0.001)
+    try:
+        payloads = [{"inputs": {"base_cows": n}} for n in range(1, 11)]
+        assert dispatcher.evaluate_batch(payloads) == evaluate_payloads(payloads)
+        assert "result" in dispatcher.submit(payloads[0]).result(timeout=10)
+    finally:
+        dispatcher.close()
+
+def test_http_endpoints(server):
+    status, body = _post(server.url + "/evaluate", {"inputs": {"base_cows": 50}})
+    assert status == 200 and body["result"]["Net Final"] == pytest.approx(compute_scenario("x", **(default_farm_args() | {"base_cows": 50}))["Net Final"])
+    with urllib.request.urlopen(server.url + "/args") as resp:
+        assert json.loads(resp.read())["args"] == list(SCENARIO_ARGS)
+    with urllib.request.urlopen(server.url + "/health") as resp:
+        assert json.loads(resp.read())["requests"] >= 1
+
+def test_http_batch_status_shows_partial_failure(server):
+    ok, bad = {"inputs": {"base_cows": 10}}, {"inputs": {"base_cows": None}}
+    assert _post(server.url + "/batch", {"scenarios": [ok, ok]})[0] == 200
+    status, body = _post(server.url + "/batch", {"scenarios": [ok, bad]})
+    assert status == 207 and body["failed"] == 1 and "result" in body["results"][0] and "error" in body["results"][1]
+    status, body = _post(server.url + "/batch", {"scenarios": [bad]})
+    assert status == 400 and body["failed"] == 1
+
+def test_http_error_paths(server):
+    assert _post(server.url + "/evaluate", b"{not json")[0] == 400
+    assert _post(server.url + "/evaluate", [1, 2])[0] == 400
+    assert _post(server.url + "/batch", {"scenarios": {}})[0] == 400
+    assert _post(server.url + "/nowhere", {})[0] == 404
+    status, body = _post(server.url + "/evaluate", {"tables": {"cow": [{"Grade": "1++A", "Price(KRW/kg)": 25000, "Weight(kg)": 350}]}})
+    assert status == 400 and body["error"] == "cow 표에 필요한 열이 없습니다: Ratio(%)"
+    status, body = _post(server.url + "/evaluate", {"tables": {"cost_breed": {"항목": ["사료비"], "금액(천원/년)": ["많음"]}}})
+    assert status == 400 and "금액(천원/년)" in body["error"]
+
+def test_http_overload_returns_503(server):
+    dispatcher = server.dispatcher
+    dispatcher.max_wait, dispatcher.max_pending = 0.5, 1
+    queued = dispatcher.submit({"inputs": {"base_cows": 77}})
+    time.sleep(0.05)
+    req = urllib.request.Request(server.url + "/batch", data=json.dumps({"scenarios": [{}]}).encode())
+    with pytest.raises(HTTPError) as err:
+        urllib.request.urlopen(req, timeout=10)
+    assert err.value.code == 503 and err.value.headers["Retry-After"] == "1"
+    assert "result" in queued.result(timeout=10)
@@ -0,0 +1,61 @@
+"""스냅샷 저장소: 표 인코딩 왕복, 같은 표의 blob 중복 제거, 농가별 이력"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from hanwoo.snapshots import SnapshotStore, decode_table, encode_table
+from hanwoo.tables import default_cost_tables, default_grade_tables
+
+def _tables():
+    breed, fatten = default_cost_tables()
+    cow, steer = default_grade_tables()
+    return {"df_breed": breed, "df_fatten": fatten, "df_cow": cow, "df_steer": steer}
+
+def test_encode_round_trip_keeps_dtypes_and_index():
+    df = pd.DataFrame({"항목": ["사료비", "수도광열비", None], "금액": [1.5, np.nan, 3.0], "두수": np.array([1, 2, 3], dtype=np.int64),
+                       "확정": [True, False, True]}, index=[10, 20, 30])
+    out = decode_table(encode_table(df))
+    pd.testing.assert_frame_equal(out, df)
+    assert encode_table(df) == encode_table(df.copy())
+    for name, table in _tables().items():
+        pd.testing.assert_frame_equal(decode_table(encode_table(table)), table, obj=name)
+
+def test_identical_tables_are_stored_once(tmp_path):
+    store = SnapshotStore(tmp_path)
+    tables = _tables()
+    first = store.save("농가 A", {"base_cows": 100}, tables, label="기본")
+    n_first = store.stats()["objects"]
+    assert n_first == len(tables) + 1  # 표 4개 + 매니페스트
+    # 같은 표로 다른 입력·농가를 저장하면 매니페스트만 새로 생긴다
+    store.save("농가 A", {"base_cows": 120}, tables, label="두수 변경")
+    store.save("농가/B", {"base_cows": 100}, {k: v.copy() for k, v in tables.items()})
+    assert store.stats()["objects"] == n_first + 2
+    # 표 하나만 바뀌면 blob 하나 + 매니페스트 하나
+    cow = tables["df_cow"].copy()
+    cow.loc[0, "Ratio(%)"] = 6
+    store.save("농가 A", {"base_cows": 120}, tables | {"df_cow": cow})
+    assert store.stats()["objects"] == n_first + 4
+    assert store.load(first)["tables"]["df_cow"].loc[0, "Ratio(%)"] == 5
+
+def test_load_history_and_reopen(tmp_path):
+    store = SnapshotStore(tmp_path)
+    tables = _tables()
+    digests = [store.save("농가 A", {"base_cows": n, "mode": "경영비"}, tables, label=f"v{n}\t메모") for n in (90, 100, 110)]
+    assert store.latest("농가 A") == digests[-1] and store.latest("없음") is None
+    assert [e["digest"] for e in store.history("농가 A")] == digests[::-1]
+    assert store.history("농가 A", limit=2)[1]["label"] == "v100 메모"
+    reopened = SnapshotStore(tmp_path)
+    snap = reopened.load(digests[1])
+    assert snap["farm"] == "농가 A" and snap["inputs"] == {"base_cows": 100, "mode": "경영비"}
+    for name, table in tables.items():
+        pd.testing.assert_frame_equal(snap["tables"][name], table)
+    # 읽은 표는 캐시되지만 돌려준 사본을 고쳐도 캐시는 그대로
+    snap["tables"]["df_cow"].loc[0, "Ratio(%)"] = 99
+    assert reopened.load(digests[1])["tables"]["df_cow"].loc[0, "Ratio(%)"] == 5
+    assert reopened.farms() == ["농가 A"]
+
+def test_unknown_version_is_rejected(tmp_path):
+    store = SnapshotStore(tmp_path)
+    digest = store.put(b'{"version":99,"tables":{}}')
+    with pytest.raises(ValueError):
+        store.load(digest)
@@ -1,13 +1,46 @@
 import streamlit as st
 import pandas as pd
 import altair as alt
+import io
 import math
+import os
+import uuid
 import numpy as np
 import plotly.express as px
 
+from hanwoo import (
+    ALLOC_KEYS, compute_scenario, compute_scenario_batch, default_cost_tables, default_grade_tables, fmt_money, line_items_frame, make_excel_view,
+    SCENARIO_ARGS, default_risk_spec, herd_annual_frame, herd_monthly_frame, optimize_allocation, simulate_herd, simulate_risk, sketch_cdf,
+)
+from hanwoo.aggregates import TableAggregates
+from hanwoo.feed import FEED_TARGETS, annual_feed_costs, default_feed_tables, ration_costs, ration_frame, solve_rations
+from hanwoo.cache import cache_stats, memoize, stable_hash
+from hanwoo.downsample import SeriesFrame
+from hanwoo.export import EXPORT_FORMATS, export_report
+from hanwoo.genetics import GENETIC_DEFAULTS, GENETIC_TRAITS, genetic_gain_frames, project_genetic_gain
+from hanwoo.grading import build_grade_index
+from hanwoo.linear import BREAK_EVEN_TARGETS, break_even, compile_scenario
+from hanwoo.sensitivity import SENSITIVITY_OUTPUTS, default_ranges, sobol_indices, tornado
+from hanwoo.prices import PRICE_METHODS, PRICE_SERIES, PriceStore, grade_table_prices, scenario_prices
+from hanwoo.registry import EVENT_COLUMNS, REGISTRY_COLUMNS, load_registry
+from hanwoo.profiling import RerunProfiler, configure_logging, phases_frame
+from hanwoo.overlay import FootprintRegistry, SharedTables, session_footprint
+from hanwoo.snapshots import SnapshotStore, default_store_root
+
 # 페이지 설정
 st.set_page_config(page_title="한우 통합 플랫폼", layout="wide")
 
+# 재실행 구간 측정 (사이드바 '성능 프로파일러' 또는 HANWOO_PROFILE=1 로 켬, 꺼져 있으면 측정하지 않음)
+# DataFrame.copy 계수는 pandas 를 전역 패치하므로 HANWOO_PROFILE_COPIES=1 또는 별도 체크박스로만 켠다
+st.session_state.setdefault("debug_profile", os.environ.get("HANWOO_PROFILE") == "1")
+st.session_state.setdefault("debug_profile_copies", os.environ.get("HANWOO_PROFILE_COPIES") == "1")
+profiler = st.session_state.setdefault("_profiler", RerunProfiler())
+profiler.enabled = st.session_state.debug_profile
+profiler.count_copies = profiler.enabled and st.session_state.debug_profile_copies
+if profiler.enabled:
+    configure_logging()
+profiler.start()
+
 # ---------------------------
 # 테마/스타일 상수 (색상·차트 재사용)
 # ---------------------------
@@ -17,9 +50,20 @@ THEME = {
     "color_profit": "#2ca02c",  # 순이익
     "chart_height": 300,
 }
-_SCENARIO_SCALE = alt.Scale(domain=["시나리오 A", "시나리오 B"], range=[THEME["color_a"], THEME["color_b"]])
+# 시나리오 색상 (앞의 두 개는 테마 색, 나머지는 category10 순서)
+_SCENARIO_PALETTE = [THEME["color_a"], THEME["color_b"], "#ff7f0e", "#2ca02c", "#9467bd", "#8c564b", "#e377c2", "#7f7f7f", "#bcbd22", "#17becf"]
 _ANALYSIS_SCALE = alt.Scale(domain=["수익", "비용", "순이익"], range=[THEME["color_a"], THEME["color_b"], THEME["color_profit"]])
 
+def scenario_scale(names):
+    """시나리오 수에 맞춘 색상 척도 (10개 이하: 구분 색상, 그 이상: 목록 순서대로 연속 색상)"""
+    names = list(names)
+    if len(names) <= len(_SCENARIO_PALETTE):
+        return alt.Scale(domain=names, range=_SCENARIO_PALETTE[:len(names)])
+    return alt.Scale(domain=names, scheme="viridis")
+
+def scenario_legend(names):
+    return alt.Legend(title="시나리오") if len(names) <= 20 else None
+
 def _inject_css():
     """최소한의 커스텀 CSS 주입 (한 번만 실행)"""
     st.markdown("""
@@ -37,53 +81,65 @@ def _inject_css():
 # 0. 데이터 초기화
 # ---------------------------
 
-# [비용 데이터] - 천원 단위 적용 (기존 값 / 1000)
-if 'cost_items' not in st.session_state:
-    items = [
-        "사료비", "수도광열비", "방역치료비", "자동차비", "농구비", "영농시설비", "기타재료비", "종부료",
-        "차입금이자", "토지임차료", "고용노동비", "분뇨처리비", "생산관리비", "기타비용",
-        "자가노동비", "자본용역비", "토지용역비"
-    ]
-    data_breed = {
-        "항목": items,
-        "금액(천원/년)": [1500, 140, 110, 80, 50, 40, 30, 50, 60, 5, 20, 10, 20, 30, 800, 200, 50]
-    }
-    data_fatten = {
-        "항목": items,
-        "금액(천원/년)": [2300, 140, 80, 80, 50, 40, 30, 0, 60, 5, 20, 20, 20, 30, 600, 150, 50]
-    }
-    st.session_state.df_cost_breed = pd.DataFrame(data_breed)
-    st.session_state.df_cost_fatten = pd.DataFrame(data_fatten)
-
-# [매출 데이터]
-if 'df_cow' not in st.session_state:
-    data_cow = {
-        "Grade": ["1++A", "1++B", "1++C", "1+A", "1+B", "1+C", "1A", "1B", "1C", "2A", "2B", "2C", "3A", "3B", "3C", "D"],
-        "Ratio(%)": [5, 5, 5, 10, 10, 10, 10, 10, 10, 5, 5, 5, 2, 2, 1, 5], 
-        "Price(KRW/kg)": [25000, 24000, 23000, 21000, 20000, 19000, 18000, 17000, 16000, 14000, 13000, 12000, 10000, 9000, 8000, 5000],
-        "Weight(kg)": [350]*16 
-    }
-    st.session_state.df_cow = pd.DataFrame(data_cow)
-
-if 'df_steer' not in st.session_state:
-    data_steer = {
-        "Grade": ["1++A", "1++B", "1++C", "1+A", "1+B", "1+C", "1A", "1B", "1C", "2A", "2B", "2C", "3A", "3B", "3C", "D"],
-        "Ratio(%)": [10, 10, 5, 15, 15, 5, 10, 10, 5, 5, 5, 2, 1, 1, 0, 1], 
-        "Price(KRW/kg)": [29000, 28000, 27000, 25000, 24000, 23000, 21000, 20000, 19000, 17000, 16000, 15000, 13000, 12000, 11000, 8000],
-        "Weight(kg)": [450]*16
-    }
-    st.session_state.df_steer = pd.DataFrame(data_steer)
+@st.cache_resource
+def shared_tables():
+    """기본 참조 표 (프로세스 전체에서 한 벌, 읽기 전용) - 세션은 table_deltas 에 편집한 셀만 둔다"""
+    cost_breed, cost_fatten = default_cost_tables()      # [비용 데이터] - 천원 단위
+    cow, steer = default_grade_tables()                  # [매출 데이터]
+    feeds, feed_stages = default_feed_tables()           # [사료 배합 데이터] - 사료 원료 (가격·성분) 와 성장 단계별 요구량
+    return SharedTables({
+        "df_cost_breed": cost_breed, "df_cost_fatten": cost_fatten, "df_cow": cow, "df_steer": steer,
+        "df_feeds": feeds, "df_feed_stages": feed_stages,
+    })
+
+@st.cache_resource
+def footprint_registry():
+    return FootprintRegistry()
+
+TABLES = shared_tables()
+st.session_state.setdefault("table_deltas", {})
+st.session_state.setdefault("_session_id", uuid.uuid4().hex)
+st.session_state.setdefault("feed_use", False)
+
+def table(name):
+    """세션의 현재 표 (편집이 없으면 공유 기준 표 그대로 - 수정하지 말 것)"""
+    return TABLES.frame(name, st.session_state.table_deltas.get(name))
+
+def set_table(name, df):
+    """표 교체 -> 기준 표 대비 바뀐 셀만 세션에 보관"""
+    st.session_state.table_deltas[name] = TABLES.diff(name, df)
+
+# 비용표·등급표 합계는 세션별 증분 집계로 (바뀐 셀만 반영, HANWOO_VERIFY_AGGREGATES=1 또는 디버그 패널에서 전체 재계산과 대조)
+st.session_state.setdefault("debug_verify_aggregates", os.environ.get("HANWOO_VERIFY_AGGREGATES") == "1")
+aggregates = st.session_state.setdefault("_aggregates", TableAggregates(TABLES))
+aggregates.verify = st.session_state.debug_verify_aggregates
+
+def table_cost(name, mode, feed_cost=None):
+    """calculate_cost_from_table(table(name), mode, feed_cost) 와 같은 값"""
+    return aggregates.cost(name, st.session_state.table_deltas.get(name), mode, feed_cost)
+
+def table_opportunity_cost(name):
+    return aggregates.opportunity_cost(name, st.session_state.table_deltas.get(name))
+
+def table_avg_price(name):
+    """calculate_avg_price(table(name)) 와 같은 값"""
+    return aggregates.avg_price(name, st.session_state.table_deltas.get(name))
 
 # ---------------------------
 # 1. 헬퍼 함수
 # ---------------------------
-def clamp_int(x, lo=0):
-    try: return max(lo, int(x))
-    except: return lo
+def feed_cost_for(target):
+    """사료 배합 사용 시 target(번식우/비육우) 의 두당 연간 사료비 (원), 아니면 None (비용표의 사료비 사용)"""
+    if not st.session_state.feed_use:
+        return None
+    cost = ration_costs(table("df_feeds"), table("df_feed_stages"))[target]
+    return None if math.isnan(cost) else cost
 
-def fmt_money(x):
-    if x is None or (isinstance(x, float) and math.isnan(x)): return "-"
-    return f"{x:,.0f}"
+def rerun_if_stale(**values):
+    """프래그먼트에서 새로 계산한 값이 이번 전체 실행에 쓰인 값(_app_deps)과 다르면 앱 전체를 다시 실행"""
+    used = st.session_state.get("_app_deps", {})
+    if any(used.get(k) != v for k, v in values.items()):
+        st.rerun()
 
 def format_callback(key):
     val = st.session_state[key]
@@ -102,33 +158,91 @@ def input_with_comma(label, value, key=None):
     except:
         return float(value)
 
-_OPPORTUNITY_ITEMS: set[str] = {"자가노동비", "자본용역비", "토지용역비"}
-
-def _get_amount_series(df: pd.DataFrame) -> pd.Series:
-    match '금액(천원/년)' in df.columns:
-        case True:
-            return df['금액(천원/년)'] * 1000
-        case False:
-            return df['금액(원/년)']
-
-def calculate_cost_from_table(df: pd.DataFrame, mode: str = "경영비") -> float:
-    amounts = _get_amount_series(df)
-    match mode:
-        case "경영비":
-            mask = ~df['항목'].isin(_OPPORTUNITY_ITEMS)
-            return float(amounts[mask].sum())
-        case "생산비" | _:
-            return float(amounts.sum())
-
-def calculate_opportunity_cost(df: pd.DataFrame) -> float:
-    amounts  = _get_amount_series(df)
-    mask     = df['항목'].isin(_OPPORTUNITY_ITEMS)
-    return float(amounts[mask].sum())
-
-def calculate_avg_price(df: pd.DataFrame) -> int:
-    return int(
-        (df["Ratio(%)"] / 100 * df["Price(KRW/kg)"] * df["Weight(kg)"]).sum()
-    )
+# 시세 적용 대상: compute_scenario 가격 인자 -> 사이드바 입력란 key
+PRICE_WIDGET_KEYS: dict[str, str] = {
+    "price_calf_female": "p_calf_f", "price_calf_male": "p_calf_m", "price_cull_cow": "p_cull", "ext_buy_p": "ebp", "ext_sell_p": "esp",
+}
+
+def load_price_store(upload):
+    """업로드한 시세 이력 (.npz 저장소 또는 date/series/price CSV) -> PriceStore (파일별로 세션에 보관)"""
+    cached = st.session_state.get("price_store")
+    if cached is None or cached[0] != upload.file_id:
+        store = PriceStore.load(upload) if upload.name.lower().endswith(".npz") else PriceStore.from_frame(pd.read_csv(upload))
+        cached = st.session_state.price_store = (upload.file_id, store)
+    return cached[1]
+
+def price_series(file_id, store, names):
+    """시세 이력 -> SeriesFrame (파일·시계열 선택별로 세션에 보관, 구간 최소·최대로 줄여 급등락을 보존)"""
+    cached = st.session_state.get("price_series")
+    if cached is None or cached[0] != (file_id, tuple(names)):
+        frame = SeriesFrame(store.history_frame(names), x="date", y="price", by="series", method="minmax")
+        cached = st.session_state.price_series = ((file_id, tuple(names)), frame)
+    return cached[1]
+
+def create_price_history_chart(df_view, x_range):
+    """시세 이력 추이 (price_series(...).view 로 줄인 표)"""
+    return alt.Chart(df_view).mark_line(clip=True).encode(
+        x=alt.X("date:T", scale=alt.Scale(domain=[d.isoformat() for d in x_range]), title=None),
+        y=alt.Y("price:Q", axis=alt.Axis(format=",.0f"), title=None),
+        color=alt.Color("series:N", legend=alt.Legend(orient="bottom", columns=2), title=None),
+        tooltip=[alt.Tooltip("date:T"), "series", alt.Tooltip("price", format=",.0f")],
+    ).properties(width='container', height=THEME["chart_height"] * 2 // 3)
+
+def _apply_prices(store, at, method):
+    """시세를 가격 입력란과 등급표 지육단가에 반영 (버튼 콜백 - 위젯 생성 전에 실행됨)"""
+    for arg, value in scenario_prices(store, [at], method).items():
+        if not np.isnan(value[0]):
+            st.session_state[PRICE_WIDGET_KEYS[arg]] = f"{int(value[0]):,}"
+    set_table("df_cow", grade_table_prices(store, table("df_cow"), "carcass_cow", at, method))
+    set_table("df_steer", grade_table_prices(store, table("df_steer"), "carcass_steer", at, method))
+    for editor_key in ("editor_cow", "editor_steer"):
+        st.session_state.pop(editor_key, None)
+
+# 사이드바 입력란 key -> 기본값 (스냅샷 복원으로 Session State 를 덮어쓰므로 value= 대신 여기서 초기화)
+SIDEBAR_DEFAULTS: dict = {
+    "cost_mode": "경영비 기준 (실지출)", "sb_base_cows": 100, "sb_birth_ratio": 0.50, "sb_heifer_months": 18, "sb_calf_months": 6,
+    "sb_kpn_exit": 6, "sb_ship_f": 30, "sb_ship_m": 30, "sb_ext_buy_n": 80, "sb_ext_sell_n": 78, "sb_ext_period": 2.0,
+}
+for _k, _v in SIDEBAR_DEFAULTS.items():
+    st.session_state.setdefault(_k, _v)
+
+# 스냅샷에 담는 값: 입력란 (input_with_comma 포함) 과 입력란 밖에 보관하는 값, 표
+SNAPSHOT_INPUT_KEYS: tuple[str, ...] = (
+    *SIDEBAR_DEFAULTS, "p_calf_f", "p_calf_m", "p_cull", "ebp", "esp", "ecy", "ec_cw", "ec_ms", "ec_ema", "ec_bft",
+    "conception_rate", "by_product_income", "feed_use",
+)
+SNAPSHOT_TABLES: tuple[str, ...] = ("df_cost_breed", "df_cost_fatten", "df_feeds", "df_feed_stages", "df_cow", "df_steer", "scenarios")
+# 복원 후 새 값으로 다시 만들어야 하는 위젯 (value= 로 Session State 값을 받는 입력란, 편집기)
+SNAPSHOT_RESET_KEYS: tuple[str, ...] = (
+    "sb_concept", "cost_concept_disp", "bp_income_input",
+    "editor_cost_breed", "editor_cost_fatten", "editor_feeds", "editor_feed_stages", "editor_cow", "editor_steer", "editor_scenarios",
+)
+
+@st.cache_resource
+def snapshot_store():
+    """스냅샷 저장소 (프로세스 공유 - 읽은 표 캐시를 세션마다 따로 두지 않음)"""
+    return SnapshotStore(default_store_root())
+
+def _save_snapshot(store, scenarios):
+    """현재 입력·표를 스냅샷으로 저장 (버튼 콜백)"""
+    farm = st.session_state.snap_farm.strip() or "기본 농장"
+    inputs = {k: st.session_state[k] for k in SNAPSHOT_INPUT_KEYS if k in st.session_state}
+    tables = {name: table(name) for name in SNAPSHOT_TABLES if name != "scenarios"}
+    st.session_state.snap_saved = store.save(farm, inputs, {**tables, "scenarios": scenarios}, st.session_state.get("snap_label", ""))
+
+def _load_snapshot(store, digest):
+    """스냅샷을 입력란과 표에 반영 (버튼 콜백 - 위젯 생성 전에 실행됨)"""
+    snap = store.load(digest)
+    for k, v in snap["inputs"].items():
+        if k in SNAPSHOT_INPUT_KEYS:
+            st.session_state[k] = v
+    for name, df in snap["tables"].items():
+        if name == "scenarios":
+            st.session_state.scenarios = df
+        elif name in SNAPSHOT_TABLES:
+            set_table(name, df)
+    for k in SNAPSHOT_RESET_KEYS:
+        st.session_state.pop(k, None)
 
 st.title("한우 통합 플랫폼")
 _inject_css()
@@ -137,52 +251,55 @@ _inject_css()
 # 2. 사이드바 UI
 # ---------------------------
 with st.sidebar:
+    # 스냅샷 저장에는 시나리오 목록이 필요하므로 자리만 잡아 두고 스크립트 끝에서 채운다
+    snapshot_box = st.container()
     st.header("1. 분석 기준 설정")
-    cost_mode = st.radio("비용 산출 기준", ["경영비 기준 (실지출)", "생산비 기준 (기회비용 포함)"], index=0)
+    cost_mode = st.radio("비용 산출 기준", ["경영비 기준 (실지출)", "생산비 기준 (기회비용 포함)"], key="cost_mode")
     mode_key = "경영비" if "경영비" in cost_mode else "생산비"
 
     EDITOR_TO_STATE: dict[str, str] = {
         "editor_cost_breed": "df_cost_breed",
         "editor_cost_fatten": "df_cost_fatten",
+        "editor_feeds":       "df_feeds",
+        "editor_feed_stages": "df_feed_stages",
         "editor_cow":         "df_cow",
         "editor_steer":       "df_steer",
     }
 
-    for editor_key, state_key in EDITOR_TO_STATE.items():
-        if editor_key not in st.session_state:
-            continue
+    with profiler.phase("editor_sync"):
+        for editor_key, state_key in EDITOR_TO_STATE.items():
+            if editor_key not in st.session_state:
+                continue
 
-        _edited = st.session_state[editor_key]
-
-        match type(_edited).__name__:
-            case "DataFrame":
-                st.session_state[state_key] = _edited
-            case "dict":
-                _df = st.session_state[state_key].copy()
-                for row_idx, changes in _edited.get("edited_rows", {}).items():
-                    for col, val in changes.items():
-                        _df.at[int(row_idx), col] = val
-                st.session_state[state_key] = _df
-            case _:
-                pass
-
-    calc_breed_cost = calculate_cost_from_table(st.session_state.df_cost_breed, mode_key)
-    calc_fatten_cost = calculate_cost_from_table(st.session_state.df_cost_fatten, mode_key)
-    calc_cow_price = calculate_avg_price(st.session_state.df_cow)
-    calc_steer_price = calculate_avg_price(st.session_state.df_steer)
+            _edited = st.session_state[editor_key]
+
+            match type(_edited).__name__:
+                case "DataFrame":
+                    set_table(state_key, _edited)
+                case "dict":
+                    deltas = st.session_state.table_deltas
+                    deltas[state_key] = TABLES.apply_edits(state_key, deltas.get(state_key), _edited.get("edited_rows", {}))
+                case _:
+                    pass
+
+    with profiler.phase("table_aggregates"):
+        calc_breed_cost = table_cost("df_cost_breed", mode_key, feed_cost_for("번식우"))
+        calc_fatten_cost = table_cost("df_cost_fatten", mode_key, feed_cost_for("비육우"))
+        calc_cow_price = table_avg_price("df_cow")
+        calc_steer_price = table_avg_price("df_steer")
 
     st.divider()
     st.header("2. 기본 환경 설정")
     
     with st.expander("A. 농장 공통 설정", expanded=False):
-        base_cows = st.number_input("기초 번식우(두)", value=100, step=10, format="%d")
+        base_cows = st.number_input("기초 번식우(두)", step=10, format="%d", key="sb_base_cows")
         if 'conception_rate' not in st.session_state: st.session_state.conception_rate = 0.70
         conception_rate = st.number_input("수태율 (0~1)", value=st.session_state.conception_rate, step=0.01, key='sb_concept')
         st.session_state.conception_rate = conception_rate
-        female_birth_ratio = st.number_input("암 성비 (0~1)", value=0.50, step=0.01)
-        heifer_nonprofit_months = st.number_input("대체우 무수익(월)", value=18)
-        calf_common_months = st.number_input("송아지 공통육성(월)", value=6)
-        kpn_exit_months = st.number_input("KPN 종료월령", value=6)
+        female_birth_ratio = st.number_input("암 성비 (0~1)", step=0.01, key="sb_birth_ratio")
+        heifer_nonprofit_months = st.number_input("대체우 무수익(월)", key="sb_heifer_months")
+        calf_common_months = st.number_input("송아지 공통육성(월)", key="sb_calf_months")
+        kpn_exit_months = st.number_input("KPN 종료월령", key="sb_kpn_exit")
 
     with st.expander("B. 비용 (원/년/두) - 자동 연동", expanded=False):
         st.caption(f"※ {mode_key} 기준 자동 계산된 값입니다.")
@@ -201,16 +318,34 @@ with st.sidebar:
         p_fat_m = calc_steer_price
 
     with st.expander("D. 출하월령", expanded=False):
-        ship_m_f = st.number_input("암 출하월령", value=30)
-        ship_m_m = st.number_input("수 출하월령", value=30)
+        ship_m_f = st.number_input("암 출하월령", key="sb_ship_f")
+        ship_m_m = st.number_input("수 출하월령", key="sb_ship_m")
 
     with st.expander("E. 외부 비육 농가", expanded=False):
-        ext_buy_n = st.number_input("수송아지 매입(두)", value=80)
+        ext_buy_n = st.number_input("수송아지 매입(두)", key="sb_ext_buy_n")
         ext_buy_p = input_with_comma("수송아지 매입가", 3950000, key="ebp")
-        ext_sell_n = st.number_input("비육우 출하(두)", value=78)
+        ext_sell_n = st.number_input("비육우 출하(두)", key="sb_ext_sell_n")
         ext_sell_p = input_with_comma("비육우 출하가", 10721983, key="esp")
         ext_cost_y = input_with_comma("비육우 유지비", 4330500, key="ecy") 
-        ext_period = st.number_input("비육우 기간(년)", value=2.0)
+        ext_period = st.number_input("비육우 기간(년)", key="sb_ext_period")
+
+    with st.expander("시세 이력으로 가격 적용", expanded=False):
+        price_file = st.file_uploader("시세 이력 (.npz / CSV: date, series, price)", type=["npz", "csv"], key="price_file")
+        if price_file is not None:
+            store = load_price_store(price_file)
+            first_day, last_day = (d.item() for d in store.date_range)
+            price_at = st.date_input("기준일", value=last_day, min_value=first_day, key="price_at")
+            price_method = st.radio("가격 기준", list(PRICE_METHODS), format_func=PRICE_METHODS.get, key="price_method")
+            st.caption(f"시계열 {len(store.names)}개 · 관측 {len(store):,}건 ({first_day} ~ {last_day})")
+            st.button("시세 적용", on_click=_apply_prices, args=(store, price_at, price_method), key="price_apply")
+            if st.checkbox("시세 추이 보기", key="price_chart"):
+                default = [n for n in dict.fromkeys(PRICE_SERIES.values()) if n in store] or store.names[:3]
+                shown = st.multiselect("시계열", store.names, default=default, key=f"price_shown_{price_file.file_id}")
+                zoom = st.slider("표시 기간", first_day, last_day, (first_day, last_day), key=f"price_zoom_{price_file.file_id}")
+                if shown:
+                    with profiler.phase("chart:price_history"):
+                        view = price_series(price_file.file_id, store, shown).view(zoom, points=300)
+                        st.altair_chart(create_price_history_chart(view, zoom), width="stretch")
 
     st.divider()
     st.header("3. 형질별 경제적 가치")
@@ -223,115 +358,60 @@ with st.sidebar:
 # ---------------------------
 # 3. 경제성 분석 로직
 # ---------------------------
-def compute_scenario(name, base_cows, conception_rate, female_birth_ratio, heifer_nonprofit_months, calf_common_months, kpn_exit_months, annual_culls, female_calf_sell, female_fatten_in, female_fatten_out, female_loss, loss_months, male_calf_sell, male_fatten_in, male_fatten_out, male_loss, kpn_male, cow_cost_y, cost_fatten_avg_y, price_calf_female, price_calf_male, price_fatten_female, price_fatten_male, price_cull_cow, ship_m_female, ship_m_male, ext_buy_n, ext_buy_p, ext_sell_n, ext_sell_p, ext_cost_y, ext_period_y, by_product_income_cow):
-    base_cows = clamp_int(base_cows, 1)
-    annual_culls = clamp_int(annual_culls, 0)
-
-    val_cull = annual_culls * price_cull_cow
-    val_calf_f = clamp_int(female_calf_sell) * price_calf_female
-    val_calf_m = clamp_int(male_calf_sell) * price_calf_male
-    val_fat_out_f = clamp_int(female_fatten_out) * price_fatten_female
-    val_fat_out_m = clamp_int(male_fatten_out) * price_fatten_male
-    val_byprod = base_cows * by_product_income_cow
-    rev_internal = val_cull + val_calf_f + val_calf_m + val_fat_out_f + val_fat_out_m + val_byprod
-    
-    cost_breeding_main = base_cows * cow_cost_y
-    cost_breeding_repl = annual_culls * cow_cost_y
+farm_params = {
+    "base_cows": base_cows, "conception_rate": conception_rate, "female_birth_ratio": female_birth_ratio,
+    "heifer_nonprofit_months": heifer_nonprofit_months, "calf_common_months": calf_common_months, "kpn_exit_months": kpn_exit_months,
+    "cow_cost_y": cow_cost_y, "cost_fatten_avg_y": avg_cost_calc,
+    "price_calf_female": p_calf_f, "price_calf_male": p_calf_m, "price_fatten_female": p_fat_f, "price_fatten_male": p_fat_m, "price_cull_cow": p_cull,
+    "ship_m_female": ship_m_f, "ship_m_male": ship_m_m,
+    "ext_buy_n": ext_buy_n, "ext_buy_p": ext_buy_p, "ext_sell_n": ext_sell_n, "ext_sell_p": ext_sell_p, "ext_cost_y": ext_cost_y, "ext_period_y": ext_period,
+}
 
-    if conception_rate > 0:
-        calf_prod_cost_unit = (cow_cost_y / conception_rate) - by_product_income_cow
-    else:
-        calf_prod_cost_unit = 0
-    val_kpn_loss = clamp_int(kpn_male) * calf_prod_cost_unit * (clamp_int(kpn_exit_months, 0) / 12.0)
-    
-    val_fat_cost_f = clamp_int(female_fatten_in) * cost_fatten_avg_y
-    val_fat_cost_m = clamp_int(male_fatten_in) * cost_fatten_avg_y
-    
-    cost_loss_head = calf_prod_cost_unit * (loss_months / 12.0)
-    val_loss_f = female_loss * cost_loss_head
-    val_loss_m = male_loss * cost_loss_head
-    
-    cost_internal = cost_breeding_main + cost_breeding_repl + val_kpn_loss + val_fat_cost_f + val_fat_cost_m + val_loss_f + val_loss_m
-    net_internal = rev_internal - cost_internal
+def scenario_args(inputs):
+    """사이드바 입력 + 분배 입력 + 부산물 수입 -> compute_scenario 인자"""
+    bp_income = st.session_state.get('by_product_income', 0)
+    return {**farm_params, **{k: inputs[k] for k in ALLOC_KEYS}, "by_product_income_cow": bp_income}
 
-    val_ext_rev = ext_sell_n * ext_sell_p
-    val_ext_buy = ext_buy_n * ext_buy_p
-    val_ext_maint = ext_buy_n * ext_cost_y
-    
-    net_external = val_ext_rev - val_ext_buy - val_ext_maint
-
-    net_final = net_internal + net_external
-    rev_final = rev_internal + val_ext_rev
-    cost_final = cost_internal + val_ext_buy + val_ext_maint
-
-    fatten_period_f = max(0, ship_m_female - calf_common_months) / 12.0
-    fatten_period_m = max(0, ship_m_male - calf_common_months) / 12.0
-
-    cost_breakdown = [
-        {"Category": "기초 번식우 유지", "Value": cost_breeding_main + cost_breeding_repl},
-        {"Category": "자가 사육비", "Value": val_fat_cost_f + val_fat_cost_m},
-        {"Category": "폐사 손실", "Value": val_loss_f + val_loss_m},
-        {"Category": "외부 송아지 매입", "Value": val_ext_buy},
-        {"Category": "외부 사육비", "Value": val_ext_maint},
-        {"Category": "기타 (KPN 위탁 등)", "Value": val_kpn_loss}
-    ]
+@memoize(8)
+def herd_series(args_list, names, years=10, monthly=False):
+    """시나리오별 compute_scenario 인자 목록 -> 연간/월별 추이 SeriesFrame (한 번의 배치 시뮬레이션, 차트에는 보이는 구간만 줄여 보냄)"""
+    result = simulate_herd({k: [a[k] for a in args_list] for k in SCENARIO_ARGS}, years=years)
+    return SeriesFrame(herd_monthly_frame(result, names) if monthly else herd_annual_frame(result, names), x="Year", y="Value", by="Scenario")
 
-    return {
-        "Scenario": name,
-        "Net Final": net_final, "Rev Final": rev_final, "Cost Final": cost_final,
-        "Cost Breakdown": cost_breakdown,
-        "months_heifer": heifer_nonprofit_months, "months_kpn": kpn_exit_months, "rate_concept": conception_rate,
-        "period_f": fatten_period_f, "period_m": fatten_period_m, "period_ext": ext_period_y, "cost_avg_fatten": cost_fatten_avg_y,
-        "v_cull": val_cull, "n_cull": annual_culls, "v_calf_f": val_calf_f, "n_calf_f": female_calf_sell,
-        "v_calf_m": val_calf_m, "n_calf_m": male_calf_sell, "v_fat_out_f": val_fat_out_f, "n_fat_out_f": female_fatten_out,
-        "v_fat_out_m": val_fat_out_m, "n_fat_out_m": male_fatten_out, "c_breed_main": cost_breeding_main, "n_base": base_cows,
-        "c_breed_repl": cost_breeding_repl, "n_repl": annual_culls, "c_kpn": val_kpn_loss, "n_kpn": kpn_male,
-        "c_fat_in_f": val_fat_cost_f, "n_fat_in_f": female_fatten_in, "c_fat_in_m": val_fat_cost_m, "n_fat_in_m": male_fatten_in,
-        "val_loss_f": val_loss_f, "val_loss_m": val_loss_m, "n_loss_f": female_loss, "n_loss_m": male_loss,
-        "cost_loss_head": cost_loss_head, "loss_months": loss_months, "v_ext_rev": val_ext_rev, "n_ext_sell": ext_sell_n,
-        "c_ext_buy": val_ext_buy, "n_ext_buy": ext_buy_n, "c_ext_maint": val_ext_maint, "n_ext_stock": ext_sell_n * ext_period_y,
-        "p_cull": price_cull_cow, "p_calf_f": price_calf_female, "p_calf_m": price_calf_male,
-        "p_fat_f": price_fatten_female, "p_fat_m": price_fatten_male, "cost_y_cow": cow_cost_y, 
-        "p_ext_sell": ext_sell_p, "p_ext_buy": ext_buy_p, "cost_y_ext": ext_cost_y,
-        "v_byprod": val_byprod, "unit_byprod": by_product_income_cow
-    }
+@memoize(64)
+def excel_view(res):
+    """make_excel_view 표 (프로세스 공유 캐시 - Styler 는 세션마다 새로 만든다)"""
+    return make_excel_view(res)
 
-def run_base_calc(name, inputs):
-    bp_income = st.session_state.get('by_product_income', 0)
-    return compute_scenario(name, base_cows, conception_rate, female_birth_ratio, heifer_nonprofit_months, calf_common_months, kpn_exit_months, inputs["annual_culls"], inputs["female_calf_sell"], inputs["female_fatten_in"], inputs["female_fatten_out"], inputs["female_loss"], inputs["loss_months"], inputs["male_calf_sell"], inputs["male_fatten_in"], inputs["male_fatten_out"], inputs["male_loss"], inputs["kpn_male"], cow_cost_y, avg_cost_calc, p_calf_f, p_calf_m, p_fat_f, p_fat_m, p_cull, ship_m_f, ship_m_m, ext_buy_n, ext_buy_p, ext_sell_n, ext_sell_p, ext_cost_y, ext_period, bp_income)
-
-def make_excel_view(res):
-    data = []
-    data.append({"구분": "수익", "항목": "도태우 판매", "산출 근거": f"{res['n_cull']}두 * {fmt_money(res['p_cull'])}", "금액 (Amount)": res["v_cull"]})
-    data.append({"구분": "수익", "항목": "암송아지 판매", "산출 근거": f"{res['n_calf_f']}두 * {fmt_money(res['p_calf_f'])}", "금액 (Amount)": res["v_calf_f"]})
-    data.append({"구분": "수익", "항목": "수송아지 판매", "산출 근거": f"{res['n_calf_m']}두 * {fmt_money(res['p_calf_m'])}", "금액 (Amount)": res["v_calf_m"]})
-    data.append({"구분": "수익", "항목": "암비육우 출하", "산출 근거": f"{res['n_fat_out_f']}두 * {fmt_money(res['p_fat_f'])}", "금액 (Amount)": res["v_fat_out_f"]})
-    data.append({"구분": "수익", "항목": "수비육우 출하", "산출 근거": f"{res['n_fat_out_m']}두 * {fmt_money(res['p_fat_m'])}", "금액 (Amount)": res["v_fat_out_m"]})
-    data.append({"구분": "수익", "항목": "부산물 수입", "산출 근거": f"{res['n_base']}두 * {fmt_money(res['unit_byprod'])}", "금액 (Amount)": res["v_byprod"]})
-    
-    data.append({"구분": "비용", "항목": "기초 번식우 유지", "산출 근거": f"{res['n_base']}두 * {fmt_money(res['cost_y_cow'])}", "금액 (Amount)": -res["c_breed_main"]})
-    data.append({"구분": "비용", "항목": "대체우 육성", "산출 근거": f"투입 {res['n_repl']}두 * 1년 * {fmt_money(res['cost_y_cow'])}", "금액 (Amount)": -res["c_breed_repl"]})
-    data.append({"구분": "비용", "항목": "자가 암비육", "산출 근거": f"투입 {res['n_fat_in_f']}두 * 1년 * {fmt_money(res['cost_avg_fatten'])}", "금액 (Amount)": -res["c_fat_in_f"]})
-    data.append({"구분": "비용", "항목": "자가 수비육", "산출 근거": f"투입 {res['n_fat_in_m']}두 * 1년 * {fmt_money(res['cost_avg_fatten'])}", "금액 (Amount)": -res["c_fat_in_m"]})
-    
-    data.append({"구분": "비용(손실)", "항목": "암송아지 폐사", "산출 근거": f"{res['n_loss_f']}두 * ({fmt_money(res['cost_y_cow'])}/{res['rate_concept']}) * ({res['loss_months']}/12)", "금액 (Amount)": -res["val_loss_f"]})
-    data.append({"구분": "비용(손실)", "항목": "수송아지 폐사", "산출 근거": f"{res['n_loss_m']}두 * ({fmt_money(res['cost_y_cow'])}/{res['rate_concept']}) * ({res['loss_months']}/12)", "금액 (Amount)": -res["val_loss_m"]})
-    data.append({"구분": "외부", "항목": "비육우 매출", "산출 근거": f"{res['n_ext_sell']}두 * {fmt_money(res['p_ext_sell'])}", "금액 (Amount)": res["v_ext_rev"]})
-    data.append({"구분": "외부", "항목": "송아지 매입", "산출 근거": f"{res['n_ext_buy']}두 * {fmt_money(res['p_ext_buy'])}", "금액 (Amount)": -res["c_ext_buy"]})
-    data.append({"구분": "외부", "항목": "사육 유지비", "산출 근거": f"매입 {res['n_ext_buy']}두 * 1년 * {fmt_money(res['cost_y_ext'])}", "금액 (Amount)": -res["c_ext_maint"]})
-    data.append({"구분": "결과", "항목": "순이익 (Net Profit)", "산출 근거": "수익 - 비용", "금액 (Amount)": res["Net Final"]})
-    return pd.DataFrame(data)
-
-def create_net_profit_chart(res_a, res_b):
-    years = list(range(1, 11))
-    chart_data = [{"Scenario": "시나리오 A", "Year": y, "Value": res_a['Net Final']} for y in years] + [{"Scenario": "시나리오 B", "Year": y, "Value": res_b['Net Final']} for y in years]
-    df_chart = pd.DataFrame(chart_data)
-    return alt.Chart(df_chart).mark_line(point=True).encode(
-        x=alt.X("Year:O", axis=alt.Axis(labelAngle=0)),
+def create_net_profit_chart(df_view, names, x_range, title):
+    """simulate_herd 추이 차트 (herd_series(...).view 로 줄인 표, x_range 밖은 잘라냄)"""
+    monthly = "Month" in df_view.columns
+    return alt.Chart(df_view).mark_line(point=len(names) <= 10 and not monthly, clip=True).encode(
+        x=alt.X("Year:Q", scale=alt.Scale(domain=list(x_range), nice=False), axis=alt.Axis(labelAngle=0, tickMinStep=1, format="d")),
         y=alt.Y("Value:Q", axis=alt.Axis(format=",.0f")),
-        color=alt.Color("Scenario:N", scale=_SCENARIO_SCALE, title="시나리오"),
-        tooltip=["Scenario", "Year", alt.Tooltip("Value", format=",.0f")]
-    ).properties(width='container', height=THEME["chart_height"], title="순이익 비교 (10년 추이)")
+        color=alt.Color("Scenario:N", scale=scenario_scale(names), legend=scenario_legend(names), sort=names),
+        tooltip=["Scenario", *(["Month"] if monthly else ["Year"]), alt.Tooltip("Value", format=",.0f"), alt.Tooltip("Revenue", format=",.0f"), alt.Tooltip("Cost", format=",.0f"), alt.Tooltip("Cows", format=",.1f")]
+    ).properties(width='container', height=THEME["chart_height"], title=title)
+
+@st.fragment
+@profiler.wrap("chart:net_profit")
+def render_net_profit_trajectory(scenario_params):
+    """순이익 추이: 기간·단위·표시 구간을 바꾸면 이 차트만 다시 그리며, 브라우저에는 줄인 표 (최대 MAX_CHART_ROWS 행) 만 보낸다"""
+    names = list(scenario_params)
+    h1, h2 = st.columns([3, 1])
+    years = h1.slider("추이 기간 (년)", 5, 50, 10, key="traj_years")
+    monthly = h2.toggle("월별", key="traj_monthly")
+    with profiler.phase("herd_trajectories"):
+        series = herd_series(list(scenario_params.values()), names, years, monthly)
+    zoom = st.slider("표시 구간 (년)", 1, years, (1, years), key=f"traj_zoom_{years}")
+    x_range = (zoom[0] - 1, zoom[1]) if monthly else (zoom[0] - 0.5, zoom[1] + 0.5)
+    with profiler.phase("downsample"):
+        view = series.view(x_range)
+    title = f"순이익 비교 ({years}년 {'월별' if monthly else '연간'} 추이)"
+    st.altair_chart(create_net_profit_chart(view, names, x_range, title), width="stretch")
+    stats = series.stats()
+    st.caption("분배가 생산 두수 안에 들면 매년 순이익은 분석 결과의 순이익 (Net Final) 과 같고, 넘치는 분배는 생산 두수에 맞춰 줄어든다.")
+    st.caption(f"차트 {len(view):,}행 / 시뮬레이션 {stats['rows']:,}행 · 구간 캐시 {stats['size']}개 (적중 {stats['hits']:,}회)")
 
 def create_pie_chart(res_data):
     df_cost = pd.DataFrame(res_data['Cost Breakdown'])
@@ -349,92 +429,344 @@ birth_total = base_cows * conception_rate
 birth_female = birth_total * female_birth_ratio
 birth_male = birth_total * (1 - female_birth_ratio)
 
-def get_alloc_inputs(tab, key):
-    with tab:
-        st.info(f"생산 가이드 | 암송아지: **{birth_female:.1f}두** | 수송아지: **{birth_male:.1f}두**")
-        c1, c2, c3 = st.columns(3)
-        culls = c1.number_input(f"[{key}] 연간 도태(두)", value=15, key=f"c_{key}")
-        repl_rate = (culls / base_cows) * 100 if base_cows > 0 else 0
-        c1.metric(f"교체율 ({key})", f"{repl_rate:.1f}%")
-        
-        c2.markdown(f"**[{key}] 암송아지 분배**")
-        c2.text_input(f"대체우 선발 [고정]", value=f"{culls} (자동)", disabled=True, key=f"rd_{key}_{culls}")
-        fsell = c2.number_input(f"판매(두)", value=0, key=f"fs_{key}")
-        ffat_in = c2.number_input(f"자가비육 투입", value=10, key=f"fi_{key}")
-        ffat_out = c2.number_input(f"자가비육 출하", value=10, key=f"fo_{key}")
-        if ffat_out > ffat_in: c2.error(f"오류: 투입({ffat_in}) < 출하({ffat_out})")
-        floss = c2.number_input(f"폐사(두)", value=0, key=f"fl_{key}")
-        loss_months = c2.number_input(f"폐사 월령", value=4, key=f"lm_{key}")
-
-        sum_female = culls + fsell + ffat_in + floss
-        if sum_female > birth_female:
-            c2.error(f"합계({sum_female}두)가 생산({birth_female:.1f}두)을 초과했습니다.")
+# 시나리오 목록 (한 행 = 한 시나리오, 분배 컬럼명 = compute_scenario 인자명) 의 기본값과 표시 이름
+SCENARIO_DEFAULTS: dict[str, int] = {
+    "annual_culls": 15, "female_calf_sell": 0, "female_fatten_in": 10, "female_fatten_out": 10, "female_loss": 0, "loss_months": 4,
+    "kpn_male": 10, "male_calf_sell": 0, "male_fatten_in": 25, "male_fatten_out": 25, "male_loss": 0,
+}
+SCENARIO_LABELS: dict[str, str] = {
+    "annual_culls": "연간 도태(두)", "female_calf_sell": "암 판매", "female_fatten_in": "암 비육 투입", "female_fatten_out": "암 비육 출하",
+    "female_loss": "암 폐사", "loss_months": "폐사 월령", "kpn_male": "KPN 위탁", "male_calf_sell": "수 판매",
+    "male_fatten_in": "수 비육 투입", "male_fatten_out": "수 비육 출하", "male_loss": "수 폐사",
+}
+
+if "scenarios" not in st.session_state:
+    st.session_state.scenarios = pd.DataFrame([{"시나리오": name, **SCENARIO_DEFAULTS} for name in ("시나리오 A", "시나리오 B")])
 
-        c3.markdown(f"**[{key}] 수송아지 분배**")
-        kpn = c3.number_input(f"KPN 위탁", value=10, key=f"k_{key}")
-        msell = c3.number_input(f"판매(두)", value=0, key=f"ms_{key}")
-        mfat_in = c3.number_input(f"자가비육 투입", value=25, key=f"mi_{key}")
-        mfat_out = c3.number_input(f"자가비육 출하", value=25, key=f"mo_{key}")
-        if mfat_out > mfat_in: c3.error(f"오류: 투입({mfat_in}) < 출하({mfat_out})")
-        mloss = c3.number_input(f"폐사(두)", value=0, key=f"ml_{key}")
+def clean_scenarios(df):
+    """편집기 결과 -> 이름이 고유하고 빈 칸은 기본값으로 채운 시나리오 목록"""
+    names, seen = [], {}
+    for i, name in enumerate(df["시나리오"]):
+        name = name.strip() if isinstance(name, str) and name.strip() else f"시나리오 {i + 1}"
+        seen[name] = seen.get(name, 0) + 1
+        names.append(name if seen[name] == 1 else f"{name} ({seen[name]})")
+    out = pd.DataFrame({"시나리오": names})
+    for k, default in SCENARIO_DEFAULTS.items():
+        out[k] = pd.to_numeric(df[k], errors="coerce").fillna(default).round().astype("int64").to_numpy() if k in df.columns else default
+    return out
 
-        sum_male = kpn + msell + mfat_in + mloss
+def scenario_warnings(df):
+    """분배 제약 위반 (출하 > 투입, 분배 합계 > 생산 두수) 메시지"""
+    out = []
+    for r in df.to_dict("records"):
+        name = r["시나리오"]
+        if r["female_fatten_out"] > r["female_fatten_in"]:
+            out.append(f"[{name}] 암 비육 투입({r['female_fatten_in']:.0f}) < 출하({r['female_fatten_out']:.0f})")
+        if r["male_fatten_out"] > r["male_fatten_in"]:
+            out.append(f"[{name}] 수 비육 투입({r['male_fatten_in']:.0f}) < 출하({r['male_fatten_out']:.0f})")
+        sum_female = r["annual_culls"] + r["female_calf_sell"] + r["female_fatten_in"] + r["female_loss"]
+        if sum_female > birth_female:
+            out.append(f"[{name}] 암송아지 합계({sum_female:.0f}두)가 생산({birth_female:.1f}두)을 초과했습니다.")
+        sum_male = r["kpn_male"] + r["male_calf_sell"] + r["male_fatten_in"] + r["male_loss"]
         if sum_male > birth_male:
-            c3.error(f"합계({sum_male}두)가 생산({birth_male:.1f}두)을 초과했습니다.")
+            out.append(f"[{name}] 수송아지 합계({sum_male:.0f}두)가 생산({birth_male:.1f}두)을 초과했습니다.")
+    return out
+
+def _set_scenarios(df):
+    """시나리오 목록 교체 (버튼 콜백 - 편집 내용은 df 에 이미 들어 있으므로 편집기 상태를 비운다)"""
+    st.session_state.scenarios = df.reset_index(drop=True)
+    st.session_state.pop("editor_scenarios", None)
+
+def _add_repl_variants(df, base, repl_range, n):
+    """base 시나리오를 복제해 교체율을 repl_range(%) 에서 n 단계로 바꾼 변형을 목록 끝에 추가"""
+    row = df[df["시나리오"] == base].iloc[0].to_dict()
+    variants = pd.DataFrame([
+        {**row, "시나리오": f"{base} · 교체율 {rate:.1f}%", "annual_culls": round(rate * base_cows / 100)}
+        for rate in np.linspace(*repl_range, n)
+    ])
+    _set_scenarios(pd.concat([df, variants], ignore_index=True))
+
+def _apply_alloc(df, name, alloc):
+    """최적 분배 결과를 시나리오 목록의 해당 행에 반영"""
+    df = df.copy()
+    df.loc[df["시나리오"] == name, list(alloc)] = list(alloc.values())
+    _set_scenarios(df)
+
+@st.fragment
+def render_alloc_solver(scenarios):
+    with st.expander("최적 분배 계산 (순이익 최대화)", expanded=False):
+        st.caption("※ 폐사 두수·폐사 월령은 입력값으로 고정됩니다. 출하 ≤ 투입, 분배 합계 ≤ 생산 두수 제약을 적용합니다.")
+        o1, o2, o3 = st.columns([1, 2, 1])
+        name = o1.selectbox("대상 시나리오", list(scenarios["시나리오"]), key="opt_sc")
+        repl_range = o2.slider("교체율 범위(%)", 0.0, 50.0, (5.0, 30.0), step=0.5, key="opt_rr")
+        free_kpn = o3.checkbox("KPN 위탁 두수도 최적화", value=False, key="opt_kpn")
+        row = scenarios.set_index("시나리오").loc[name]
+        fixed = {k: row[k] for k in ("kpn_male", "female_loss", "male_loss", "loss_months")}
+        if st.button("최적화 실행", key="opt_run"):
+            params = {**scenario_args({k: 0 for k in ALLOC_KEYS}), **fixed}
+            try:
+                st.session_state.opt_res = (name, optimize_allocation(params, repl_range, bounds={"kpn_male": (0, math.inf)} if free_kpn else None))
+            except ValueError as e:
+                st.session_state.pop("opt_res", None)
+                st.warning(str(e))
+
+        cached = st.session_state.get("opt_res")
+        if cached is None or cached[0] != name:
+            return
+        opt = cached[1]
+        m1, m2 = st.columns(2)
+        m1.metric("최적 순이익", f"{fmt_money(opt['Net Final'])}원")
+        m2.metric("최적 교체율", f"{opt['repl_rate']:.1f}%")
+        st.dataframe(pd.DataFrame([{SCENARIO_LABELS[k]: v for k, v in opt["alloc"].items()}]), hide_index=True, width="stretch")
+        profile = alt.Chart(opt["profile"]).mark_line(point=True, color=THEME["color_profit"]).encode(
+            x=alt.X("repl_rate:Q", title="교체율(%)"),
+            y=alt.Y("Net Final:Q", title="최대 순이익", axis=alt.Axis(format=",.0f")),
+            tooltip=[alt.Tooltip("repl_rate", format=".1f"), "annual_culls", alt.Tooltip("Net Final", format=",.0f")]
+        ).properties(width='container', height=THEME["chart_height"], title="교체율별 최대 순이익")
+        st.altair_chart(profile, width="stretch")
+        if st.button("시나리오 목록에 적용", key="opt_apply", on_click=_apply_alloc, args=(scenarios, name, opt["alloc"])):
+            st.rerun()
+
+def _apply_registry_farm(inputs):
+    """등록부의 번식우·수태율·암 성비를 사이드바 입력란에 반영 (버튼 콜백)"""
+    st.session_state.sb_base_cows = inputs["base_cows"]
+    st.session_state.sb_birth_ratio = inputs["female_birth_ratio"]
+    st.session_state.conception_rate = inputs["conception_rate"]
+    st.session_state.pop("sb_concept", None)
 
-        return {
-            "annual_culls": culls, "female_calf_sell": fsell, "female_fatten_in": ffat_in, "female_fatten_out": ffat_out, "female_loss": floss, "loss_months": loss_months,
-            "kpn_male": kpn, "male_calf_sell": msell, "male_fatten_in": mfat_in, "male_fatten_out": mfat_out, "male_loss": mloss, "repl_rate": repl_rate
-        }
+def _add_registry_scenario(df, name, inputs):
+    """등록부 이력으로 센 분배를 시나리오로 추가 (같은 이름이 있으면 그 행을 바꾼다, 폐사 월령이 없으면 기본값)"""
+    row = {"시나리오": name, **SCENARIO_DEFAULTS, **{k: inputs[k] for k in ALLOC_KEYS if k in inputs}}
+    _set_scenarios(pd.concat([df[df["시나리오"] != name], pd.DataFrame([row])], ignore_index=True))
+
+@st.fragment
+def render_registry_import(scenarios):
+    """개체 재고·이력 파일 -> 상태·월령별 두수와 실제 이력 기반 분배 (생산 가이드·시나리오 입력 대체)"""
+    with st.expander("개체 이력으로 분배 입력 (이표 단위)", expanded=False):
+        st.caption(f"재고: {', '.join(REGISTRY_COLUMNS)} · 이력: {', '.join(EVENT_COLUMNS)} (출생·송아지 판매·대체우 선발·비육 투입·비육 출하·KPN 위탁·KPN 종료·도태·폐사·체중 측정)")
+        f1, f2 = st.columns(2)
+        inv_file = f1.file_uploader("개체 재고 (CSV/Parquet 또는 저장한 .npz)", type=["csv", "parquet", "npz"], key="registry_file")
+        ev_files = f2.file_uploader("이력 (CSV/Parquet, 여러 개 가능)", type=["csv", "parquet"], accept_multiple_files=True, key="registry_events")
+        if inv_file is None and not ev_files:
+            return
+        file_ids = (inv_file.file_id if inv_file else None, *(f.file_id for f in ev_files))
+        cached = st.session_state.get("registry")
+        if cached is None or cached[0] != file_ids:
+            for f in (inv_file, *ev_files):
+                if f is not None:
+                    f.seek(0)
+            with st.spinner("등록부 생성 중..."):
+                cached = (file_ids, load_registry(inv_file, list(ev_files)))
+            st.session_state.registry = cached
+        reg = cached[1]
+        if len(reg) == 0:
+            st.warning(f"등록된 개체가 없습니다. (제외 {reg.skipped:,}행)")
+            return
+        last = reg.last_day.item()
+        r1, r2 = st.columns(2)
+        at = r1.date_input("기준일", value=last, key="registry_at")
+        months = r2.slider("이력 집계 기간(개월, 연 환산)", 1, 36, 12, key="registry_months")
+        inputs = reg.farm_inputs(at, months)
+        st.caption(f"개체 {len(reg):,}두 · 이력 {reg.n_events:,}건 (등록되지 않은 개체·형식 오류로 제외 {reg.skipped:,}행)")
+        c1, c2 = st.columns([3, 2])
+        c1.dataframe(reg.inventory(at), width="stretch")
+        c2.dataframe(reg.flow_frame(at, months), width="stretch")
+        m1, m2, m3 = st.columns(3)
+        m1.metric("번식우", f"{inputs['base_cows']:,}두")
+        m2.metric("수태율 (출생/번식우)", f"{inputs['conception_rate']:.2f}")
+        m3.metric("암 성비", f"{inputs['female_birth_ratio']:.2f}")
+        st.dataframe(pd.DataFrame([{SCENARIO_LABELS[k]: inputs[k] for k in ALLOC_KEYS if k in inputs}]), hide_index=True, width="stretch")
+        b1, b2 = st.columns(2)
+        if b1.button("농장 설정에 반영 (번식우·수태율·암 성비)", on_click=_apply_registry_farm, args=(inputs,), key="registry_farm"):
+            st.rerun()
+        if b2.button("시나리오 목록에 추가", on_click=_add_registry_scenario, args=(scenarios, f"개체 이력 ({at})", inputs), key="registry_add"):
+            st.rerun()
+
+# 보고서 구성 -> (layout, 산출 근거 포함)
+REPORT_LAYOUTS = {"시나리오당 한 행 (wide)": ("wide", False), "항목별 행 + 산출 근거 (long)": ("long", True)}
+
+def render_report_export(scenario_params):
+    """시나리오 목록 또는 업로드한 농장 파일 전체를 청크 단위로 평가해 한 파일로 내려받기 (클릭할 때 생성)"""
+    with st.expander("보고서 내보내기", expanded=False):
+        st.caption("※ 농장 파일은 한 행 = 한 농장, 컬럼명 = 입력 인자명 (id 컬럼: farm_id). 파일에 없는 입력은 기준 시나리오 값으로 채웁니다.")
+        r1, r2, r3 = st.columns(3)
+        fmt = r1.selectbox("형식", list(EXPORT_FORMATS), key="rep_fmt")
+        layout, with_basis = REPORT_LAYOUTS[r2.selectbox("구성", list(REPORT_LAYOUTS), key="rep_layout")]
+        base = r3.selectbox("기준 시나리오", list(scenario_params), key="rep_base")
+        upload = st.file_uploader("농장 파일 (선택, CSV/Parquet)", type=["csv", "parquet"], key="rep_file")
+        if upload is None:
+            source = {"farm_id": list(scenario_params), **{k: [p[k] for p in scenario_params.values()] for k in SCENARIO_ARGS}}
+            label = f"시나리오 {len(scenario_params)}개"
+        else:
+            source = io.BytesIO(upload.getvalue())
+            source.name = upload.name
+            label = upload.name
+        defaults = scenario_params[base]
+        mime, ext = EXPORT_FORMATS[fmt]
+
+        def build():
+            # 별도 스레드에서 실행되므로 세션 상태를 건드리지 않고 위에서 정한 값만 쓴다
+            if upload is not None:
+                source.seek(0)
+            out = io.BytesIO()
+            export_report(source, out, fmt, layout=layout, with_basis=with_basis, defaults=defaults, id_column="farm_id")
+            return out.getvalue()
+
+        st.download_button(f"{label} 보고서 받기 ({ext})", data=build, file_name=f"hanwoo_report{ext}", mime=mime,
+                           on_click="ignore", key="rep_download")
+
+def create_analysis_chart(added_revenue, added_cost, net_profit):
+    chart_df = pd.DataFrame([
+        {"Type": "1. 유전적 수익", "Amount": added_revenue, "Category": "수익"},
+        {"Type": "2. 추가 비용", "Amount": -added_cost, "Category": "비용"},
+        {"Type": "3. 분석 순이익", "Amount": net_profit, "Category": "순이익"}
+    ])
+    return alt.Chart(chart_df).mark_bar(size=60).encode(
+        x=alt.X("Type", axis=alt.Axis(labelAngle=0, title=None)),
+        y=alt.Y("Amount", axis=alt.Axis(format=",.0f")),
+        color=alt.Color("Category", scale=_ANALYSIS_SCALE),
+        tooltip=[alt.Tooltip("Type"), alt.Tooltip("Amount", format=",.0f")]
+    ).properties(title="경제적 분석 결과 비교")
+
+# 다세대 개량 전망의 교체율 스윕 범위 (%)
+GENETIC_SWEEP: tuple[float, float, float] = (5.0, 40.0, 1.0)
+
+@memoize(32)
+def genetic_projection(params, weights, years, discount, options):
+    """교체율 5~40% 스윕 (한 번의 배치) -> (요약 표, 연도별 궤적 표)"""
+    lo, hi, step = GENETIC_SWEEP
+    rates = np.arange(lo, hi + step / 2, step) / 100
+    return genetic_gain_frames(project_genetic_gain(params, weights, rates, years=years, discount=discount, **options))
+
+def create_genetic_npv_chart(summary, base_rate):
+    """교체율별 순이익 NPV (기준 시나리오 교체율 표시)"""
+    line = alt.Chart(summary).mark_line(point=True, color=THEME["color_profit"]).encode(
+        x=alt.X("교체율(%):Q"), y=alt.Y("순이익 NPV:Q", axis=alt.Axis(format=",.0f"), scale=alt.Scale(zero=False)),
+        tooltip=[alt.Tooltip("교체율(%)", format=".1f"), alt.Tooltip("선발 강도", format=".2f"), alt.Tooltip("암소 세대간격(년)", format=".1f"),
+                 alt.Tooltip("유전 수익 NPV", format=",.0f"), alt.Tooltip("순이익 NPV", format=",.0f")],
+    )
+    rule = alt.Chart(pd.DataFrame({"교체율(%)": [base_rate]})).mark_rule(color="gray", strokeDash=[4, 4]).encode(x="교체율(%):Q")
+    return (line + rule).properties(width='container', height=THEME["chart_height"], title="교체율별 순이익 순현재가치 (유전 수익 포함)")
+
+def create_genetic_trajectory_chart(trajectory, shown):
+    """연도별 송아지 평균 개량 가치 (선택한 교체율만)"""
+    df = trajectory[trajectory["교체율(%)"].isin(shown)]
+    return alt.Chart(df).mark_line().encode(
+        x=alt.X("연도:Q"), y=alt.Y("개량 가치(원/두):Q", axis=alt.Axis(format=",.0f")),
+        color=alt.Color("교체율(%):O", scale=alt.Scale(scheme="viridis")),
+        tooltip=["연도", alt.Tooltip("교체율(%)", format=".1f"), alt.Tooltip("개량 가치(원/두)", format=",.0f"),
+                 *[alt.Tooltip(t, format=".2f") for t in GENETIC_TRAITS]],
+    ).properties(width='container', height=THEME["chart_height"], title="송아지 평균 개량 가치 추이")
+
+@memoize(32)
+def evaluate_scenarios(args_list, names):
+    """시나리오 목록 -> (시나리오, 구분, 항목, 금액) long-format 표 (한 번의 배치 평가)"""
+    batch = compute_scenario_batch({k: [a[k] for a in args_list] for k in SCENARIO_ARGS})
+    return line_items_frame(batch, ids=names, layout="long")
+
+@memoize(32)
+def comparison_table(df_items):
+    """항목 × 시나리오 금액 표 (프로세스 공유 캐시 - Styler 는 세션마다 새로 만든다)"""
+    names = list(dict.fromkeys(df_items["id"]))
+    table = df_items.pivot_table(index=["구분", "항목"], columns="id", values="금액 (Amount)", observed=True, sort=False)
+    return table[names]
+
+def create_scenario_net_chart(df_items, repl_rates):
+    """시나리오별 순이익 막대 (long-format 표의 순이익 행)"""
+    names = list(dict.fromkeys(df_items["id"]))
+    df = df_items[df_items["구분"] == "결과"].assign(교체율=repl_rates)
+    return alt.Chart(df).mark_bar().encode(
+        x=alt.X("id:N", sort=names, title=None, axis=alt.Axis(labelAngle=-45 if len(names) > 6 else 0, labelLimit=160)),
+        y=alt.Y("금액 (Amount):Q", title="순이익", axis=alt.Axis(format=",.0f")),
+        color=alt.Color("id:N", scale=scenario_scale(names), legend=None),
+        tooltip=[alt.Tooltip("id", title="시나리오"), alt.Tooltip("교체율", format=".1f"), alt.Tooltip("금액 (Amount)", title="순이익", format=",.0f")]
+    ).properties(width='container', height=THEME["chart_height"], title="시나리오별 순이익 (1년)")
 
 tabs = st.tabs([
-    "교체율 설정 A", 
-    "교체율 설정 B", 
+    "시나리오 설정·비교", 
     "분석: 교체율 vs 개량효과", 
+    "위험 분석 (몬테카를로)", 
+    "민감도 분석", 
     " [부록] 비육우 매출 상세", 
     " [부록] 비용 상세 설정"
 ])
-tab_a, tab_b, tab_analysis, tab_revenue, tab_cost = tabs
+tab_scenarios, tab_analysis, tab_risk, tab_sens, tab_revenue, tab_cost = tabs
 
 # =============================================================================
-# TABS 1~5: 경제성 분석
+# TABS 1~4: 경제성 분석
 # =============================================================================
 
-inputs_a = get_alloc_inputs(tab_a, "A")
-inputs_b = get_alloc_inputs(tab_b, "B")
-sc_name_a = f"교체율 {inputs_a['repl_rate']:.1f}%"
-sc_name_b = f"교체율 {inputs_b['repl_rate']:.1f}%"
-res_a = run_base_calc(sc_name_a, inputs_a)
-res_b = run_base_calc(sc_name_b, inputs_b)
+with tab_scenarios, profiler.phase("scenario_editor"):
+    st.info(f"생산 가이드 | 암송아지: **{birth_female:.1f}두** | 수송아지: **{birth_male:.1f}두**")
+    edited_scenarios = st.data_editor(
+        st.session_state.scenarios, num_rows="dynamic", hide_index=True, width="stretch", key="editor_scenarios",
+        column_config={"시나리오": st.column_config.TextColumn("시나리오"),
+                       **{k: st.column_config.NumberColumn(label, min_value=0, step=1, format="%d") for k, label in SCENARIO_LABELS.items()}},
+    )
+    scenarios = clean_scenarios(edited_scenarios)
+    if scenarios.empty:
+        scenarios = clean_scenarios(pd.DataFrame([{"시나리오": "시나리오 A", **SCENARIO_DEFAULTS}]))
+    for problem in scenario_warnings(scenarios):
+        st.error(problem)
+    with st.expander("교체율 변형 추가", expanded=False):
+        v1, v2, v3 = st.columns([1, 2, 1])
+        var_base = v1.selectbox("기준 시나리오", list(scenarios["시나리오"]), key="var_base")
+        var_range = v2.slider("교체율 범위(%)", 0.0, 50.0, (5.0, 30.0), step=0.5, key="var_range")
+        var_n = v3.number_input("변형 수", min_value=2, max_value=100, value=10, step=1, key="var_n")
+        st.button("목록에 추가", on_click=_add_repl_variants, args=(scenarios, var_base, var_range, int(var_n)), key="var_add")
+    render_alloc_solver(scenarios)
+    render_registry_import(scenarios)
+
+scenario_names = list(scenarios["시나리오"])
+scenario_params = {name: scenario_args(alloc) for name, alloc in zip(scenario_names, scenarios[list(ALLOC_KEYS)].to_dict("records"))}
+repl_rates = (scenarios["annual_culls"] / base_cows * 100 if base_cows > 0 else scenarios["annual_culls"] * 0.0).to_numpy()
 
-with tab_a:
-    st.divider()
-    st.metric("순이익 (Net Profit)", f"{fmt_money(res_a['Net Final'])}원")
-    c1, c2 = st.columns([1.5, 1])
-    with c1: st.altair_chart(create_net_profit_chart(res_a, res_b), use_container_width=True)
-    with c2: st.altair_chart(create_pie_chart(res_a), use_container_width=True)
-    st.subheader("상세 계산 내역")
-    st.dataframe(make_excel_view(res_a).style.format({"금액 (Amount)": "{:,.0f}"}), use_container_width=True)
+with profiler.phase("compute_scenario"):
+    df_items = evaluate_scenarios(list(scenario_params.values()), scenario_names)
 
-with tab_b:
+with tab_scenarios, profiler.phase("tab:compare"):
     st.divider()
-    st.metric("순이익 (Net Profit)", f"{fmt_money(res_b['Net Final'])}원")
-    c1, c2 = st.columns([1.5, 1])
-    with c1: st.altair_chart(create_net_profit_chart(res_a, res_b), use_container_width=True)
-    with c2: st.altair_chart(create_pie_chart(res_b), use_container_width=True)
+    net = df_items.loc[df_items["구분"] == "결과", "금액 (Amount)"].to_numpy()
+    best = int(np.argmax(net))
+    k1, k2, k3 = st.columns(3)
+    k1.metric("시나리오 수", f"{len(scenario_names)}개")
+    k2.metric("최고 순이익 시나리오", scenario_names[best], f"교체율 {repl_rates[best]:.1f}%", delta_color="off")
+    k3.metric("최고 순이익 (Net Profit)", f"{fmt_money(net[best])}원")
+    c1, c2 = st.columns(2)
+    with c1, profiler.phase("chart:scenario_net"): st.altair_chart(create_scenario_net_chart(df_items, repl_rates), width="stretch")
+    # 다년 추이: 모든 시나리오를 월 단위 축군 시뮬레이션으로 한 번에 진행
+    with c2: render_net_profit_trajectory(scenario_params)
+    st.subheader("시나리오 비교 (항목별 금액)")
+    with profiler.phase("style:comparison"):
+        st.dataframe(comparison_table(df_items).style.format("{:,.0f}"), width="stretch")
+
     st.subheader("상세 계산 내역")
-    st.dataframe(make_excel_view(res_b).style.format({"금액 (Amount)": "{:,.0f}"}), use_container_width=True)
+    detail_name = st.selectbox("시나리오", scenario_names, key="detail_sc")
+    res_detail = compute_scenario(detail_name, **scenario_params[detail_name])
+    c1, c2 = st.columns([1.5, 1])
+    with c1, profiler.phase("style:excel_view"): st.dataframe(excel_view(res_detail).style.format({"금액 (Amount)": "{:,.0f}"}), width="stretch")
+    with c2, profiler.phase("chart:pie"): st.altair_chart(create_pie_chart(res_detail), width="stretch")
+    with profiler.phase("report_export"):
+        render_report_export(scenario_params)
 
-with tab_analysis:
+@st.fragment
+@profiler.wrap("tab:analysis")
+def render_analysis_tab(scenario_params):
     st.header("분석: 교체율 증가 vs 개량 이득")
+    names = list(scenario_params)
     col_setup, col_result = st.columns([1, 1.2])
     with col_setup:
+        s1, s2 = st.columns(2)
+        name_a = s1.selectbox("기준 시나리오", names, index=0, key="ana_base")
+        name_b = s2.selectbox("비교 시나리오", names, index=min(1, len(names) - 1), key="ana_cmp")
+        res_a = compute_scenario(name_a, **scenario_params[name_a])
+        res_b = compute_scenario(name_b, **scenario_params[name_b])
         cull_a = res_a['n_cull']
         cull_b = res_b['n_cull']
         extra_repl = cull_b - cull_a
-        rate_diff = inputs_b['repl_rate'] - inputs_a['repl_rate']
-        st.metric("추가 교체 두수 (B-A)", f"{extra_repl}두", f"교체율 {rate_diff:+.1f}%p")
-        if extra_repl <= 0: st.warning("시나리오 B의 교체율이 A보다 높아야 교체율 증가 비용이 계산됩니다.")
+        rate_diff = (cull_b - cull_a) / res_a['n_base'] * 100
+        st.metric("추가 교체 두수 (비교-기준)", f"{extra_repl}두", f"교체율 {rate_diff:+.1f}%p")
+        if extra_repl <= 0: st.warning("비교 시나리오의 교체율이 기준 시나리오보다 높아야 교체율 증가 비용이 계산됩니다.")
         st.markdown("**예상 개량 형질 입력 (증분 Δ)**")
         g1, g2 = st.columns(2)
         d_cw = g1.number_input("도체중 (CW) 증분 (kg)", value=5.0)
@@ -459,18 +791,7 @@ with tab_analysis:
         
         net_profit = added_revenue_b - added_cost
         
-        chart_df = pd.DataFrame([
-            {"Type": "1. 유전적 수익", "Amount": added_revenue_b, "Category": "수익"},
-            {"Type": "2. 추가 비용", "Amount": -added_cost, "Category": "비용"},
-            {"Type": "3. 분석 순이익", "Amount": net_profit, "Category": "순이익"}
-        ])
-        chart = alt.Chart(chart_df).mark_bar(size=60).encode(
-            x=alt.X("Type", axis=alt.Axis(labelAngle=0, title=None)),
-            y=alt.Y("Amount", axis=alt.Axis(format=",.0f")),
-            color=alt.Color("Category", scale=_ANALYSIS_SCALE),
-            tooltip=[alt.Tooltip("Type"), alt.Tooltip("Amount", format=",.0f")]
-        ).properties(title="경제적 분석 결과 비교")
-        st.altair_chart(chart, use_container_width=True)
+        st.altair_chart(create_analysis_chart(added_revenue_b, added_cost, net_profit), width="stretch")
 
         st.divider()
         st.subheader("상세 계산 내역")
@@ -482,33 +803,243 @@ with tab_analysis:
             "단가(원)": [econ_cw, econ_ms, econ_ema, econ_bft],
             "가치(원)": [val_cw, val_ms, val_ema, val_bft]
         })
-        st.dataframe(df_prem, hide_index=True, use_container_width=True)
+        st.dataframe(df_prem, hide_index=True, width="stretch")
         st.caption(f"합계 (두당 가치): {fmt_money(premium_per_head)}원")
         
         st.markdown("**2. 시나리오별 비육우 출하 두수 및 수익**")
         st.caption("※ 계산 대상: 자가비육 출하(암/수) + 외부비육 출하 (송아지 판매 제외)")
         df_vol = pd.DataFrame([
-            {"시나리오": "시나리오 A", "비육우 출하(두)": target_cattle_a, "적용단가(원)": premium_per_head, "유전적 수익(가정)": added_revenue_a},
-            {"시나리오": "시나리오 B", "비육우 출하(두)": target_cattle_b, "적용단가(원)": premium_per_head, "유전적 수익(실제)": added_revenue_b}
+            {"시나리오": name_a, "비육우 출하(두)": target_cattle_a, "적용단가(원)": premium_per_head, "유전적 수익(가정)": added_revenue_a},
+            {"시나리오": name_b, "비육우 출하(두)": target_cattle_b, "적용단가(원)": premium_per_head, "유전적 수익(실제)": added_revenue_b}
         ])
-        st.dataframe(df_vol, hide_index=True, use_container_width=True)
+        st.dataframe(df_vol, hide_index=True, width="stretch")
         
         st.markdown("**3. 최종 순이익 산출**")
-        st.write("순이익 = (시나리오 B 유전적 수익) - (교체율 증가 비용)")
+        st.write("순이익 = (비교 시나리오 유전적 수익) - (교체율 증가 비용)")
         st.write(f"{fmt_money(net_profit)}원 = {fmt_money(added_revenue_b)}원 - {fmt_money(added_cost)}원")
 
-with tab_revenue:
+    st.divider()
+    st.subheader("다세대 개량 전망 (교체율 5~40%)")
+    st.caption("위 계산은 1년 치 개량 가치만 반영합니다. 아래는 교체율에 따른 선발 강도·세대 간격으로 세대마다 누적되는 개량을 추적하고, "
+               "자가 비육우 출하분의 개량 가치와 1년 손익을 할인해 순현재가치로 비교합니다 (기준 시나리오의 분배 사용, 도태 두수만 변경).")
+    h1, h2, h3 = st.columns(3)
+    years = h1.slider("전망 기간 (년)", 5, 40, 20, key="gen_years")
+    discount = h2.number_input("할인율 (%)", 0.0, 20.0, 5.0, step=0.5, key="gen_disc") / 100
+    dam_acc = h3.number_input("암소 선발 정확도", 0.0, 1.0, GENETIC_DEFAULTS["dam_accuracy"], step=0.05, key="gen_dam_acc")
+    with st.expander("종모우(KPN) 경로 · 연령 설정", expanded=False):
+        k1, k2, k3, k4 = st.columns(4)
+        sire_i = k1.number_input("종모우 선발 강도", 0.0, 3.5, GENETIC_DEFAULTS["sire_intensity"], step=0.1, key="gen_sire_i")
+        sire_acc = k2.number_input("종모우 정확도", 0.0, 1.0, GENETIC_DEFAULTS["sire_accuracy"], step=0.05, key="gen_sire_acc")
+        sire_l = k3.number_input("종모우 세대간격 (년)", 1.0, 15.0, GENETIC_DEFAULTS["sire_interval"], step=0.5, key="gen_sire_l")
+        first_calving = k4.number_input("초산 연령 (년)", 1.5, 4.0, GENETIC_DEFAULTS["first_calving_years"], step=0.5, key="gen_first")
+    options = {"sire_intensity": sire_i, "sire_accuracy": sire_acc, "sire_interval": sire_l, "dam_accuracy": dam_acc,
+               "first_calving_years": first_calving, "slaughter_years": max(1, round(max(ship_m_f, ship_m_m) / 12))}
+    weights = {"CW": econ_cw, "MS": econ_ms, "EMA": econ_ema, "BFT": econ_bft}
+    with profiler.phase("genetic_projection"):
+        summary, trajectory = genetic_projection(scenario_params[name_a], weights, years, discount, options)
+    base_rate = cull_a / res_a['n_base'] * 100
+    short = summary[~summary["대체우 충분"]]
+    # NPV 최대 교체율은 대체우를 자가 생산으로 채울 수 있는 교체율 중에서 고른다 (모두 부족하면 전체에서)
+    npv = summary["순이익 NPV"].where(summary["대체우 충분"]) if summary["대체우 충분"].any() else summary["순이익 NPV"]
+    best = summary.loc[npv.idxmax()]
+    m1, m2, m3 = st.columns(3)
+    m1.metric("NPV 최대 교체율", f"{best['교체율(%)']:.0f}%", f"기준 {base_rate:.1f}%", delta_color="off")
+    m2.metric("최대 순이익 NPV", f"{fmt_money(best['순이익 NPV'])}원")
+    final = trajectory[(trajectory["연도"] == years) & (trajectory["교체율(%)"] == best["교체율(%)"])]
+    m3.metric(f"{years}년 후 송아지 개량 가치 (NPV 최대 교체율)", f"{fmt_money(final['개량 가치(원/두)'].iloc[0])}원/두")
+    if len(short):
+        st.warning(f"교체율 {short['교체율(%)'].min():.0f}% 이상은 연간 암송아지 생산 두수보다 대체우가 많이 필요해 선발 없이 전부 남기는 것으로 계산했습니다.")
+    g1, g2 = st.columns(2)
+    with g1: st.altair_chart(create_genetic_npv_chart(summary, base_rate), width="stretch")
+    shown = tuple(summary["교체율(%)"].iloc[::max(1, len(summary) // 6)])
+    with g2: st.altair_chart(create_genetic_trajectory_chart(trajectory, shown), width="stretch")
+    st.dataframe(summary, hide_index=True, width="stretch", column_config={
+        **{c: st.column_config.NumberColumn(format="%.2f") for c in ("대체우 선발 비율", "선발 강도", "암소 세대간격(년)", *(f"{t} 개량량" for t in GENETIC_TRAITS))},
+        **{c: st.column_config.NumberColumn(format="%d") for c in ("연간 개량량(원/두)", "1년 순이익", "유전 수익 NPV", "순이익 NPV")},
+    })
+
+@st.fragment
+@profiler.wrap("tab:risk")
+def render_risk_tab(scenario_params):
+    st.header("위험 분석: 순이익 분포")
+    st.caption("수태율·성비(베타), 송아지·도태우 가격(정규), 등급 출현율(디리클레)을 확률 분포로 뽑아 농장-연도 단위로 평가합니다.")
+    r1, r2, r3, r4 = st.columns(4)
+    risk_sc = r1.selectbox("대상 시나리오", list(scenario_params), key="risk_sc")
+    risk_n = r2.selectbox("표본 수", [100_000, 1_000_000, 5_000_000], index=1, format_func=lambda n: f"{n:,}", key="risk_n")
+    risk_cv = r3.number_input("가격 변동계수(CV)", value=0.15, step=0.01, min_value=0.0, key="risk_cv")
+    risk_conc = r4.number_input("등급 출현율 집중도", value=200.0, step=10.0, min_value=1.0, key="risk_conc")
+    if st.button("시뮬레이션 실행", key="risk_run"):
+        params = scenario_params[risk_sc]
+        with st.spinner("시뮬레이션 중..."):
+            st.session_state.risk_res = simulate_risk(
+                params, default_risk_spec(params, risk_cv, risk_conc),
+                {"cow_grade_ratio": table("df_cow"), "steer_grade_ratio": table("df_steer")},
+                n=risk_n, seed=0,
+            )
+
+    risk_res = st.session_state.get("risk_res")
+    if risk_res is not None:
+        k1, k2, k3, k4 = st.columns(4)
+        k1.metric("P5 순이익", f"{fmt_money(risk_res['p5'])}원")
+        k2.metric("P50 순이익", f"{fmt_money(risk_res['p50'])}원")
+        k3.metric("P95 순이익", f"{fmt_money(risk_res['p95'])}원")
+        k4.metric("손실 확률", f"{risk_res['prob_loss'] * 100:.2f}%")
+        cdf = alt.Chart(sketch_cdf(risk_res["sketch"])).mark_line(color=THEME["color_a"]).encode(
+            x=alt.X("Net Final:Q", title="순이익", axis=alt.Axis(format=",.0f")),
+            y=alt.Y("Probability:Q", title="누적확률", axis=alt.Axis(format="%")),
+            tooltip=[alt.Tooltip("Net Final", format=",.0f"), alt.Tooltip("Probability", format=".0%")]
+        ).properties(width='container', height=THEME["chart_height"], title=f"순이익 누적분포 ({risk_res['n']:,}회)")
+        st.altair_chart(cdf, width="stretch")
+
+def render_grading_import():
+    """등급판정 자료(CSV/Parquet) -> 기간·농가별 등급 출현율/도체중/단가로 등급표 자동 입력"""
+    with st.expander("등급판정 자료로 자동 입력 (CSV/Parquet)", expanded=False):
+        st.caption("컬럼: 판정일자(date), 농가(farm, 선택), 성별(sex: 암/수·거세), 등급(grade), 도체중(weight), 경락단가(price)")
+        upload = st.file_uploader("등급판정 자료", type=["csv", "parquet"], key="grading_file")
+        if upload is None:
+            return
+        cached = st.session_state.get("grading_index")
+        if cached is None or cached[0] != upload.file_id:
+            with st.spinner("집계 색인 생성 중..."):
+                cached = (upload.file_id, build_grade_index(upload))
+            st.session_state.grading_index = cached
+        index = cached[1]
+        if index.n_records == 0:
+            st.warning(f"유효한 판정 기록이 없습니다. (제외 {index.skipped:,}행)")
+            return
+        lo, hi = (d.item() for d in index.date_range)
+        g1, g2 = st.columns(2)
+        window = g1.date_input("기간", value=(lo, hi), min_value=lo, max_value=hi, key="grading_window")
+        farms = g2.multiselect("농가 (비우면 전체)", index.farms.tolist(), key="grading_farms")
+        start, end = (window[0], window[-1]) if window else (lo, hi)
+        counts = index.query(start, end, farms or None)[..., 0].sum(axis=1)
+        st.caption(f"선택 구간 판정 두수: 암 {int(counts[0]):,}두 · 수 {int(counts[1]):,}두 (형식 오류로 제외 {index.skipped:,}행)")
+        if st.button("등급표에 반영", key="grading_apply", disabled=counts.sum() == 0):
+            cow, steer = index.grade_tables(start, end, farms or None, base=(table("df_cow"), table("df_steer")))
+            set_table("df_cow", cow)
+            set_table("df_steer", steer)
+            for editor_key in ("editor_cow", "editor_steer"):
+                st.session_state.pop(editor_key, None)
+            st.rerun()
+
+@memoize(16)
+def tornado_table(params, rel):
+    """토네이도 (입력 수 × 2 행 배치, 입력이 바뀔 때마다 바로 다시 계산)"""
+    return tornado(params, default_ranges(params, rel))
+
+@memoize(16)
+def sobol_table(params, rel, n):
+    """Sobol 지수 (같은 표본으로 순이익·수익·비용 모두 계산, 표본이 커서 실행 버튼으로만 계산)"""
+    return sobol_indices(params, default_ranges(params, rel), n=n)
+
+def create_tornado_chart(df_tor, top):
+    df = df_tor.head(top)
+    base = df["base"].iloc[0] if len(df) else 0
+    bars = alt.Chart(df).mark_bar().encode(
+        y=alt.Y("input:N", sort=list(df["input"]), title=None),
+        x=alt.X("low:Q", title=df_tor["output"].iloc[0] if len(df_tor) else "", axis=alt.Axis(format=",.0f")),
+        x2="high:Q",
+        color=alt.condition(alt.datum.high >= alt.datum.low, alt.value(THEME["color_a"]), alt.value(THEME["color_b"])),
+        tooltip=["input", alt.Tooltip("low_value", format=",.3~f"), alt.Tooltip("high_value", format=",.3~f"),
+                 alt.Tooltip("low", format=",.0f"), alt.Tooltip("high", format=",.0f"), alt.Tooltip("swing", format=",.0f")]
+    )
+    rule = alt.Chart(pd.DataFrame({"base": [base]})).mark_rule(color="gray", strokeDash=[4, 4]).encode(x="base:Q")
+    return (bars + rule).properties(width='container', height=max(THEME["chart_height"], 22 * len(df)), title="토네이도 (입력 하나씩 범위 양끝)")
+
+def create_sobol_chart(df_sobol, top):
+    df = df_sobol.head(top).melt(id_vars=["input"], value_vars=["S1", "ST"], var_name="지수", value_name="값")
+    return alt.Chart(df).mark_bar().encode(
+        y=alt.Y("input:N", sort=list(df_sobol["input"].head(top)), title=None),
+        x=alt.X("값:Q", title="Sobol 지수", axis=alt.Axis(format=".0%")),
+        yOffset="지수:N",
+        color=alt.Color("지수:N", scale=alt.Scale(domain=["S1", "ST"], range=[THEME["color_a"], THEME["color_profit"]])),
+        tooltip=["input", "지수", alt.Tooltip("값", format=".3f")]
+    ).properties(width='container', height=max(THEME["chart_height"], 30 * min(top, len(df_sobol))), title="Sobol 지수 (S1: 단독 기여, ST: 상호작용 포함)")
+
+# 손익분기 표 행: (항목, 손익분기 대상, 인자, 도체중 기준 표 번호 (지육단가 행) 또는 None)
+BREAK_EVEN_ROWS: tuple[tuple[str, str, str, int | None], ...] = (
+    ("송아지 가격 - 암 (원/두)", "calf_price", "price_calf_female", None),
+    ("송아지 가격 - 수 (원/두)", "calf_price", "price_calf_male", None),
+    ("비육우 가격 - 암 (원/두)", "carcass_price", "price_fatten_female", None),
+    ("비육우 가격 - 수 (원/두)", "carcass_price", "price_fatten_male", None),
+    ("평균 지육단가 - 암 (원/kg)", "carcass_price", "price_fatten_female", 0),
+    ("평균 지육단가 - 수 (원/kg)", "carcass_price", "price_fatten_male", 1),
+    ("수태율", "conception_rate", "conception_rate", None),
+    ("비육우 연간 사육비 (원/두)", "fatten_cost", "cost_fatten_avg_y", None),
+)
+
+@memoize(32)
+def break_even_table(params, df_cow, df_steer):
+    """순이익이 0 이 되는 입력값과 한계효과 (단항식 모형의 닫힌 해 / 해석적 미분).
+    송아지·비육우 가격은 암수를 같은 비율로 움직인 값이며 지육단가 행은 비육우 가격 ÷ 평균 도체중 (Σ 출현율 × 도체중) 이다."""
+    model = compile_scenario(params)
+    solved = {t: break_even(params, t) for t in BREAK_EVEN_TARGETS}
+    weights = [float((df["Ratio(%)"] / 100 * df["Weight(kg)"]).sum()) for df in (df_cow, df_steer)]
+    rows = []
+    for label, target, arg, table in BREAK_EVEN_ROWS:
+        per = weights[table] if table is not None else 1.0
+        if per <= 0:
+            continue
+        current = float(params[arg]) / per
+        be = float(solved[target][arg][()]) / per
+        rows.append({
+            "항목": label, "현재값": current, "손익분기값": be,
+            "변화율(%)": (be / current - 1) * 100 if current else np.nan,
+            "한계효과 (순이익/단위)": float(model.partial(arg)) * per,
+        })
+    return pd.DataFrame(rows)
+
+@st.fragment
+@profiler.wrap("tab:sensitivity")
+def render_sensitivity_tab(scenario_params):
+    st.header("민감도 분석: 어떤 입력이 결과를 좌우하는가")
+    st.caption("각 입력을 기준값 ± 범위에서 균등분포로 보고, 토네이도(하나씩 변경)와 Sobol 지수(준난수 표본, 분산 분해)를 계산합니다. 값이 0인 입력은 제외됩니다.")
+    s1, s2, s3, s4 = st.columns(4)
+    sens_sc = s1.selectbox("대상 시나리오", list(scenario_params), key="sens_sc")
+    sens_rel = s2.slider("입력 변동 범위(±%)", 5, 50, 20, step=5, key="sens_rel")
+    sens_n = s3.selectbox("Sobol 표본 (기본 행렬)", [1024, 4096, 16384], index=1, format_func=lambda n: f"{n:,}", key="sens_n")
+    sens_out = s4.radio("결과 지표", SENSITIVITY_OUTPUTS, format_func={"Net Final": "순이익", "Rev Final": "수익", "Cost Final": "비용"}.get, key="sens_out")
+    params = scenario_params[sens_sc]
+    df_tor = tornado_table(params, sens_rel / 100)
+    top = 15
+    c1, c2 = st.columns(2)
+    with c1: st.altair_chart(create_tornado_chart(df_tor[df_tor["output"] == sens_out].reset_index(drop=True), top), width="stretch")
+    # Sobol 은 표본 × (입력 수 + 2) 회 평가라 위험 분석처럼 버튼을 눌렀을 때만 계산하고, 입력이 그대로인 동안만 결과를 보여 준다
+    sobol_key = (sens_sc, sens_rel, sens_n, stable_hash(params))
+    n_inputs = len(default_ranges(params, sens_rel / 100))
+    if c2.button("Sobol 지수 계산", key="sens_run", help=f"{sens_n:,} × ({n_inputs} + 2) = {sens_n * (n_inputs + 2):,}회 평가"):
+        with c2, st.spinner("평가 중..."):
+            st.session_state.sens_res = (sobol_key, sobol_table(params, sens_rel / 100, sens_n))
+    cached = st.session_state.get("sens_res")
+    if cached is not None and cached[0] == sobol_key:
+        df_sobol = cached[1]
+        with c2: st.altair_chart(create_sobol_chart(df_sobol[df_sobol["output"] == sens_out].reset_index(drop=True), top), width="stretch")
+        st.caption(f"Sobol 평가: {sens_n:,} × ({n_inputs} + 2) = {sens_n * (n_inputs + 2):,}회 (한 번의 배치 평가로 세 지표 공통)")
+    else:
+        c2.caption("Sobol 지수는 'Sobol 지수 계산' 을 눌러야 계산합니다 (입력을 바꾸면 다시 눌러야 합니다).")
+
+    st.subheader("손익분기점 · 한계효과")
+    st.caption("순이익이 0 이 되는 값 (다른 입력은 고정). 해가 없으면 (예: 가격이 0 이어도 흑자) 빈칸입니다. 한계효과는 입력 1단위 증가 시 순이익 변화입니다.")
+    value_fmt = lambda v: f"{v:,.3f}" if abs(v) < 10 else f"{v:,.0f}"
+    st.dataframe(break_even_table(params, table("df_cow"), table("df_steer")).style.format({
+        "현재값": value_fmt, "손익분기값": value_fmt, "변화율(%)": "{:+.1f}", "한계효과 (순이익/단위)": "{:,.0f}",
+    }, na_rep=""), width="stretch", hide_index=True)
+
+@st.fragment
+@profiler.wrap("tab:revenue")
+def render_revenue_tab():
     st.header("4. 비육우 매출 상세 설정")
-    edited_cow = st.data_editor(st.session_state.df_cow, column_config={"Ratio(%)": st.column_config.NumberColumn("출현율(%)", format="%.1f%%"), "Price(KRW/kg)": st.column_config.NumberColumn("지육단가(원/kg)", format="%d"), "Weight(kg)": st.column_config.NumberColumn("도체중(kg)", format="%d")}, use_container_width=True, key="editor_cow")
+    render_grading_import()
+    edited_cow = st.data_editor(table("df_cow"), column_config={"Ratio(%)": st.column_config.NumberColumn("출현율(%)", format="%.1f%%"), "Price(KRW/kg)": st.column_config.NumberColumn("지육단가(원/kg)", format="%d"), "Weight(kg)": st.column_config.NumberColumn("도체중(kg)", format="%d")}, width="stretch", key="editor_cow")
     if isinstance(edited_cow, pd.DataFrame):
-        st.session_state.df_cow = edited_cow
-        calc_cow_price = calculate_avg_price(st.session_state.df_cow)
+        set_table("df_cow", edited_cow)
+    calc_cow_price = table_avg_price("df_cow")
     st.success(f"계산된 암비육우 평균 가격: **{fmt_money(calc_cow_price)}원**")
     st.markdown("---")
-    edited_steer = st.data_editor(st.session_state.df_steer, column_config={"Ratio(%)": st.column_config.NumberColumn("출현율(%)", format="%.1f%%"), "Price(KRW/kg)": st.column_config.NumberColumn("지육단가(원/kg)", format="%d"), "Weight(kg)": st.column_config.NumberColumn("도체중(kg)", format="%d")}, use_container_width=True, key="editor_steer")
+    edited_steer = st.data_editor(table("df_steer"), column_config={"Ratio(%)": st.column_config.NumberColumn("출현율(%)", format="%.1f%%"), "Price(KRW/kg)": st.column_config.NumberColumn("지육단가(원/kg)", format="%d"), "Weight(kg)": st.column_config.NumberColumn("도체중(kg)", format="%d")}, width="stretch", key="editor_steer")
     if isinstance(edited_steer, pd.DataFrame):
-        st.session_state.df_steer = edited_steer
-        calc_steer_price = calculate_avg_price(st.session_state.df_steer)
+        set_table("df_steer", edited_steer)
+    calc_steer_price = table_avg_price("df_steer")
     st.success(f"계산된 수비육우 평균 가격: **{fmt_money(calc_steer_price)}원**")
     
     st.markdown("#### 매출 산출 상세 내역")
@@ -516,8 +1047,63 @@ with tab_revenue:
     rev_breakdown.append({"구분": "암비육우", "계산식": "Σ (지육단가 × 도체중 × 출현율)", "결과": f"{fmt_money(calc_cow_price)}원"})
     rev_breakdown.append({"구분": "수비육우", "계산식": "Σ (지육단가 × 도체중 × 출현율)", "결과": f"{fmt_money(calc_steer_price)}원"})
     st.table(pd.DataFrame(rev_breakdown))
+    rerun_if_stale(calc_cow_price=calc_cow_price, calc_steer_price=calc_steer_price)
 
-with tab_cost:
+def render_feed_section():
+    """③ 최소비용 사료 배합: 성장 단계별 배합비와 두당 연간 사료비 (비용표 사료비 대체 여부 선택)"""
+    st.divider()
+    st.subheader("③ 최소비용 사료 배합")
+    st.checkbox("사료비를 배합 결과로 대체 (비용표의 '사료비' 행 대신 사용)", key="feed_use")
+    f1, f2 = st.columns([3, 2])
+    with f1:
+        st.markdown("**사료 원료** (가격: 원물 kg 당, 성분: 건물 기준, 최소/최대: 배합 내 건물 비율)")
+        st.data_editor(
+            table("df_feeds"), key="editor_feeds", hide_index=True, width="stretch",
+            column_config={"가격(원/kg)": st.column_config.NumberColumn("가격(원/kg)", min_value=0, format="%d"),
+                           **{c: st.column_config.NumberColumn(c, min_value=0, max_value=100) for c in ("건물(%)", "최소(%)", "최대(%)")}},
+        )
+        st.caption("※ 쓰지 않을 원료는 최대(%)를 0 으로 두세요.")
+    with f2:
+        st.markdown("**성장 단계별 요구량** (건물 기준)")
+        st.data_editor(table("df_feed_stages"), key="editor_feed_stages", hide_index=True, width="stretch",
+                       column_config={"대상": st.column_config.SelectboxColumn("대상", options=list(FEED_TARGETS))})
+
+    feeds, stages = table("df_feeds"), table("df_feed_stages")
+    result = solve_rations(feeds, stages)
+    for name in stages["단계"][result["missing"]]:
+        st.warning(f"'{name}' 단계의 최소 요구량에 빈 칸이 있어 배합을 계산하지 않았습니다.")
+    for name in stages["단계"][~result["feasible"][0] & ~result["missing"]]:
+        st.error(f"'{name}' 단계는 요구량과 원료 비율 제한을 함께 만족하는 배합이 없습니다.")
+    costs = ration_costs(feeds, stages)
+    table_feed = {"번식우": "df_cost_breed", "비육우": "df_cost_fatten"}
+    m = st.columns(len(FEED_TARGETS))
+    for col, target in zip(m, FEED_TARGETS):
+        current = aggregates.feed_amount(table_feed[target], st.session_state.table_deltas.get(table_feed[target]))
+        col.metric(f"{target} 배합 사료비 (원/두/년)", "-" if math.isnan(costs[target]) else fmt_money(costs[target]),
+                   None if math.isnan(costs[target]) else f"{fmt_money(costs[target] - current)} (비용표 대비)", delta_color="inverse")
+    st.dataframe(
+        ration_frame(result, feeds, stages), hide_index=True, width="stretch",
+        column_config={"비율(%)": st.column_config.NumberColumn(format="%.1f"), "급여량(kg/일)": st.column_config.NumberColumn(format="%.2f"),
+                       "비용(원/일)": st.column_config.NumberColumn(format="%d")},
+    )
+
+    with st.expander("사료 가격 변동 시나리오", expanded=False):
+        p1, p2 = st.columns(2)
+        cv = p1.slider("원료 가격 변동폭 (표준편차, %)", 0, 50, 15, key="feed_cv")
+        n = p2.number_input("시나리오 수", 10, 2000, 300, step=50, key="feed_n")
+        if st.toggle("계산", key="feed_scn"):
+            # 원료별 독립 로그정규 가격 (시드 고정 -> 같은 입력이면 캐시된 해를 그대로 쓴다)
+            rng = np.random.default_rng(0)
+            prices = feeds["가격(원/kg)"].to_numpy(dtype=float) * rng.lognormal(-0.5 * (cv / 100) ** 2, cv / 100, (int(n), len(feeds)))
+            annual = annual_feed_costs(solve_rations(feeds, stages, prices), stages)
+            st.dataframe(pd.DataFrame({
+                target: {q: fmt_money(np.nanpercentile(v, p)) for q, p in (("하위 5%", 5), ("중앙값", 50), ("상위 5%", 95))}
+                for target, v in annual.items()
+            }), width="stretch")
+
+@st.fragment
+@profiler.wrap("tab:cost")
+def render_cost_tab(cost_mode, mode_key):
     st.header("5. 비용 상세 항목 설정")
     st.info(f"현재 선택된 모드: **{cost_mode}**")
     
@@ -525,16 +1111,16 @@ with tab_cost:
     with col_c1:
         st.subheader("① 번식우 유지비 상세(단위:천원)")
         edited_breed_cost = st.data_editor(
-            st.session_state.df_cost_breed, 
+            table("df_cost_breed"), 
             key="editor_cost_breed", 
-            use_container_width=True, 
+            width="stretch", 
             column_config={
                 "금액(천원/년)": st.column_config.NumberColumn("금액(천원/년)", format="%d")
             }
         )
         if isinstance(edited_breed_cost, pd.DataFrame):
-            st.session_state.df_cost_breed = edited_breed_cost
-            calc_breed_cost = calculate_cost_from_table(st.session_state.df_cost_breed, mode_key)
+            set_table("df_cost_breed", edited_breed_cost)
+        calc_breed_cost = table_cost("df_cost_breed", mode_key, feed_cost_for("번식우"))
         st.success(f" 번식우 합계 ({mode_key}): **{fmt_money(calc_breed_cost)}원**")
         
         st.markdown("---")
@@ -548,16 +1134,16 @@ with tab_cost:
     with col_c2:
         st.subheader("② 비육우 유지비 상세(단위:천원)")
         edited_fatten_cost = st.data_editor(
-            st.session_state.df_cost_fatten, 
+            table("df_cost_fatten"), 
             key="editor_cost_fatten", 
-            use_container_width=True, 
+            width="stretch", 
             column_config={
                 "금액(천원/년)": st.column_config.NumberColumn("금액(천원/년)", format="%d")
             }
         )
         if isinstance(edited_fatten_cost, pd.DataFrame):
-            st.session_state.df_cost_fatten = edited_fatten_cost
-            calc_fatten_cost = calculate_cost_from_table(st.session_state.df_cost_fatten, mode_key)
+            set_table("df_cost_fatten", edited_fatten_cost)
+        calc_fatten_cost = table_cost("df_cost_fatten", mode_key, feed_cost_for("비육우"))
         st.success(f" 비육우 합계 ({mode_key}): **{fmt_money(calc_fatten_cost)}원**")
         st.markdown("---")
         stock_cost = st.number_input("가축비 (송아지 구입비, 참고용, 계산 X)", value=4000000, step=100000)
@@ -568,10 +1154,10 @@ with tab_cost:
     st.markdown("#### 비용 산출 상세 내역")
 
     opp_cols = ["자가노동비", "자본용역비", "토지용역비"]
-    opp_sum_breed  = calculate_opportunity_cost(st.session_state.df_cost_breed)
-    opp_sum_fatten = calculate_opportunity_cost(st.session_state.df_cost_fatten)
-    total_breed_prod  = calculate_cost_from_table(st.session_state.df_cost_breed,  mode="생산비")
-    total_fatten_prod = calculate_cost_from_table(st.session_state.df_cost_fatten, mode="생산비")
+    opp_sum_breed  = table_opportunity_cost("df_cost_breed")
+    opp_sum_fatten = table_opportunity_cost("df_cost_fatten")
+    total_breed_prod  = table_cost("df_cost_breed",  mode="생산비", feed_cost=feed_cost_for("번식우"))
+    total_fatten_prod = table_cost("df_cost_fatten", mode="생산비", feed_cost=feed_cost_for("비육우"))
 
     FORMULA_MAP: dict[str, callable] = {
         "경영비": lambda total, opp: f"전체 합계({fmt_money(total)}) - 기회비용({fmt_money(opp)})",
@@ -605,4 +1191,70 @@ with tab_cost:
     if mode_key == "경영비":
         st.caption(f"※ 제외된 기회비용 항목: {', '.join(opp_cols)}")
 
-        
\ No newline at end of file
+    render_feed_section()
+
+    rerun_if_stale(calc_breed_cost=calc_breed_cost, calc_fatten_cost=calc_fatten_cost, by_product_income=bp_income)
+
+# 탭별 프래그먼트: 탭 안의 위젯/편집기 조작은 해당 탭만 다시 실행하고,
+# 다른 탭이 쓰는 값(평균 가격, 유지비, 부산물 수입)이 바뀐 경우에만 rerun_if_stale 가 전체를 다시 실행한다.
+st.session_state._app_deps = {
+    "calc_cow_price": calc_cow_price, "calc_steer_price": calc_steer_price,
+    "calc_breed_cost": calc_breed_cost, "calc_fatten_cost": calc_fatten_cost,
+    "by_product_income": st.session_state.get('by_product_income', 0),
+}
+with tab_analysis:
+    render_analysis_tab(scenario_params)
+with tab_risk:
+    render_risk_tab(scenario_params)
+with tab_sens:
+    render_sensitivity_tab(scenario_params)
+with tab_revenue:
+    render_revenue_tab()
+with tab_cost:
+    render_cost_tab(cost_mode, mode_key)
+
+with snapshot_box.expander("스냅샷 (저장·불러오기)", expanded=False):
+    store = snapshot_store()
+    st.session_state.setdefault("snap_farm", "기본 농장")
+    snap_farm = st.text_input("농가", key="snap_farm").strip() or "기본 농장"
+    st.text_input("메모", key="snap_label")
+    st.button("현재 설정 저장", on_click=_save_snapshot, args=(store, scenarios), key="snap_save")
+    if "snap_saved" in st.session_state:
+        st.caption(f"저장됨: {st.session_state.snap_saved[:8]}")
+    history = store.history(snap_farm)
+    if history:
+        labels = {e["digest"]: f"{e['created'].replace('T', ' ')} · {e['label'] or '-'} · {e['digest'][:8]}" for e in history[:200]}
+        snap_pick = st.selectbox("저장 이력 (최근 200개)", list(labels), format_func=labels.get, key="snap_pick")
+        st.button("불러오기", on_click=_load_snapshot, args=(store, snap_pick), key="snap_load")
+        st.caption(f"{snap_farm}: {len(history):,}개 버전")
+
+with st.sidebar:
+    with st.expander("세션 메모리", expanded=False), profiler.phase("memory_gauge"):
+        footprint = session_footprint(st.session_state.to_dict(), TABLES.is_shared)
+        footprint_registry().record(st.session_state._session_id, sum(footprint.values()))
+        sessions = footprint_registry().summary()
+        mem1, mem2 = st.columns(2)
+        mem1.metric("이 세션", f"{sum(footprint.values()) / 1024:,.0f} KB")
+        mem2.metric("공유 참조 표 (프로세스 1벌)", f"{TABLES.nbytes() / 1024:,.0f} KB")
+        st.caption(f"최근 30분 세션 {sessions['sessions']}개 · 세션당 평균 {sessions['mean'] / 1024:,.0f} KB · 최대 {sessions['max'] / 1024:,.0f} KB")
+        st.dataframe(pd.DataFrame({"KB": {k: v / 1024 for k, v in footprint.items()}}).head(10), width="stretch",
+                     column_config={"KB": st.column_config.NumberColumn(format="%.1f")})
+    # 마지막 측정 구간 (memory_gauge) 까지 포함해 마감한 뒤 아래 프로파일러 표에 보여준다
+    last_run = profiler.finish()
+    with st.expander("캐시 통계 (적중/미적중)", expanded=False):
+        st.dataframe(pd.DataFrame.from_dict(cache_stats(), orient="index"), width="stretch")
+    with st.expander("성능 프로파일러 (디버그)", expanded=False):
+        st.checkbox("재실행 구간 측정", key="debug_profile", help="켜면 다음 실행부터 구간별 시간을 기록하고 hanwoo.profile 로그(JSON)로 남깁니다.")
+        st.checkbox("DataFrame.copy 횟수도 세기", key="debug_profile_copies", disabled=not st.session_state.debug_profile,
+                    help="측정 중인 실행 동안 pandas DataFrame.copy 를 전역으로 바꿔 호출 횟수를 셉니다 (다른 세션의 copy 도 래퍼를 거침).")
+        st.checkbox("증분 집계 검증", key="debug_verify_aggregates", help="켜면 비용표·등급표 합계를 갱신할 때마다 전체 재계산과 비교해 다르면 오류를 냅니다.")
+        st.caption(f"증분 집계: 반영한 셀 {aggregates.cells_applied:,}개 · 표 재구성 {aggregates.rebuilds}회 · 검증 {aggregates.checks}회")
+        if last_run is not None:
+            copies = "" if last_run["copies"] is None else f" · DataFrame.copy {last_run['copies']}회"
+            st.caption(f"이번 실행: {last_run['seconds'] * 1e3:,.1f}ms{copies}")
+            st.dataframe(phases_frame(last_run), hide_index=True, width="stretch", column_config={
+                "ms": st.column_config.NumberColumn(format="%.1f"), "비율(%)": st.column_config.NumberColumn(format="%.1f")})
+        if profiler.history:
+            st.markdown("**최근 실행** (프래그먼트 단독 재실행 포함)")
+            st.dataframe(pd.DataFrame([{"실행": r["label"], "시각": r["time"], "ms": r["seconds"] * 1e3, "copy": r["copies"]}
+                                       for r in reversed(profiler.history)]), hide_index=True, width="stretch")